@@ -4,8 +4,13 @@
 # =====================================================
 #region [ 1. 라이브러리 임포트 ]
 import re
+import logging
 from typing import List, Dict, Any, Optional 
 import time, uuid
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 import textwrap
 import hashlib
 import datetime
@@ -41,6 +46,11 @@ def _rerun():
     else:
         st.experimental_rerun()
 
+def _fragment(func):
+    """st.fragment 호환 (구버전은 experimental_fragment, 둘 다 없으면 일반 함수로 실행)"""
+    frag = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return frag(func) if frag else func
+
 # 쿠키 이름 및 유효기간 설정
 COOKIE_NAME = "dmb_auth_token"
 COOKIE_EXPIRY_DAYS = 1
@@ -395,73 +405,383 @@ pio.templates.default = 'dashboard_theme'
 
 # =====================================================
 
-# ===== 3.1. 데이터 로드 (MongoDB) =====
-@st.cache_data(ttl=600)
-#endregion
-#region [ 4. 데이터 로드 / 전처리 ]
-def load_data() -> pd.DataFrame:
+# ===== 3.0. Google Sheets 클라이언트 / 워크시트 병렬 읽기 =====
+SHEET_FETCH_MAX_WORKERS = 8
+SHEET_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+SHEET_VALUE_PARAMS = {
+    "valueRenderOption": "UNFORMATTED_VALUE",
+    "dateTimeRenderOption": "SERIAL_NUMBER",
+}
+# 퍼센트 단위 지표: 시트에서 퍼센트 서식(3.5%)이면 UNFORMATTED_VALUE로 0.035가 오므로
+# 지표 값이 모두 1 이하(비율 표기)일 때만 ×100 해서 기존 표시값 단위(3.5)로 맞춤
+SHEET_PERCENT_METRICS = ["T시청률", "H시청률"]
+SHEET_DATE_COLS = ["주차시작일", "방영시작일", "방영시작"]
+SHEET_SERIAL_ORIGIN = "1899-12-30"  # Google Sheets 날짜 시리얼 기준일
+
+
+@st.cache_resource(show_spinner=False)
+def get_gspread_client():
     """
-    [수정] Streamlit Secrets와 gspread를 사용하여 비공개 Google Sheet에서 데이터를 인증하고 로드합니다.
-    st.secrets에 'gcp_service_account', 'SHEET_ID', 'SHEET_NAME'이 있어야 합니다.
+    인증된 gspread 클라이언트를 프로세스 단위로 1회만 생성해 재사용합니다.
+    (내부 AuthorizedSession이 토큰 만료 시 제자리에서 갱신하므로 재인증/TLS 핸드셰이크 반복 없음)
     """
-    
-    # --- 1. Google Sheets 인증 ---
-    scopes = ["https://www.googleapis.com/auth/spreadsheets"]
-    
-    try:
-        creds_info = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(creds_info, scopes=scopes)
-        client = gspread.authorize(creds)
+    creds_info = st.secrets["gcp_service_account"]
+    creds = Credentials.from_service_account_info(creds_info, scopes=SHEET_SCOPES)
+    return gspread.authorize(creds)
 
-        # --- 2. 데이터 로드 ---
-        sheet_id = st.secrets["SHEET_ID"]
-        worksheet_name = st.secrets["SHEET_NAME"] 
-        
-        spreadsheet = client.open_by_key(sheet_id)
-        worksheet = spreadsheet.worksheet(worksheet_name)
-        
-        data = worksheet.get_all_records() 
-        df = pd.DataFrame(data)
 
-    except gspread.exceptions.WorksheetNotFound:
-        st.error(f"Streamlit Secrets의 SHEET_NAME 값 ('{worksheet_name}')에 해당하는 워크시트를 찾을 수 없습니다.")
-        return pd.DataFrame()
-    except KeyError as e:
-        st.error(f"Streamlit Secrets에 필요한 키({e})가 없습니다. TOML 설정을 확인하세요.")
+def _values_to_frame(values) -> pd.DataFrame:
+    """
+    values_get 결과(첫 행 = 헤더)를 DataFrame으로 변환합니다.
+    API가 잘라내는 꼬리 빈 칸은 get_all_records와 같이 ""로 채웁니다.
+    """
+    if not values:
         return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Google Sheets 데이터 로드 중 오류 발생: {e}")
+    header = [str(h) for h in values[0]]
+    width = len(header)
+    rows = [list(r[:width]) + [""] * (width - len(r)) for r in values[1:]]
+    return pd.DataFrame(rows, columns=header)
+
+def _sheet_names(raw) -> List[str]:
+    """
+    SHEET_NAME 설정값(문자열 / 쉼표 구분 문자열 / 리스트)을 워크시트 이름 목록으로 정규화합니다.
+    """
+    if isinstance(raw, str):
+        items = raw.split(",")
+    else:
+        items = list(raw)
+    names = [str(x).strip() for x in items if str(x).strip()]
+    return list(dict.fromkeys(names))
+
+
+def _a1_sheet(name: str) -> str:
+    """시트 이름을 A1 범위로 쓸 수 있게 따옴표로 감쌈 (공백/'/! 포함 이름 대응)"""
+    return "'" + str(name).replace("'", "''") + "'"
+
+
+def _fetch_worksheets(spreadsheet, names: List[str]) -> pd.DataFrame:
+    """
+    여러 워크시트를 스레드 풀에서 동시에 읽어 하나의 롱포맷 프레임으로 합칩니다.
+    (같은 인증 클라이언트/세션을 공유, 결과는 설정 순서대로 concat)
+    """
+    def _read(name):
+        try:
+            res = spreadsheet.values_get(_a1_sheet(name), params=SHEET_VALUE_PARAMS)
+        except gspread.exceptions.APIError as e:
+            # 없는 시트 이름은 WorksheetNotFound가 아니라 범위 파싱 오류(400)로 돌아옴
+            if "Unable to parse range" in str(e):
+                raise gspread.exceptions.WorksheetNotFound(name) from e
+            raise
+        return _values_to_frame(res.get("values", []))
+
+    if len(names) == 1:
+        return _read(names[0])
+
+    workers = min(SHEET_FETCH_MAX_WORKERS, len(names))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sheet-fetch") as pool:
+        frames = list(pool.map(_read, names))
+
+    frames = [f for f in frames if not f.empty]
+    if not frames:
         return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True, sort=False)
 
-    # --- 3. 데이터 전처리 (원본 코드와 동일) ---
-    if "주차시작일" in df.columns:
-        df["주차시작일"] = pd.to_datetime(
-            df["주차시작일"].astype(str).str.strip(),
-            format="%Y. %m. %d", 
-            errors="coerce"
-        )
-    if "방영시작일" in df.columns:
-        df["방영시작일"] = pd.to_datetime(
-            df["방영시작일"].astype(str).str.strip(),
-            format="%Y. %m. %d", 
-            errors="coerce"
-        )
+
+def _decode_sheet_dates(s: pd.Series) -> pd.Series:
+    """
+    날짜 시리얼(숫자)을 datetime64로 바로 변환합니다.
+    텍스트로 입력된 셀만 'YYYY. MM. DD' 형식(실패 시 일반 파싱)으로 보정합니다.
+    """
+    serial = pd.to_numeric(s, errors="coerce")
+    out = pd.to_datetime(serial, unit="D", origin=SHEET_SERIAL_ORIGIN).dt.normalize()
+
+    txt = serial.isna() & s.map(lambda x: isinstance(x, str) and x.strip() != "")
+    if txt.any():
+        raw = s[txt].str.strip()
+        parsed = pd.to_datetime(raw, format="%Y. %m. %d", errors="coerce")
+        miss = parsed.isna()
+        if miss.any():
+            parsed[miss] = pd.to_datetime(
+                raw[miss].str.replace(".", "-", regex=False).str.replace("/", "-", regex=False),
+                errors="coerce",
+            )
+        out.loc[txt] = parsed
+    return out
+
+
+def _decode_episode_numbers(s: pd.Series) -> pd.Series:
+    """
+    '회차' 문자열에서 숫자를 뽑아 float64로 만듭니다. (정규식은 고유값에만 적용)
+    """
+    codes, uniques = pd.factorize(s)
+    nums = pd.Series(uniques, dtype=object).astype(str).str.extract(r"(\d+)", expand=False).astype(float).to_numpy()
+    out = np.full(len(s), np.nan)
+    known = codes >= 0
+    out[known] = nums[codes[known]]
+    return pd.Series(out, index=s.index)
+
+
+WEEK_NUM_COL = "주차_num"     # 주차 서수 (W-6 → -6, W+1/W1 → 1, 파싱 불가 → NA)
+WEEK_NORM_COL = "주차_norm"   # 비교용 정규화 라벨 ('+', '주차' 제거)
+
+
+def _norm_week_label(w) -> str:
+    """주차 라벨 비교용 정규화 ('W+1' → 'W1', '1주차' → '1')"""
+    return str(w).replace("+", "").replace("주차", "").strip()
+
+
+def _decode_week_labels(s: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    '주차' 라벨을 (정수 서수, 정규화 라벨)로 변환합니다. (파싱은 고유값에만 적용)
+    """
+    codes, uniques = pd.factorize(s)
+    u = pd.Series(uniques, dtype=object).astype(str)
+    nums = pd.to_numeric(u.str.extract(r"(-?\d+)", expand=False), errors="coerce").astype("Int16").to_numpy()
+    norms = u.map(_norm_week_label).to_numpy(dtype=object)
+
+    known = codes >= 0
+    num = pd.array(np.full(len(s), pd.NA), dtype="Int16")
+    num[known] = nums[codes[known]]
+    norm = np.full(len(s), "", dtype=object)
+    norm[known] = norms[codes[known]]
+    return pd.Series(num, index=s.index), pd.Series(norm, index=s.index)
+
+
+def _sorted_week_labels(df: pd.DataFrame) -> List[str]:
+    """주차 라벨을 서수 순서로 정렬한 목록 (서수 없는 라벨 제외)"""
+    if WEEK_NUM_COL not in df.columns:
+        return []
+    keys = df.drop_duplicates("주차")[["주차", WEEK_NUM_COL]].dropna()
+    return keys.sort_values([WEEK_NUM_COL, "주차"], kind="stable")["주차"].tolist()
+
+
+def week_order(df: pd.DataFrame) -> List[str]:
+    """
+    프레임에 존재하는 주차 라벨을 서수 순으로 반환합니다.
+    로드 시 계산한 전체 주차 순서(attrs['week_order'])가 있으면 존재 여부만 걸러서 사용합니다.
+    """
+    if "주차" not in df.columns or df.empty:
+        return []
+    order = df.attrs.get("week_order")
+    if order is None:
+        return _sorted_week_labels(df)
+    present = set(pd.unique(df["주차"]))
+    return [w for w in order if w in present]
+
+
+# 넷플릭스 편성작 TVING VOD 보정: 로드 시 별도 컬럼(VOD_ADJ_COL)으로 한 번만 계산
+# - 계수/대상을 바꾸면 VOD_ADJ_RULE 버전도 올림 (프레임 attrs에 기록 → 데이터 버전/캐시 키에 반영)
+NETFLIX_VOD_FACTOR = 1.4
+VOD_ADJ_COL = "value_vod_adj"
+VOD_ADJ_RULE = f"netflix_tving_vod:v1:x{NETFLIX_VOD_FACTOR}"
+
+
+def _netflix_vod_adjusted(df: pd.DataFrame) -> pd.Series:
+    """넷플릭스 편성작(넷플릭스편성작 == 1)의 TVING VOD 시청인구만 계수를 곱한 value (그 외 행은 원값)"""
+    adj = df["value"].to_numpy(dtype=float, copy=True)
+    if "넷플릭스편성작" in df.columns:
+        hit = ((df["metric"] == "시청인구") & (df["매체"] == "TVING VOD") & (df["넷플릭스편성작"] == 1)).to_numpy()
+        adj[hit] *= NETFLIX_VOD_FACTOR
+    return pd.Series(adj, index=df.index)
+
+
+def vod_value_col(adjusted: bool = True) -> str:
+    """TVING VOD 값 컬럼 선택 (보정값/원값) — 복사 없이 컬럼만 바꿔 집계"""
+    return VOD_ADJ_COL if adjusted else "value"
+
+
+# ===== 3.1. 데이터 로드 (MongoDB) =====
+DATA_REFRESH_SEC = 600          # 스냅샷이 이 시간보다 오래되면 백그라운드에서 갱신
+DATA_SNAPSHOT_KEY = "__data_snapshot__"
+
+
+def _prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """시트 원본 프레임을 대시보드용 롱포맷 프레임으로 전처리합니다."""
+    # 시리얼/숫자 셀을 바로 타입 배열로 변환
+    for c in SHEET_DATE_COLS:
+        if c in df.columns:
+            df[c] = _decode_sheet_dates(df[c])
 
     if "value" in df.columns:
-        v = df["value"].astype(str).str.replace(",", "", regex=False).str.replace("%", "", regex=False)
-        df["value"] = pd.to_numeric(v, errors="coerce").fillna(0)
+        # 숫자 셀은 그대로 사용, 텍스트로 입력된 셀만 쉼표/퍼센트 기호 제거 후 변환
+        v = pd.to_numeric(df["value"], errors="coerce")
+        txt = v.isna() & df["value"].map(lambda x: isinstance(x, str))
+        if txt.any():
+            cleaned = df.loc[txt, "value"].str.replace(",", "", regex=False).str.replace("%", "", regex=False)
+            v.loc[txt] = pd.to_numeric(cleaned, errors="coerce")
+        if "metric" in df.columns:
+            # 퍼센트 서식 지표(0.035 = 3.5%)는 get_all_records 시절 단위(3.5)로 환산
+            for m in SHEET_PERCENT_METRICS:
+                raw = (df["metric"].astype(str).str.strip() == m) & ~txt & v.notna()
+                if raw.any() and v[raw].abs().max() <= 1:
+                    v.loc[raw] = (v[raw] * 100).round(10)  # 0.035*100 → 3.5000000000000004 방지
+        df["value"] = v.fillna(0).astype("float64")
 
     for c in ["IP", "편성", "지표구분", "매체", "데모", "metric", "회차", "주차"]:
         if c in df.columns:
             df[c] = df[c].astype(str).str.strip() 
 
     if "회차" in df.columns:
-        df["회차_numeric"] = df["회차"].str.extract(r"(\d+)", expand=False).astype(float)
+        df["회차_numeric"] = _decode_episode_numbers(df["회차"])
     else:
         df["회차_numeric"] = pd.NA
+
+    if "주차" in df.columns:
+        # 주차 서수/정규화 라벨은 로드 시 한 번만 계산 → 이후 필터/정렬은 정수 비교
+        df[WEEK_NUM_COL], df[WEEK_NORM_COL] = _decode_week_labels(df["주차"])
+        df.attrs["week_order"] = _sorted_week_labels(df)
+
+    if {"value", "metric", "매체"} <= set(df.columns):
+        df[VOD_ADJ_COL] = _netflix_vod_adjusted(df)
+    df.attrs["vod_adj_rule"] = VOD_ADJ_RULE
+
+    # 이후 단계는 value(float64)/회차_numeric/날짜 컬럼을 다시 변환하지 않아도 됨
+    df.attrs["data_version"] = _compute_data_version(df)
+    df.attrs["loaded_at"] = datetime.datetime.now()
     return df
 
 
+def _fetch_snapshot(client, sheet_id: str, worksheet_names: List[str]) -> pd.DataFrame:
+    """시트를 읽어 전처리까지 마친 스냅샷을 만듭니다. (Streamlit 호출 없음 → 백그라운드 스레드에서도 사용)"""
+    spreadsheet = client.open_by_key(sheet_id)
+    return _prepare_frame(_fetch_worksheets(spreadsheet, worksheet_names))
+
+
+@st.cache_resource(show_spinner=False)
+def _data_store() -> Dict[str, Any]:
+    """프로세스 공용 데이터 스냅샷 저장소 (마지막 정상 스냅샷 + 갱신 상태)"""
+    return {"lock": threading.Lock(), "df": None, "refreshing": False, "error": None, "warmed": None,
+            "warmup_error": None}
+
+
+def _refresh_snapshot_worker(store, client, sheet_id, worksheet_names):
+    """
+    백그라운드 갱신: 새 스냅샷과 파생 리소스를 먼저 만든 뒤 한 번에 교체합니다.
+    실패하면 기존 스냅샷을 그대로 두고 오류만 기록합니다.
+    """
+    try:
+        df = _fetch_snapshot(client, sheet_id, worksheet_names)
+        prime_versioned_resources(df)
+        with store["lock"]:
+            store["df"] = df
+            store["error"] = None
+        start_cache_warmup(df)
+    except Exception as e:
+        get_gspread_client.clear()
+        with store["lock"]:
+            store["error"] = str(e)
+    finally:
+        with store["lock"]:
+            store["refreshing"] = False
+
+
+def _start_background_refresh(store) -> None:
+    try:
+        client = get_gspread_client()
+        sheet_id = st.secrets["SHEET_ID"]
+        worksheet_names = _sheet_names(st.secrets["SHEET_NAME"])
+    except Exception as e:
+        with store["lock"]:
+            store["refreshing"] = False
+            store["error"] = str(e)
+        return
+    threading.Thread(
+        target=_refresh_snapshot_worker,
+        args=(store, client, sheet_id, worksheet_names),
+        name="data-refresh",
+        daemon=True,
+    ).start()
+
+
+def _load_snapshot() -> pd.DataFrame:
+    """
+    공용 스냅샷을 즉시 반환합니다. (stale-while-revalidate)
+    - 최초 1회만 동기로 읽고, 이후에는 오래된 스냅샷을 바로 돌려주며 갱신은 백그라운드에서 진행
+    """
+    store = _data_store()
+    with store["lock"]:
+        df = store["df"]
+        stale = (
+            df is not None
+            and not store["refreshing"]
+            and (datetime.datetime.now() - df.attrs["loaded_at"]).total_seconds() >= DATA_REFRESH_SEC
+        )
+        if stale:
+            store["refreshing"] = True
+    if stale:
+        _start_background_refresh(store)
+    if df is not None:
+        return df
+
+    # --- 최초 로드: Google Sheets 인증 (프로세스 공용 클라이언트) → 데이터 로드 ---
+    try:
+        client = get_gspread_client()
+        sheet_id = st.secrets["SHEET_ID"]
+        worksheet_names = _sheet_names(st.secrets["SHEET_NAME"])
+        # 동시에 들어온 첫 요청들은 한 번의 시트 읽기를 함께 기다림
+        df = single_flight(("snapshot", sheet_id, tuple(worksheet_names)),
+                           lambda: _fetch_snapshot(client, sheet_id, worksheet_names))
+
+    except gspread.exceptions.WorksheetNotFound as e:
+        st.error(f"Streamlit Secrets의 SHEET_NAME 값 ('{e}')에 해당하는 워크시트를 찾을 수 없습니다.")
+        return pd.DataFrame()
+    except KeyError as e:
+        st.error(f"Streamlit Secrets에 필요한 키({e})가 없습니다. TOML 설정을 확인하세요.")
+        return pd.DataFrame()
+    except Exception as e:
+        # 인증/세션 문제일 수 있으므로 다음 시도에서 클라이언트를 새로 만들도록 비움
+        get_gspread_client.clear()
+        st.error(f"Google Sheets 데이터 로드 중 오류 발생: {e}")
+        return pd.DataFrame()
+
+    with store["lock"]:
+        if store["df"] is None:
+            store["df"] = df
+            store["error"] = None
+        df = store["df"]
+    return df
+
+
+def pin_data_snapshot() -> pd.DataFrame:
+    """
+    스크립트 실행 시작 시 현재 스냅샷을 세션에 고정합니다.
+    같은 실행(및 그 안의 fragment 재실행) 동안에는 교체가 일어나도 같은 데이터를 봅니다.
+    """
+    df = _load_snapshot()
+    if not df.empty:
+        st.session_state[DATA_SNAPSHOT_KEY] = df
+    return df.copy(deep=False)
+
+
+def get_data_status() -> Dict[str, Any]:
+    """사이드바 표시용: 보고 있는 스냅샷 기준 시각 / 갱신 중 여부 / 최근 갱신 오류"""
+    store = _data_store()
+    df = st.session_state.get(DATA_SNAPSHOT_KEY)
+    with store["lock"]:
+        return {
+            "loaded_at": df.attrs.get("loaded_at") if df is not None else None,
+            "refreshing": store["refreshing"],
+            "error": store["error"],
+        }
+
+
+#endregion
+#region [ 4. 데이터 로드 / 전처리 ]
+def load_data() -> pd.DataFrame:
+    """
+    [수정] Streamlit Secrets와 gspread를 사용하여 비공개 Google Sheet에서 데이터를 인증하고 로드합니다.
+    st.secrets에 'gcp_service_account', 'SHEET_ID', 'SHEET_NAME'이 있어야 합니다.
+    SHEET_NAME은 리스트나 쉼표 구분 문자열로 여러 워크시트를 지정할 수 있으며, 병렬로 읽어 합칩니다.
+    데이터는 프로세스 공용 스냅샷에서 즉시 반환되며(이번 실행에 고정된 스냅샷 우선), 갱신은 백그라운드에서 이뤄집니다.
+    스냅샷은 세션/백그라운드 스레드/파생 리소스가 공유하므로, 호출 측에는 얕은 복사본을 돌려줘
+    컬럼 추가·교체가 공용 데이터에 번지지 않게 합니다.
+    """
+    df = st.session_state.get(DATA_SNAPSHOT_KEY)
+    if df is None:
+        df = _load_snapshot()
+    return df.copy(deep=False)
+
+
 # ===== 3.x. 공통 필터: 방영 시작일이 '미래'인 IP 제외 (평균/순위 산정용) =====
 def fmt(v, digits=3, intlike=False):
     """
@@ -523,6 +843,14 @@ def _set_page_query_param(page_key: str):
     except Exception:
         pass
 
+def _navigate_to(page_key: str):
+    """
+    사이드바 메뉴 on_click 콜백: 클릭으로 생기는 재실행 전에 페이지 상태를 바꿔
+    추가 st.rerun() 없이 한 번의 실행으로 대상 페이지만 그립니다.
+    """
+    st.session_state["page"] = page_key
+    _set_page_query_param(page_key)
+
 def get_episode_options(df: pd.DataFrame) -> List[str]:
     """데이터에서 사용 가능한 회차 목록 (문자열)을 추출합니다."""
     valid_options = []
@@ -564,20 +892,20 @@ def _episode_col(df: pd.DataFrame) -> str:
     return "회차_numeric" if "회차_numeric" in df.columns else ("회차_num" if "회차_num" in df.columns else "회차")
 
 
-def _mean_of_ip_episode_agg(df: pd.DataFrame, metric_name: str, media=None, episode_agg: str = "sum") -> float | None:
-    """IP별 (회차 단위 집계 -> IP별 평균 -> 전체 평균) 값을 계산한다.
+def _ip_episode_agg_series(df: pd.DataFrame, metric_name: str, media=None, episode_agg: str = "sum") -> pd.Series:
+    """IP별 (회차 단위 집계 -> IP별 평균) 시리즈를 계산한다.
     episode_agg: 'sum' or 'mean'
     """
     sub = df[(df["metric"] == metric_name)].copy()
     if media is not None:
         sub = sub[sub["매체"].isin(media)]
     if sub.empty:
-        return None
+        return pd.Series(dtype=float)
 
     ep_col = _episode_col(sub)
     sub = sub.dropna(subset=[ep_col]).copy()
 
-    sub["value"] = pd.to_numeric(sub["value"], errors="coerce").replace(0, np.nan)
+    sub["value"] = sub["value"].replace(0, np.nan)
     sub = sub.dropna(subset=["value"])
 
     if episode_agg == "mean":
@@ -585,7 +913,12 @@ def _mean_of_ip_episode_agg(df: pd.DataFrame, metric_name: str, media=None, epis
     else:
         ep_level = sub.groupby(["IP", ep_col], as_index=False)["value"].sum()
 
-    per_ip_mean = ep_level.groupby("IP")["value"].mean()
+    return ep_level.groupby("IP")["value"].mean()
+
+
+def _mean_of_ip_episode_agg(df: pd.DataFrame, metric_name: str, media=None, episode_agg: str = "sum") -> float | None:
+    """IP별 (회차 단위 집계 -> IP별 평균 -> 전체 평균) 값을 계산한다."""
+    per_ip_mean = _ip_episode_agg_series(df, metric_name, media=media, episode_agg=episode_agg)
     return float(per_ip_mean.mean()) if not per_ip_mean.empty else None
 
 
@@ -595,17 +928,17 @@ def mean_of_ip_episode_sum(df: pd.DataFrame, metric_name: str, media=None) -> fl
 def mean_of_ip_episode_mean(df: pd.DataFrame, metric_name: str, media=None) -> float | None:
     return _mean_of_ip_episode_agg(df, metric_name, media=media, episode_agg="mean")
 
-def _mean_of_ip_sums_from_subset(sub: pd.DataFrame) -> float | None:
+def _ip_sums_from_subset(sub: pd.DataFrame) -> pd.Series:
     if sub.empty:
-        return None
+        return pd.Series(dtype=float)
     sub = sub.copy()
-    sub["value"] = pd.to_numeric(sub["value"], errors="coerce").replace(0, np.nan)
+    sub["value"] = sub["value"].replace(0, np.nan)
     sub = sub.dropna(subset=["value"])
-    per_ip_sum = sub.groupby("IP")["value"].sum()
-    return float(per_ip_sum.mean()) if not per_ip_sum.empty else None
+    return sub.groupby("IP")["value"].sum()
 
 
-def mean_of_ip_sums(df: pd.DataFrame, metric_name: str, media=None) -> float | None:
+def ip_sums_series(df: pd.DataFrame, metric_name: str, media=None) -> pd.Series:
+    """IP별 합계 시리즈 (0값 제외, 조회수는 유튜브 PGC/UGC 규칙 적용)"""
     if metric_name == "조회수":
         sub = _get_view_data(df)
     else:
@@ -614,25 +947,767 @@ def mean_of_ip_sums(df: pd.DataFrame, metric_name: str, media=None) -> float | N
     if media is not None:
         sub = sub[sub["매체"].isin(media)]
 
-    return _mean_of_ip_sums_from_subset(sub)
+    return _ip_sums_from_subset(sub)
+
+
+def mean_of_ip_sums(df: pd.DataFrame, metric_name: str, media=None) -> float | None:
+    per_ip_sum = ip_sums_series(df, metric_name, media=media)
+    return float(per_ip_sum.mean()) if not per_ip_sum.empty else None
+
+
+# ===== 3.5-1. 동시 캐시 미스 단일 실행 (single-flight) =====
+@st.cache_resource(show_spinner=False)
+def _inflight_store() -> Dict[str, Any]:
+    """진행 중인 계산 목록: {키: Future} (세션 간 공유)"""
+    return {"lock": threading.Lock(), "calls": {}}
+
+
+def single_flight(key, fn):
+    """
+    같은 키의 계산이 이미 진행 중이면 새로 계산하지 않고 그 결과를 기다려 공유합니다.
+    - fn은 Streamlit UI 호출 없이 값만 만드는 함수여야 합니다. (예외도 대기 중인 호출에 그대로 전달)
+    - st.cache_data는 자체적으로 키별 계산 잠금을 하므로, 직접 관리하는 저장소(스냅샷/파생 리소스/차트)에 사용
+    """
+    store = _inflight_store()
+    with store["lock"]:
+        fut = store["calls"].get(key)
+        leader = fut is None
+        if leader:
+            fut = Future()
+            store["calls"][key] = fut
+    if not leader:
+        return fut.result()
+
+    try:
+        result = fn()
+    except BaseException as e:
+        fut.set_exception(e)
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        with store["lock"]:
+            store["calls"].pop(key, None)
+
+
+# ===== 3.6. 데이터 버전 / 버전별 파생 리소스 =====
+def _compute_data_version(df: pd.DataFrame) -> str:
+    """원본 데이터 내용 해시 + 파생 컬럼 규칙 (파생 엔진/캐시 키로 사용)"""
+    if df is None or df.empty:
+        return "empty"
+    h = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    rule = str(df.attrs.get("vod_adj_rule", "")).encode()
+    return hashlib.md5(h.tobytes() + rule).hexdigest()[:16]
+
+
+def get_data_version(df: pd.DataFrame) -> str:
+    """load_data()에서 찍어 둔 버전을 읽습니다. (부분집합/복사본에도 attrs로 전달됨)"""
+    version = df.attrs.get("data_version") if df is not None else None
+    if version:
+        return version
+    return load_data().attrs.get("data_version", "empty")
+
+
+VERSIONED_PRIME_LIMIT = 16                      # 갱신 시 미리 만들 리소스명 최대 개수 (최근 사용순)
+VERSIONED_PRIME_TTL_SEC = DATA_REFRESH_SEC * 3   # 이 시간 동안 안 쓰인 리소스명은 등록 해제 (회차별 이름 누적 방지)
+
+
+@st.cache_resource(show_spinner=False)
+def _versioned_store() -> Dict[str, Any]:
+    """
+    세션 간 공유되는 파생 리소스 저장소: {리소스명: {버전: 객체}}
+    builders: {리소스명: (builder, keep, 마지막 사용 시각)} (최근 사용순)
+    """
+    return {"lock": threading.Lock(), "items": {}, "builders": OrderedDict(), "priming": {}}
+
+
+def get_versioned_resource(name: str, df_src: pd.DataFrame, builder, keep: int = 2):
+    """
+    데이터 버전별로 한 번만 만드는 파생 리소스(텐서/인덱스 등)를 반환합니다.
+    - df_src는 데이터 버전 확인용이며, 빌드는 항상 load_data() 전체 데이터로 합니다.
+      (df_src의 행 필터는 반영되지 않음 → 부분집합을 다루는 호출 측이 직접 잘라 쓰거나 검증)
+    - 반환 객체는 세션 간 공유되므로 호출 측에서 수정하지 않습니다.
+    """
+    version = get_data_version(df_src)
+    store = _versioned_store()
+    with store["lock"]:
+        bucket = store["items"].setdefault(name, {})
+        obj = bucket.get(version)
+        if obj is not None and name in store["builders"]:
+            store["builders"][name] = store["builders"][name][:2] + (time.monotonic(),)
+            store["builders"].move_to_end(name)
+    if obj is not None:
+        return obj
+
+    # 갱신 전 미리 만들기 중이면(빌더 안에서 다른 리소스를 참조) 교체될 새 스냅샷으로 빌드
+    df_full = store["priming"].get(version)
+    if df_full is None:
+        df_full = load_data()
+    version = df_full.attrs.get("data_version", version)
+    obj = single_flight(("versioned", name, version), lambda: builder(df_full))
+    with store["lock"]:
+        store["builders"][name] = (builder, keep, time.monotonic())
+        store["builders"].move_to_end(name)
+        store["items"][name] = bucket
+        bucket[version] = obj
+        while len(bucket) > keep:
+            bucket.pop(next(iter(bucket)))
+    return obj
+
+
+def prime_versioned_resources(df_full: pd.DataFrame) -> None:
+    """
+    새 스냅샷으로 교체하기 전에, 최근에 쓰인 파생 리소스를 새 버전으로 미리 만들어 둡니다.
+    - VERSIONED_PRIME_TTL_SEC 동안 안 쓰인 리소스명은 등록 해제(보관 객체도 제거)
+    - 남은 것 중 최근 사용순 VERSIONED_PRIME_LIMIT개만 미리 만들고, 나머지는 첫 사용 시 빌드
+    (백그라운드 갱신 스레드에서 호출)
+    """
+    version = df_full.attrs.get("data_version", "empty")
+    store = _versioned_store()
+    now = time.monotonic()
+    with store["lock"]:
+        for name, (_, _, used) in list(store["builders"].items()):
+            if now - used > VERSIONED_PRIME_TTL_SEC:
+                store["builders"].pop(name)
+                store["items"].pop(name, None)
+        builders = list(store["builders"].items())[-VERSIONED_PRIME_LIMIT:][::-1]
+        store["priming"][version] = df_full
+    try:
+        for name, (builder, keep, _) in builders:
+            with store["lock"]:
+                if version in store["items"].get(name, {}):
+                    continue  # 다른 리소스 빌드 중에 이미 만들어짐
+            obj = builder(df_full)
+            with store["lock"]:
+                bucket = store["items"].setdefault(name, {})
+                bucket[version] = obj
+                while len(bucket) > keep:
+                    bucket.pop(next(iter(bucket)))
+    finally:
+        with store["lock"]:
+            store["priming"].pop(version, None)
+
+
+# ===== 3.7. Plotly 차트 캐시 (LRU) =====
+FIG_CACHE_MAX_ENTRIES = 256
+FIG_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_FIG_EMPTY = object()
+
+@st.cache_resource(show_spinner=False)
+def _figure_cache() -> Dict[str, Any]:
+    return {"lock": threading.Lock(), "items": OrderedDict(), "bytes": 0}
+
+
+def cached_figure(chart_id: str, key, df_src: pd.DataFrame, build_fn):
+    """
+    (chart_id, 입력 키, 데이터 버전) 단위로 완성된 Plotly figure를 재사용합니다.
+    - build_fn()이 None(표시할 데이터 없음)을 반환하면 그 결과도 캐시
+    - 용량은 직렬화 JSON 길이로 계산해 개수/용량 한도를 넘으면 오래된 것부터 제거
+    - 반환 figure는 세션 간 공유되므로 호출 측에서 수정하지 않습니다.
+    """
+    cache_key = (chart_id, get_data_version(df_src), repr(key))
+    cache = _figure_cache()
+    with cache["lock"]:
+        hit = cache["items"].get(cache_key)
+        if hit is not None:
+            cache["items"].move_to_end(cache_key)
+            return None if hit[0] is _FIG_EMPTY else hit[0]
+
+    def _build():
+        built = build_fn()
+        return built, (len(pio.to_json(built, validate=False)) if built is not None else 0)
+
+    fig, size = single_flight(("figure",) + cache_key, _build)
+    with cache["lock"]:
+        old = cache["items"].pop(cache_key, None)
+        if old is not None:
+            cache["bytes"] -= old[1]
+        cache["items"][cache_key] = (_FIG_EMPTY if fig is None else fig, size)
+        cache["bytes"] += size
+        while cache["items"] and (len(cache["items"]) > FIG_CACHE_MAX_ENTRIES or cache["bytes"] > FIG_CACHE_MAX_BYTES):
+            _, (_, old_size) = cache["items"].popitem(last=False)
+            cache["bytes"] -= old_size
+    return fig
+
+
+# ===== 3.7-1. 주간 롤업 (주차 × IP × 지표 × 매체 합계) =====
+# 편성/편성연도/방영시작일은 페이지 필터를 롤업에 그대로 적용하기 위한 보조 키
+WEEKLY_ROLLUP_KEYS = ["IP", "편성", "편성연도", "방영시작일", "metric", "매체", "주차", WEEK_NUM_COL, "주차시작일"]
+
+
+def _build_weekly_rollup(df_full: pd.DataFrame) -> pd.DataFrame:
+    """
+    주차 단위 value 합계 테이블을 만듭니다. (데모/회차 행은 합산)
+    - 조회수는 _get_view_data 규칙(유튜브 PGC/UGC만)을 적용한 행만 집계
+    """
+    keys = [c for c in WEEKLY_ROLLUP_KEYS if c in df_full.columns]
+    if "metric" not in df_full.columns or df_full.empty:
+        return pd.DataFrame(columns=keys + ["value"])
+
+    keep = (df_full["metric"] != "조회수").to_numpy()
+    keep |= df_full.index.isin(_get_view_data(df_full).index)
+    out = df_full[keep].groupby(keys, dropna=False, sort=False)["value"].sum().reset_index()
+    out.attrs["week_order"] = df_full.attrs.get("week_order")
+    return out
+
+
+def get_weekly_rollup(df_src: pd.DataFrame) -> pd.DataFrame:
+    return get_versioned_resource("weekly_rollup", df_src, _build_weekly_rollup)
+
+
+def weekly_media_pivot(rows: pd.DataFrame, by: str = "주차") -> pd.DataFrame:
+    """
+    롤업 행을 (by × 매체) 합계 피벗으로 만듭니다. IP 합산은 groupby 한 번으로 처리합니다.
+    - by='주차'면 주차 서수 순, 그 외(주차시작일 등)는 값 순으로 정렬
+    """
+    pvt = rows.groupby([by, "매체"])["value"].sum().unstack("매체", fill_value=0)
+    if by == "주차":
+        return pvt.reindex(week_order(rows))
+    return pvt.sort_index()
+
+
+# ===== 3.7-2. 비교 그룹 셀 집계 (편성 × 편성연도) =====
+GROUP_CELL_KEYS = ["편성", "편성연도", "aired"]
+
+
+def _ip_group_tags(df_full: pd.DataFrame) -> pd.DataFrame:
+    """
+    IP별 (편성, 편성연도) 태그 행과 방영작 여부를 만듭니다.
+    태그가 둘 이상인 IP는 split=True (공유 셀에서 빼고 병합 시 IP별로 보정)
+    """
+    tags = df_full.reindex(columns=["IP", "편성", "편성연도"]).drop_duplicates().reset_index(drop=True)
+    tags["aired"] = tags["IP"].isin(get_aired_ips(df_full))
+    tags["split"] = tags["IP"].duplicated(keep=False)
+    return tags
+
+
+def _build_group_cells(table: pd.DataFrame, tags: pd.DataFrame, row_table=None,
+                       df_rows: pd.DataFrame = None) -> Dict[str, Any]:
+    """
+    IP별 값 표(index=IP)를 (편성, 편성연도, 방영작 여부) 셀로 묶어 충분통계를 만듭니다.
+    - n: 값이 있는 IP 수 / sum: 합계 / sorted: 정렬된 값 배열 (모두 컬럼별)
+    - 태그가 여럿인(split) IP는 셀에서 빼 둠 → merge_group_cells가 IP별로 더함
+    - df_rows: 표를 만든 범위의 원본 행 (split IP는 조건에 맞는 행이 이 범위에 있을 때만 그룹에 포함)
+    - row_table(rows) → IP별 값 표: 주면 split IP가 일부 태그만 걸릴 때 그 태그 행만으로 다시 계산
+      (원본 행 필터 기준과 같게), 없으면 IP 전체 값 사용 (IP 포함 여부 기준)
+    """
+    cols = list(table.columns)
+    shared = tags[~tags["split"]]
+    ips = shared["IP"].to_numpy()
+    vals = table.reindex(ips).to_numpy(dtype=float).reshape(len(ips), len(cols))
+    ok = ~np.isnan(vals)
+
+    cells = {}
+    for key, idx in shared.groupby(GROUP_CELL_KEYS, dropna=False, sort=False).indices.items():
+        v, m = vals[idx], ok[idx]
+        cells[key] = {
+            "ips": ips[idx],
+            "n": m.sum(axis=0),
+            "sum": np.where(m, v, 0.0).sum(axis=0),
+            "sorted": [np.sort(v[m[:, j], j]) for j in range(len(cols))],
+        }
+
+    split_rows = None
+    if df_rows is not None:
+        split_rows = df_rows[df_rows["IP"].isin(tags.loc[tags["split"], "IP"].unique())]
+    return {"columns": cols, "table": table, "tags": tags, "cells": cells,
+            "row_table": row_table if split_rows is not None else None, "split_rows": split_rows}
+
+
+def get_group_tags(df_src: pd.DataFrame) -> pd.DataFrame:
+    return get_versioned_resource("group_tags", df_src, _ip_group_tags)
+
+
+def get_group_cells(name: str, df_src: pd.DataFrame, table_fn, max_ep: float = None,
+                    ip_mode: bool = False) -> Dict[str, Any]:
+    """
+    table_fn(df_full, max_ep) → IP별 값 표를 셀 통계로 묶어 데이터 버전별로 재사용합니다.
+    split IP 보정은 table_fn을 해당 태그 행에 다시 적용 (ip_mode=True면 IP 전체 값 사용)
+    """
+    def _build(d: pd.DataFrame) -> Dict[str, Any]:
+        scope = d if max_ep is None else d[d["회차_numeric"] <= max_ep]
+        row_table = None if ip_mode else (lambda rows: table_fn(rows, max_ep))
+        return _build_group_cells(table_fn(d, max_ep), _ip_group_tags(d), row_table, scope)
+
+    return get_versioned_resource(f"group_cells:{name}:{max_ep}", df_src, _build)
+
+
+def merge_group_cells(engine: Dict[str, Any], progs=None, years=None, aired_only: bool = True,
+                      include_ip: str = None, exclude_ip: str = None) -> Dict[str, Any] | None:
+    """
+    편성/연도 조건에 맞는 셀만 합쳐 그룹 통계를 만듭니다. (progs=None / years 비어 있음 → 조건 없음)
+    - include_ip: 방영작이 아니어도 조건에 맞으면 그룹에 넣을 IP / exclude_ip: 그룹에서 뺄 IP
+    - 여러 셀에 걸친(split) IP는 조건에 맞는 태그가 있으면 IP별 값으로 더함
+      (일부 태그만 맞고 engine['row_table']이 있으면 그 태그 행만으로 계산한 값)
+    반환: ips / n / sum / mean / sorted (컬럼 순서는 engine['columns'])
+    """
+    prog_set = None if progs is None else set(progs)
+    year_set = set(years) if years else None
+
+    def _match(prog, year):
+        return (prog_set is None or prog in prog_set) and (year_set is None or year in year_set)
+
+    picked = [c for (prog, year, aired), c in engine["cells"].items()
+              if _match(prog, year) and (aired or not aired_only)]
+    if aired_only and include_ip is not None:
+        tags = engine["tags"]
+        own = tags[(tags["IP"] == include_ip) & ~tags["aired"] & ~tags["split"]]
+        if any(_match(p, y) for p, y in zip(own["편성"], own["편성연도"])):
+            picked.extend(_build_group_cells(engine["table"], own)["cells"].values())
+
+    k = len(engine["columns"])
+    ips = np.concatenate([c["ips"] for c in picked]) if picked else np.array([], dtype=object)
+    n = sum((c["n"] for c in picked), np.zeros(k, dtype=int))
+    tot = sum((c["sum"] for c in picked), np.zeros(k))
+    arrs = [np.sort(np.concatenate([c["sorted"][j] for c in picked])) if picked else np.zeros(0) for j in range(k)]
+
+    if exclude_ip is not None and exclude_ip in set(ips):
+        ips = ips[ips != exclude_ip]
+        row = engine["table"].reindex([exclude_ip]).to_numpy(dtype=float).ravel()
+        for j, v in enumerate(row):
+            if np.isnan(v):
+                continue
+            n[j] -= 1
+            tot[j] -= v
+            arrs[j] = np.delete(arrs[j], np.searchsorted(arrs[j], v))
+
+    # split IP 보정: 조건에 맞는 태그가 있는 IP만 IP별 값으로 추가
+    tags = engine["tags"]
+    extra_ips = []
+    for ip, own in tags[tags["split"]].groupby("IP", sort=False):
+        if ip == exclude_ip or not (own["aired"].iloc[0] or not aired_only or ip == include_ip):
+            continue
+        hit = [_match(p, y) for p, y in zip(own["편성"], own["편성연도"])]
+        if not any(hit):
+            continue
+        keep = None
+        if engine.get("split_rows") is not None:
+            rows = engine["split_rows"][engine["split_rows"]["IP"] == ip]
+            keep = np.array([_match(p, y) for p, y in zip(rows["편성"], rows["편성연도"])], dtype=bool)
+            if not keep.any():
+                continue  # 조건에 맞는 태그의 행이 표 범위(회차 등) 밖
+        if all(hit) or engine.get("row_table") is None:
+            row = engine["table"].reindex([ip])
+        else:
+            row = engine["row_table"](rows[keep]).reindex(index=[ip], columns=engine["columns"])
+        extra_ips.append(ip)
+        for j, v in enumerate(row.to_numpy(dtype=float).ravel()):
+            if np.isnan(v):
+                continue
+            n[j] += 1
+            tot[j] += v
+            arrs[j] = np.insert(arrs[j], np.searchsorted(arrs[j], v), v)
+    if extra_ips:
+        ips = np.concatenate([ips, np.array(extra_ips, dtype=object)])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n > 0, tot / np.maximum(n, 1), np.nan)
+    return {"ips": ips, "n": n, "sum": tot, "mean": mean, "sorted": arrs}
+
+
+# ===== 3.7-3. 회차 구간 분석 (IP × 회차 누적합) =====
+# 키: (지표, 매체, 회차 단위 집계, 구간 집계)
+# - 구간 집계 avg: 회차 값의 평균 / total: 회차 값의 합 / min: 회차 값의 최솟값
+# - 회차 단위 집계 rowsum/rowcount는 0값 포함 행 합계/행 수 (그룹 풀링 평균용)
+EPISODE_WINDOW_SPECS = {
+    "T시청률": ("T시청률", None, "mean", "avg"),
+    "H시청률": ("H시청률", None, "mean", "avg"),
+    "TVING VOD": ("시청인구", ["TVING VOD", "TVING QUICK"], "sum", "avg"),
+    "TVING LIVE": ("시청인구", ["TVING LIVE"], "sum", "avg"),
+    "TVING QUICK": ("시청인구", ["TVING QUICK"], "sum", "avg"),
+    "TVING 주간 VOD": ("시청인구", ["TVING VOD"], "sum", "avg"),
+    "웨이브": ("시청자수", ["웨이브"], "sum", "avg"),
+    "디지털 조회수": ("조회수", None, "sum", "total"),
+    "디지털 언급량": ("언급량", None, "sum", "total"),
+    "화제성 점수": ("F_Score", None, "mean", "avg"),
+    "화제성 순위": ("F_Total", None, "min", "min"),
+    "화제성 행합계": ("F_Score", None, "rowsum", "total"),
+    "화제성 행수": ("F_Score", None, "rowcount", "total"),
+}
+
+
+def _build_episode_prefix(df_full: pd.DataFrame) -> Dict[str, Any]:
+    """
+    지표별 (IP × 회차) 값 배열과 회차 방향 누적합/누적 개수를 만듭니다.
+    - 회차 없는 행과 0값은 제외 (KPI 정의와 동일, rowsum/rowcount만 0값 포함)
+    - 구간 [a, b]의 합/평균은 누적 배열 두 칸의 차로 계산
+    """
+    d = df_full[df_full["회차_numeric"].notna()] if "회차_numeric" in df_full.columns else df_full.iloc[0:0]
+    ips = pd.Index(sorted(d["IP"].dropna().unique()))
+    eps = np.sort(d["회차_numeric"].unique()).astype(float)
+    view_rows = _get_view_data(d)
+    shape = (len(ips), len(eps))
+
+    level, csum, ccnt = {}, {}, {}
+    for key, (metric, media, ep_agg, _) in EPISODE_WINDOW_SPECS.items():
+        sub = view_rows if metric == "조회수" else d[d["metric"] == metric]
+        if media is not None:
+            sub = sub[sub["매체"].isin(media)]
+        if ep_agg not in ("rowsum", "rowcount"):
+            sub = sub[sub["value"] != 0]
+
+        arr = np.full(shape, np.nan)
+        if not sub.empty:
+            grp = sub["value"].groupby([ips.get_indexer(sub["IP"]), np.searchsorted(eps, sub["회차_numeric"].to_numpy())])
+            agg = {"mean": grp.mean, "sum": grp.sum, "min": grp.min, "rowsum": grp.sum, "rowcount": grp.size}[ep_agg]()
+            i, e = (agg.index.get_level_values(k).to_numpy() for k in range(2))
+            arr[i, e] = agg.to_numpy(dtype=float)
+        have = ~np.isnan(arr)
+        level[key] = arr
+        csum[key] = np.concatenate([np.zeros((len(ips), 1)), np.cumsum(np.where(have, arr, 0.0), axis=1)], axis=1)
+        ccnt[key] = np.concatenate([np.zeros((len(ips), 1), dtype=int), np.cumsum(have, axis=1)], axis=1)
+    return {"ips": ips, "eps": eps, "level": level, "csum": csum, "ccnt": ccnt}
+
+
+def get_episode_prefix(df_src: pd.DataFrame) -> Dict[str, Any]:
+    return get_versioned_resource("episode_prefix", df_src, _build_episode_prefix)
+
+
+def _episode_window_bounds(prefix: Dict[str, Any], ep_from: float, ep_to: float) -> tuple:
+    eps = prefix["eps"]
+    return int(np.searchsorted(eps, ep_from, side="left")), int(np.searchsorted(eps, ep_to, side="right"))
+
+
+def episode_window_table(df_src: pd.DataFrame, ep_from: float, ep_to: float, keys: List[str] = None) -> pd.DataFrame:
+    """
+    회차 구간 [ep_from, ep_to]의 IP별 지표 값 (index=IP, columns=keys, 값 없으면 NaN)
+    avg/total은 누적 배열의 차(O(1)), min은 구간 슬라이스 최솟값
+    """
+    prefix = get_episode_prefix(df_src)
+    lo, hi = _episode_window_bounds(prefix, ep_from, ep_to)
+    keys = keys or list(EPISODE_WINDOW_SPECS)
+
+    cols = {}
+    for key in keys:
+        win_agg = EPISODE_WINDOW_SPECS[key][3]
+        cnt = prefix["ccnt"][key][:, hi] - prefix["ccnt"][key][:, lo]
+        if win_agg == "min":
+            win = prefix["level"][key][:, lo:hi]
+            val = np.where(cnt > 0, np.min(np.where(np.isnan(win), np.inf, win), axis=1, initial=np.inf), np.nan)
+        else:
+            tot = prefix["csum"][key][:, hi] - prefix["csum"][key][:, lo]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                val = np.where(cnt > 0, tot / np.maximum(cnt, 1) if win_agg == "avg" else tot, np.nan)
+        cols[key] = val
+    return pd.DataFrame(cols, index=prefix["ips"], columns=keys)
+
+
+def episode_window_pooled_mean(df_src: pd.DataFrame, ips, ep_from: float, ep_to: float,
+                               sum_key: str = "화제성 행합계", n_key: str = "화제성 행수") -> float | None:
+    """선택 IP들의 행을 회차별로 풀링한 평균(합계/행 수)의 구간 평균"""
+    prefix = get_episode_prefix(df_src)
+    lo, hi = _episode_window_bounds(prefix, ep_from, ep_to)
+    idx = prefix["ips"].get_indexer(list(ips))
+    idx = idx[idx >= 0]
+    tot = np.nansum(prefix["level"][sum_key][idx, lo:hi], axis=0)
+    n = np.nansum(prefix["level"][n_key][idx, lo:hi], axis=0)
+    has = n > 0
+    return float(np.mean(tot[has] / n[has])) if has.any() else None
+
+
+def episode_window_label(ep_from: float, ep_to: float) -> str:
+    return f"{int(ep_from)}~{int(ep_to)}회"
+
+
+# ===== 3.7-4. 데이터 유무 비트맵 (IP × 지표 × 매체) =====
+# 회차 n → n번 비트, 주차 서수 → (서수 - 최소 서수)번 비트로 uint64 워드 배열에 기록합니다.
+# - row: 행 존재 / val: 값이 0 초과인 행 존재 (any_row/any_val: 회차·주차 없는 행 포함 전체 여부)
+# - 조회수는 _get_view_data 규칙(유튜브 PGC/UGC)을 통과한 행만 기록
+AVAIL_KEY_COLS = ["IP", "metric", "매체"]
+
+
+def _set_bits(words: np.ndarray, rows: np.ndarray, bits: np.ndarray) -> None:
+    """words[row, bit // 64] |= 1 << (bit % 64) (같은 칸 중복도 누적)"""
+    np.bitwise_or.at(words, (rows, bits // 64), np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)))
+
+
+def _build_availability_bitmap(df_full: pd.DataFrame) -> Dict[str, Any]:
+    cols = [c for c in AVAIL_KEY_COLS + ["value", "회차_numeric", WEEK_NUM_COL] if c in df_full.columns]
+    d = pd.concat([df_full.loc[df_full["metric"] != "조회수", cols], _get_view_data(df_full)[cols]], ignore_index=True)
+    d = d[d["IP"].notna()]
+    d["매체"] = d["매체"].fillna("") if "매체" in d.columns else ""
+
+    grp = d.groupby(AVAIL_KEY_COLS, sort=True)
+    key_idx = grp.ngroup().to_numpy()
+    keys = grp.size().index
+    n_keys = len(keys)
+    has_val = (d["value"] > 0).to_numpy()
+
+    def _axis(pos: np.ndarray) -> Dict[str, Any]:
+        ok = ~np.isnan(pos) & (pos >= 0)
+        n_bits = int(pos[ok].max()) + 1 if ok.any() else 1
+        out = {}
+        for kind, m in (("row", ok), ("val", ok & has_val)):
+            words = np.zeros((n_keys, -(-n_bits // 64)), dtype=np.uint64)
+            _set_bits(words, key_idx[m], pos[m].astype(np.int64))
+            out[kind] = words
+        return out
+
+    ep = d["회차_numeric"].to_numpy(dtype=float) if "회차_numeric" in d.columns else np.full(len(d), np.nan)
+    ep = np.where(ep == np.floor(ep), ep, np.nan)
+    wk = d[WEEK_NUM_COL].to_numpy(dtype=float, na_value=np.nan) if WEEK_NUM_COL in d.columns else np.full(len(d), np.nan)
+    wk_base = int(np.nanmin(wk)) if np.isfinite(wk).any() else 0
+
+    key_ip = keys.get_level_values("IP")
+    ips = pd.Index(pd.unique(key_ip))
+    return {
+        "keys": keys,
+        "ip_code": ips.get_indexer(key_ip),
+        "ips": ips,
+        "ep": _axis(ep),
+        "wk": _axis(wk - wk_base),
+        "wk_base": wk_base,
+        "any_row": np.ones(n_keys, dtype=bool),
+        "any_val": np.bincount(key_idx[has_val], minlength=n_keys) > 0,
+    }
+
+
+def get_availability_bitmap(df_src: pd.DataFrame) -> Dict[str, Any]:
+    return get_versioned_resource("availability", df_src, _build_availability_bitmap)
+
+
+def _week_ordinal(label) -> int | None:
+    m = re.search(r"-?\d+", str(label))
+    return int(m.group()) if m else None
+
+
+def _availability_matrix(df_src: pd.DataFrame, metric, media=None, episodes=None, weeks=None,
+                         kind: str = "val") -> tuple[pd.Index, np.ndarray]:
+    """
+    조건(지표/매체)에 맞는 키를 IP별로 OR한 뒤, 요청 비트별 유무를 (IP 목록, [IP × 비트] bool)로 반환
+    episodes·weeks가 모두 None이면 회차/주차와 무관한 전체 유무 1열
+    ※ 비트맵은 전체 스냅샷 기준 → df_src는 IP 범위만 반영(df_src에 있는 IP로 한정), 그 외 행 필터는 무시
+    """
+    bm = get_availability_bitmap(df_src)
+    keys = bm["keys"]
+    metrics = [metric] if isinstance(metric, str) else list(metric)
+    mask = keys.get_level_values("metric").isin(metrics)
+    mask &= bm["ips"].isin(pd.unique(df_src["IP"]))[bm["ip_code"]]
+    if media is not None:
+        mask &= keys.get_level_values("매체").isin(list(media))
+    codes = bm["ip_code"][mask]
+    ips = bm["ips"][np.unique(codes)]
+    inv = np.unique(codes, return_inverse=True)[1]
+
+    if episodes is None and weeks is None:
+        has = np.zeros(len(ips), dtype=bool)
+        np.logical_or.at(has, inv, bm[f"any_{kind}"][mask])
+        return ips, has[:, None]
+
+    if episodes is not None:
+        words, bits = bm["ep"][kind], np.asarray([int(e) for e in episodes], dtype=np.int64)
+    else:
+        words = bm["wk"][kind]
+        bits = np.asarray([(_week_ordinal(w) if _week_ordinal(w) is not None else -10**6) - bm["wk_base"] for w in weeks], dtype=np.int64)
+
+    per_ip = np.zeros((len(ips), words.shape[1]), dtype=np.uint64)
+    np.bitwise_or.at(per_ip, inv, words[mask])
+    ok = (bits >= 0) & (bits < words.shape[1] * 64)
+    out = np.zeros((len(ips), len(bits)), dtype=bool)
+    b = bits[ok]
+    out[:, ok] = ((per_ip[:, b // 64] >> (b % 64).astype(np.uint64)) & np.uint64(1)).astype(bool)
+    return ips, out
+
+
+def ips_with_data(df_src: pd.DataFrame, metric, media=None, episodes=None, weeks=None,
+                  kind: str = "val", how: str = "all") -> List[str]:
+    """요청한 회차/주차에 데이터가 모두(how='all') 또는 하나라도(how='any') 있는 IP 목록"""
+    ips, has = _availability_matrix(df_src, metric, media, episodes, weeks, kind)
+    hit = has.all(axis=1) if how == "all" else has.any(axis=1)
+    return ips[hit].tolist()
+
+
+def ips_with_episodes_through(df_src: pd.DataFrame, metric, ep: int, media=None) -> List[str]:
+    """1회부터 ep회까지 빠짐없이 값이 있는 IP 목록"""
+    return ips_with_data(df_src, metric, media, episodes=range(1, int(ep) + 1))
+
+
+def has_data(df_src: pd.DataFrame, ip: str, metric, media=None, episodes=None, weeks=None,
+             kind: str = "val", how: str = "all") -> bool:
+    return ip in set(ips_with_data(df_src, metric, media, episodes, weeks, kind, how))
+
+
+def week_coverage(df_src: pd.DataFrame, metric, weeks: List[str], media=None, kind: str = "val",
+                  over: str = "requested") -> pd.Series:
+    """
+    IP별 주차 커버리지 (분모 주차 중 데이터가 있는 주차 비율)
+    - over='requested': 요청 주차 전체가 분모
+    - over='present': 요청 주차 중 (IP 무관) 해당 지표 행이 하나라도 있는 주차만 분모 (주차 피벗 열 기준과 동일)
+    """
+    ips, has = _availability_matrix(df_src, metric, media, weeks=weeks, kind=kind)
+    if over == "present":
+        _, rows = _availability_matrix(df_src, metric, media, weeks=weeks, kind="row")
+        has = has[:, rows.any(axis=0)]
+    return pd.Series(has.mean(axis=1) if has.shape[1] else 0.0, index=ips, dtype=float)
+
+
+# ===== 3.7-5. IP 카탈로그 (사이드바 검색 인덱스) =====
+# 방영시작 최신순으로 정렬한 IP 목록 + 자모/초성 키 정렬 배열 (데이터 버전별 1회 생성)
+# - 제목의 단어 시작 위치마다 키를 만들어 '업고' → '선재 업고 튀어'처럼 중간 단어 접두 검색 지원
+# - 자모 단위로 비교하므로 입력 중인 음절('눈무' → '눈물')도 매칭, 자음만 입력하면 초성 검색
+SIDEBAR_IP_LIMIT = 50
+
+_HANGUL_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_HANGUL_JONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+                "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 겹모음/겹받침은 입력 순서대로 풀어서 비교 ('달' 입력 중에도 '닭' 매칭)
+_JAMO_SPLIT = str.maketrans({
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+})
+
+
+def _jamo_key(s: str, choseong_only: bool = False) -> str:
+    """검색 비교용 키: 소문자 + 공백 제거 + 한글 음절을 자모(또는 초성)로 분해"""
+    out = []
+    for ch in str(s).lower():
+        if ch.isspace():
+            continue
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_HANGUL_CHO[code // 588])
+            if not choseong_only:
+                out.append(_HANGUL_JUNG[(code % 588) // 28] + _HANGUL_JONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out).translate(_JAMO_SPLIT)
+
+
+def _build_ip_catalog(df_full: pd.DataFrame) -> Dict[str, Any]:
+    if df_full.empty:
+        ips = []
+    elif "방영시작" in df_full.columns:
+        # '방영시작' 기준 최신순
+        ips = (
+            df_full.groupby("IP")["방영시작"]
+            .max()
+            .sort_values(ascending=False, na_position='last')
+            .index.tolist()
+        )
+    else:
+        # '방영시작' 컬럼이 없으면 가나다순
+        ips = sorted(df_full["IP"].dropna().unique().tolist())
+
+    full, cho = [], []
+    for i, ip in enumerate(ips):
+        name = str(ip)
+        starts = [0] + [m.end() for m in re.finditer(r"[\W_]+", name) if 0 < m.end() < len(name)]
+        for p in starts:
+            full.append((_jamo_key(name[p:]), i))
+            cho.append((_jamo_key(name[p:], choseong_only=True), i))
+    full.sort()
+    cho.sort()
+    return {
+        "ips": ips,
+        "pos": {ip: i for i, ip in enumerate(ips)},
+        "full": ([k for k, _ in full], [i for _, i in full]),
+        "cho": ([k for k, _ in cho], [i for _, i in cho]),
+    }
+
+
+def get_ip_catalog(df_src: pd.DataFrame) -> Dict[str, Any]:
+    return get_versioned_resource("ip_catalog", df_src, _build_ip_catalog)
+
+
+def search_ip_catalog(catalog: Dict[str, Any], query: str, limit: int = SIDEBAR_IP_LIMIT) -> tuple[List[str], int]:
+    """검색어에 맞는 IP를 카탈로그 순서(최신순)로 최대 limit개 반환합니다. (목록, 전체 매칭 수)"""
+    ips = catalog["ips"]
+    q = str(query or "").strip()
+    if not q:
+        return ips[:limit], len(ips)
+
+    use_cho = all(ch in _HANGUL_CHO for ch in q if not ch.isspace())
+    keys, idx = catalog["cho" if use_cho else "full"]
+    qk = _jamo_key(q, choseong_only=use_cho)
+    lo = bisect_left(keys, qk)
+    hi = bisect_left(keys, qk + "\U0010ffff")
+    hit = sorted(set(idx[lo:hi]))
+    return [ips[i] for i in hit[:limit]], len(hit)
+
+
+# ===== 3.8. 서버 페이지네이션 그리드 (AgGrid) =====
+GRID_ROW_HEIGHT = 34
+GRID_HEADER_HEIGHT = 40
+
+def paged_grid_slice(df: pd.DataFrame, sort_col: str, ascending: bool, query: str = "",
+                     page: int = 1, page_size: int = 10, search_col: str = "IP"):
+    """검색 → 정렬 → 페이지 슬라이스를 서버에서 계산합니다. (page_df, 검색 결과 전체, 전체 페이지 수, page)"""
+    view = df
+    if query and search_col in view.columns:
+        view = view[view[search_col].astype(str).str.contains(query.strip(), case=False, regex=False)]
+    if sort_col in view.columns:
+        view = view.sort_values(sort_col, ascending=ascending, kind="mergesort", na_position="last")
+    n_pages = max(1, -(-len(view) // page_size))
+    page = min(max(1, int(page)), n_pages)
+    return view.iloc[(page - 1) * page_size: page * page_size], view, n_pages, page
+
+
+def render_paged_grid(df: pd.DataFrame, key: str, build_grid_options, sort_labels: Dict[str, str],
+                      default_sort: str, ascending: bool = False, page_size: int = 10,
+                      focus_ip: str | None = None, header_rows: int = 1):
+    """
+    정렬/검색/페이지는 서버(pandas)에서 처리하고, 현재 페이지 행만 AgGrid로 보냅니다.
+    - build_grid_options(page_df) → gridOptions
+    - sort_labels: {표시명: 컬럼명} (컬럼명이 ""이면 원래 순서 유지)
+    - focus_ip가 있으면 처음 열 때 그 IP가 있는 페이지로 이동
+    """
+    c_q, c_sort, c_dir, c_page = st.columns([3, 2, 1.5, 1.5])
+    with c_q:
+        query = st.text_input("IP 검색", key=f"{key}_q", placeholder="IP 검색", label_visibility="collapsed")
+    with c_sort:
+        labels = list(sort_labels.keys())
+        default_label = next((k for k, v in sort_labels.items() if v == default_sort), labels[0])
+        sort_label = st.selectbox("정렬", labels, index=labels.index(default_label), key=f"{key}_sort", label_visibility="collapsed")
+    with c_dir:
+        dirs = ["내림차순", "오름차순"]
+        sort_dir = st.selectbox("순서", dirs, index=1 if ascending else 0, key=f"{key}_dir", label_visibility="collapsed")
+
+    sort_col = sort_labels[sort_label]
+    is_asc = sort_dir == "오름차순"
+    _, view, n_pages, _ = paged_grid_slice(df, sort_col, is_asc, query, 1, page_size)
+
+    # 검색/정렬/데이터가 바뀌면 페이지를 다시 잡음 (선택 IP가 있는 페이지 우선)
+    page_key = f"{key}_page"
+    sig = (query, sort_col, is_asc, len(view), focus_ip)
+    if st.session_state.get(f"{key}_sig") != sig or page_key not in st.session_state:
+        start_page = 1
+        if focus_ip is not None and "IP" in view.columns:
+            pos = np.flatnonzero(view["IP"].to_numpy() == focus_ip)
+            if pos.size:
+                start_page = int(pos[0]) // page_size + 1
+        st.session_state[page_key] = start_page
+        st.session_state[f"{key}_sig"] = sig
+    st.session_state[page_key] = min(max(1, st.session_state[page_key]), n_pages)
+
+    with c_page:
+        page = st.number_input("페이지", min_value=1, max_value=n_pages, step=1, key=page_key, label_visibility="collapsed")
+
+    page_df = view.iloc[(page - 1) * page_size: page * page_size]
+    AgGrid(
+        page_df,
+        gridOptions=build_grid_options(page_df),
+        theme="streamlit",
+        height=header_rows * GRID_HEADER_HEIGHT + max(len(page_df), 1) * GRID_ROW_HEIGHT + 8,
+        fit_columns_on_grid_load=True,
+        update_mode=GridUpdateMode.NO_UPDATE,
+        allow_unsafe_jscode=True
+    )
+    if len(view):
+        st.caption(f"{(page - 1) * page_size + 1}–{(page - 1) * page_size + len(page_df)} / 총 {len(view)}개 · {page}/{n_pages} 페이지")
+    else:
+        st.caption("검색 결과가 없습니다.")
 
 current_page = get_current_page_default("Overview")
 st.session_state["page"] = current_page
 
-# 사이드바용 데이터 로드
-df_nav = load_data()
+# 사이드바용 데이터 로드 (이번 실행에서 쓸 스냅샷 고정)
+df_nav = pin_data_snapshot()
 
-# [수정] IP 리스트 정렬: '방영시작' 기준 최신순 (컬럼명 수정 반영)
-if not df_nav.empty and "방영시작" in df_nav.columns:
-    all_ips = (
-        df_nav.groupby("IP")["방영시작"]
-        .max()
-        .sort_values(ascending=False, na_position='last') # 최신순 정렬
-        .index.tolist()
-    )
-else:
-    # '방영시작' 컬럼이 없거나 데이터가 비어있으면 기존 가나다순 유지
-    all_ips = sorted(df_nav["IP"].dropna().unique().tolist()) if not df_nav.empty else []
+# IP 카탈로그: '방영시작' 기준 최신순 목록 + 검색 인덱스 (데이터 버전별 1회 생성)
+ip_catalog = get_ip_catalog(df_nav)
 
 
 with st.sidebar:
@@ -681,14 +1756,29 @@ with st.sidebar:
     if "global_ip" not in st.session_state:
         st.session_state["global_ip"] = None
 
-    if all_ips:
-        # 2. 현재 선택된 IP의 인덱스 찾기 (없거나 None이면 idx는 None)
+    if ip_catalog["ips"]:
+        # 2. 검색어에 맞는 IP만 후보로 (전체 목록 대신 상위 SIDEBAR_IP_LIMIT개만 전송)
         current_ip = st.session_state.get("global_ip")
-        idx = all_ips.index(current_ip) if current_ip in all_ips else None
+        ip_query = st.text_input(
+            "IP 검색",
+            key="global_ip_query",
+            placeholder="IP 검색 (초성 가능)",
+            label_visibility="collapsed"
+        )
+        ip_options, n_match = search_ip_catalog(ip_catalog, ip_query)
+        if n_match > len(ip_options):
+            st.caption(f"검색 결과 {n_match}개 중 {len(ip_options)}개 표시")
+        elif ip_query and not n_match:
+            st.caption("검색 결과가 없습니다.")
+
+        # 현재 선택된 IP는 검색 결과에 없어도 유지 (없거나 None이면 idx는 None)
+        if current_ip in ip_catalog["pos"] and current_ip not in ip_options:
+            ip_options = [current_ip] + ip_options
+        idx = ip_options.index(current_ip) if current_ip in ip_options else None
 
         selected_global_ip = st.selectbox(
             "분석할 IP를 선택하세요",
-            all_ips,
+            ip_options,
             index=idx,                       # None이면 placeholder가 보임
             placeholder="IP를 선택해주세요",   # 디폴트 안내 문구
             key="global_ip_select",
@@ -706,20 +1796,31 @@ with st.sidebar:
         wrapper_cls = "nav-active" if is_active else "nav-inactive"
         st.markdown(f'<div class="{wrapper_cls}">', unsafe_allow_html=True)
 
-        clicked = st.button(
+        st.button(
             label,
             key=f"navbtn__{key}",
             use_container_width=True,
-            type=("primary" if is_active else "secondary")
+            type=("primary" if is_active else "secondary"),
+            on_click=None if is_active else _navigate_to,
+            args=(key,)
         )
         st.markdown('</div>', unsafe_allow_html=True)
-        
-        if clicked and not is_active:
-            st.session_state["page"] = key
-            _set_page_query_param(key)
-            _rerun()
-            
+
     st.markdown("<div style='margin-top: 30px;'></div>", unsafe_allow_html=True)
+
+    # 데이터 기준 시각 (백그라운드 갱신 상태 포함)
+    _status = get_data_status()
+    if _status["loaded_at"] is not None:
+        _asof = f"데이터 기준 : {_status['loaded_at']:%Y-%m-%d %H:%M}"
+        if _status["refreshing"]:
+            _asof += " · 갱신 중"
+        elif _status["error"]:
+            _asof += " · 최근 갱신 실패"
+        st.markdown(
+            f"<p class='sidebar-asof' style='font-size:12px; color:gray;'>{_asof}</p>",
+            unsafe_allow_html=True
+        )
+
     st.markdown("<div style='margin-top: 30px;'></div>", unsafe_allow_html=True)
     st.markdown(
         "<p class='sidebar-contact' style='font-size:12px; color:gray;'>문의 : 미디어)마케팅팀 데이터인사이트파트</p>",
@@ -777,6 +1878,173 @@ def _fmt_ep(n):
     except Exception:
         return str(n)
 
+# ===== 6.1-1. 데모 텐서 엔진 (히트맵/표/피라미드 공용) =====
+def _demo_cell_index(s: str) -> int:
+    """'데모' 문자열 → DEMO_COLS_ORDER 위치 (해석 불가 시 -1)"""
+    g = gender_from_demo(s)
+    d = _decade_label_clamped(s)
+    if g is None or d is None:
+        return -1
+    return DEMO_COLS_ORDER.index(f"{d}{'남성' if g == '남' else '여성'}")
+
+
+def _demo_rows(df: pd.DataFrame) -> tuple[pd.DataFrame, np.ndarray]:
+    """시청인구 행 중 데모 해석이 되는 행과 각 행의 DEMO_COLS_ORDER 위치"""
+    sub = df[df["metric"] == "시청인구"] if "metric" in df.columns else df.iloc[0:0]
+    demo = sub["데모"].astype(str) if "데모" in sub.columns else pd.Series(dtype=str)
+    cell_map = {d: _demo_cell_index(d) for d in pd.unique(demo)}
+    cell = demo.map(cell_map).to_numpy(dtype=int) if len(demo) else np.zeros(0, dtype=int)
+    return sub[cell >= 0], cell[cell >= 0]
+
+
+def _build_demo_engine(df_full: pd.DataFrame) -> Dict[str, Any]:
+    """
+    시청인구 데모 행을 (IP × 회차 × 12데모 × 매체) 텐서로 한 번에 집계합니다.
+    - 회차 축의 마지막 칸은 '회차 없음' 행 전용
+    - sum: 값 합계 / rows: 행 수 / nz: 0이 아닌 행 수
+    - src_*: 원본 전체 행/시청인구 행의 (IP × 회차) 행 수 (demo_cube의 행 필터 판별용)
+    """
+    sub, cell = _demo_rows(df_full)
+
+    src_ip_codes, src_ips = pd.factorize(df_full["IP"], sort=True)
+    src_ep = df_full["회차_numeric"].to_numpy(dtype=float)
+    src_eps = np.unique(src_ep[~np.isnan(src_ep)])
+    src_ep_codes = np.where(np.isnan(src_ep), len(src_eps), np.searchsorted(src_eps, np.nan_to_num(src_ep)))
+    src_shape = (len(src_ips), len(src_eps) + 1)
+    src_flat = np.ravel_multi_index((src_ip_codes, src_ep_codes), src_shape) if len(df_full) else np.zeros(0, dtype=int)
+    is_pop = (df_full["metric"] == "시청인구").to_numpy()
+
+    ip_codes, ips = pd.factorize(sub["IP"], sort=True)
+    media_codes, media = pd.factorize(sub["매체"], sort=True)
+    ep_vals = sub["회차_numeric"].to_numpy(dtype=float)
+    eps = np.unique(ep_vals[~np.isnan(ep_vals)])
+    ep_codes = np.where(np.isnan(ep_vals), len(eps), np.searchsorted(eps, np.nan_to_num(ep_vals)))
+    values = sub["value"].fillna(0).to_numpy(dtype=float)
+
+    shape = (len(ips), len(eps) + 1, len(DEMO_COLS_ORDER), len(media))
+    size = int(np.prod(shape))
+    flat = np.ravel_multi_index((ip_codes, ep_codes, cell, media_codes), shape) if size else np.zeros(0, dtype=int)
+    nonzero = values != 0
+
+    return {
+        "ips": pd.Index(ips),
+        "media": pd.Index(media),
+        "eps": np.append(eps, np.nan),
+        "sum": np.bincount(flat, weights=values, minlength=size).reshape(shape),
+        "rows": np.bincount(flat, minlength=size).reshape(shape).astype(np.int32),
+        "nz": np.bincount(flat[nonzero], minlength=size).reshape(shape).astype(np.int32),
+        "src_ips": pd.Index(src_ips),
+        "src_eps": src_eps,
+        "src_rows": np.bincount(src_flat, minlength=int(np.prod(src_shape))).reshape(src_shape),
+        "src_pop_rows": np.bincount(src_flat[is_pop], minlength=int(np.prod(src_shape))).reshape(src_shape),
+    }
+
+
+def get_demo_engine(df_src: pd.DataFrame) -> Dict[str, Any]:
+    return get_versioned_resource("demo_engine", df_src, _build_demo_engine)
+
+
+def _demo_src_keys(df_src: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, bool]:
+    """df_src의 (IP 목록, 회차 값 목록, 회차 없는 행 존재 여부)"""
+    ips = pd.unique(df_src["IP"]) if "IP" in df_src.columns else np.zeros(0, dtype=object)
+    if "회차_numeric" in df_src.columns:
+        ep_src = df_src["회차_numeric"]
+    else:
+        ep_src = df_src["회차"].str.extract(r"(\d+)", expand=False).astype(float)
+    return ips, ep_src.dropna().unique(), bool(ep_src.isna().any())
+
+
+def _demo_slice(eng: Dict[str, Any], keys: tuple, medias: List[str], max_ep: float = None) -> Dict[str, np.ndarray]:
+    src_ips, src_eps, src_no_ep = keys
+    ip_idx = eng["ips"].get_indexer(src_ips)
+    ip_idx = ip_idx[ip_idx >= 0]
+    m_idx = eng["media"].get_indexer(list(medias))
+    m_idx = m_idx[m_idx >= 0]
+
+    known_eps = eng["eps"][:-1]
+    ep_mask = np.isin(known_eps, src_eps)
+    if max_ep is not None:
+        ep_mask &= known_eps <= max_ep
+    ep_mask = np.append(ep_mask, src_no_ep)
+    ep_idx = np.flatnonzero(ep_mask)
+
+    sel = np.ix_(ip_idx, ep_idx, np.arange(len(DEMO_COLS_ORDER)), m_idx)
+    eps = eng["eps"][ep_idx]
+    return {
+        "eps": eps,
+        "ep_known": ~np.isnan(eps),
+        "sum": eng["sum"][sel].sum(axis=3),
+        "rows": eng["rows"][sel].sum(axis=3),
+        "nz": eng["nz"][sel].sum(axis=3),
+    }
+
+
+def demo_cube(df_src: pd.DataFrame, medias: List[str], max_ep: float = None) -> Dict[str, np.ndarray]:
+    """
+    df_src에 포함된 IP/회차 범위만 텐서에서 잘라 매체 합산한 조각을 반환합니다.
+    반환 배열 shape: (IP, 회차, 12데모) / ep_known=False 칸은 '회차 없음' 행
+    - df_src는 같은 버전 스냅샷의 행 부분집합이라고 보고, 선택된 (IP × 회차) 칸의 행 수만 비교
+      (전체 행 수 → 시청인구 행 수 순, 행을 다시 해석하지 않음)
+    - 그 칸 안의 행이 빠져 있으면(연도·편성 등 행 필터) df_src만으로 텐서를 만들어 집계
+    """
+    eng = get_demo_engine(df_src)
+    keys = _demo_src_keys(df_src)
+    if not _demo_src_is_whole(eng, df_src, keys):
+        eng = _build_demo_engine(df_src)
+    return _demo_slice(eng, keys, medias, max_ep)
+
+
+def _demo_src_is_whole(eng: Dict[str, Any], df_src: pd.DataFrame, keys: tuple) -> bool:
+    """df_src가 자기 (IP × 회차) 칸의 스냅샷 행을 모두(전체 또는 시청인구 행 전부) 담고 있는지"""
+    src_ips, src_eps, src_no_ep = keys
+    ip_idx = eng["src_ips"].get_indexer(src_ips)
+    if (ip_idx < 0).any():
+        return False
+    ep_mask = np.append(np.isin(eng["src_eps"], src_eps), src_no_ep)
+    sel = np.ix_(ip_idx, np.flatnonzero(ep_mask))
+    if len(df_src) == int(eng["src_rows"][sel].sum()):
+        return True
+    n_pop = int((df_src["metric"] == "시청인구").sum()) if "metric" in df_src.columns else 0
+    return n_pop == int(eng["src_pop_rows"][sel].sum())
+
+
+def _demo_episode_frame(eps: np.ndarray, mat: np.ndarray, row_mask: np.ndarray) -> pd.DataFrame:
+    if not row_mask.any():
+        return pd.DataFrame(columns=["회차"] + DEMO_COLS_ORDER)
+    out = pd.DataFrame(mat[row_mask], columns=DEMO_COLS_ORDER)
+    out.insert(0, "회차", [_fmt_ep(e) for e in eps[row_mask]])
+    return out
+
+
+def demo_sum_by_episode(df_src: pd.DataFrame, medias: List[str]) -> pd.DataFrame:
+    """회차 × 데모 시청인구 합계 (회차 컬럼 + DEMO_COLS_ORDER)"""
+    cube = demo_cube(df_src, medias)
+    known = cube["ep_known"]
+    tot = cube["sum"][:, known].sum(axis=0)
+    rows = cube["rows"][:, known].sum(axis=0)
+    return _demo_episode_frame(cube["eps"][known], tot, rows.sum(axis=1) > 0)
+
+
+def demo_mean_by_label(df_src: pd.DataFrame, medias: List[str]) -> pd.Series:
+    """데모 라벨별 (IP, 회차) 합계의 평균"""
+    cube = demo_cube(df_src, medias)
+    known = cube["ep_known"]
+    present = cube["rows"][:, known] > 0
+    cnt = present.sum(axis=(0, 1))
+    tot = cube["sum"][:, known].sum(axis=(0, 1))
+    has = cnt > 0
+    return pd.Series(tot[has] / cnt[has], index=pd.Index(np.array(DEMO_COLS_ORDER)[has], name="label"), dtype=float)
+
+
+def demo_pyramid_counts(df_src: pd.DataFrame, medias: List[str]) -> pd.DataFrame:
+    """연령대 × 성별(남/여) 누적 시청인구 (행이 있는 연령대만, 10대→60대 순)"""
+    cube = demo_cube(df_src, medias)
+    tot = cube["sum"].sum(axis=(0, 1)).reshape(2, len(DECADES))
+    rows = cube["rows"].sum(axis=(0, 1)).reshape(2, len(DECADES))
+    pvt = pd.DataFrame({"남": tot[0], "여": tot[1]}, index=pd.Index(DECADES, name="연령대_대"))
+    return pvt[rows.sum(axis=0) > 0]
+
+
 # ===== 6.2. 피라미드 차트 렌더링 (페이지 1, 2) =====
 COLOR_MALE = "#2a61cc"
 COLOR_FEMALE = "#d93636"
@@ -787,24 +2055,13 @@ def render_gender_pyramid(container, title: str, df_src: pd.DataFrame, height: i
         container.info("표시할 데이터가 없습니다.")
         return
 
-    df_demo = df_src.copy()
-    df_demo["성별"] = df_demo["데모"].apply(_gender_from_demo)
-    df_demo["연령대_대"] = df_demo["데모"].apply(_to_decade_label)
-    df_demo = df_demo[df_demo["성별"].isin(["남","여"]) & df_demo["연령대_대"].notna()]
+    pvt = demo_pyramid_counts(df_src, df_src["매체"].unique().tolist())
 
-    if df_demo.empty:
+    if pvt.empty:
         container.info("표시할 데모 데이터가 없습니다.")
         return
 
-    order = sorted(df_demo["연령대_대"].unique().tolist(), key=_decade_key)
-
-    pvt = (
-        df_demo.groupby(["연령대_대","성별"])["value"]
-               .sum()
-               .unstack("성별")
-               .reindex(order)
-               .fillna(0)
-    )
+    order = pvt.index.tolist()
 
     male = -pvt.get("남", pd.Series(0, index=pvt.index))
     female = pvt.get("여", pd.Series(0, index=pvt.index))
@@ -883,54 +2140,42 @@ def render_gender_pyramid(container, title: str, df_src: pd.DataFrame, height: i
 def get_avg_demo_pop_by_episode(df_src: pd.DataFrame, medias: List[str], max_ep: float = None) -> pd.DataFrame:
     """
     여러 IP가 포함된 df_src에서, 회차별/데모별 *평균* 시청자수(시청인구)를 계산합니다.
+    (0 값은 제외하고, 해당 회차·데모에 값이 있는 IP끼리 평균)
     """
-    # 1. 매체 및 지표 필터링
-    sub = df_src[
-        (df_src["metric"] == "시청인구") &
-        (df_src["데모"].notna()) &
-        (df_src["매체"].isin(medias))
-    ].copy()
-
-    if sub.empty:
-        return pd.DataFrame(columns=["회차"] + DEMO_COLS_ORDER)
-    
-    # 2. 회차 Numeric 컬럼 확보 및 필터링
-    if "회차_numeric" not in sub.columns:
-        sub["회차_numeric"] = sub["회차"].str.extract(r"(\d+)", expand=False).astype(float)
-    
-    sub = sub.dropna(subset=["회차_numeric"])
-    
-    # [핵심] max_ep가 있으면 그 이하 회차만 남김
-    if max_ep is not None:
-        sub = sub[sub["회차_numeric"] <= max_ep]
-
-    if sub.empty:
-        return pd.DataFrame(columns=["회차"] + DEMO_COLS_ORDER)
-
-    sub["value"] = pd.to_numeric(sub["value"], errors="coerce").replace(0, np.nan)
-    sub = sub.dropna(subset=["value"])
+    cube = demo_cube(df_src, medias, max_ep=max_ep)
+    known = cube["ep_known"]
+    present = cube["nz"][:, known] > 0
+    cnt = present.sum(axis=0)
+    tot = cube["sum"][:, known].sum(axis=0)
+    mean = np.divide(tot, cnt, out=np.zeros_like(tot), where=cnt > 0)
+    return _demo_episode_frame(cube["eps"][known], mean, cnt.sum(axis=1) > 0)
 
-    sub["성별"] = sub["데모"].apply(gender_from_demo)
-    sub["연령대_대"] = sub["데모"].apply(_decade_label_clamped)
-    sub = sub[sub["성별"].isin(["남", "여"]) & sub["연령대_대"].notna()].copy()
-    sub["회차_num"] = sub["회차_numeric"].astype(int)
-
-    sub["라벨"] = sub.apply(lambda r: f"{r['연령대_대']}{'남성' if r['성별']=='남' else '여성'}", axis=1)
-
-    ip_ep_demo_sum = sub.groupby(["IP", "회차_num", "라벨"])["value"].sum().reset_index()
-    ep_demo_mean = ip_ep_demo_sum.groupby(["회차_num", "라벨"])["value"].mean().reset_index()
-
-    pvt = ep_demo_mean.pivot_table(index="회차_num", columns="라벨", values="value").fillna(0)
-
-    for c in DEMO_COLS_ORDER:
-        if c not in pvt.columns:
-            pvt[c] = 0
-    pvt = pvt[DEMO_COLS_ORDER].sort_index()
+# ===== 6.4. [이동] 히트맵 렌더링 (구 Region 9에서 이동) =====
+HEATMAP_INF = 999
 
-    pvt.insert(0, "회차", pvt.index.map(_fmt_ep))
-    return pvt.reset_index(drop=True)
+def demo_index_matrix(base: np.ndarray, comp: np.ndarray) -> np.ndarray:
+    """
+    (기준 - 비교) / 비교 * 100 증감률 행렬. 비교값이 0이면 기준도 0일 때 0, 아니면 999(INF)
+    """
+    base = np.nan_to_num(np.asarray(base, dtype=float))
+    comp = np.nan_to_num(np.asarray(comp, dtype=float))
+    diff = np.divide(base - comp, comp, out=np.zeros_like(base), where=comp != 0) * 100
+    return np.where(comp != 0, diff, np.where(base == 0, 0.0, float(HEATMAP_INF)))
+
+
+def _heatmap_text_matrix(vals: np.ndarray) -> np.ndarray:
+    """증감률 행렬 → '+12%' / '-3%' / 'INF' / '' 텍스트 행렬 (셀 단위 파이썬 호출 없음)"""
+    vals = np.asarray(vals, dtype=float)
+    nan = np.isnan(vals)
+    rounded = np.rint(np.where(nan, 0, vals))
+    # f"{x:+.0f}" 과 동일하게 -0 은 '-0' 으로 표시
+    sign = np.where(np.signbit(rounded), "-", "+")
+    digits = np.abs(rounded).astype(np.int64).astype(str)
+    text = np.char.add(np.char.add(sign, digits), "%").astype(object)
+    text[vals == HEATMAP_INF] = "INF"
+    text[nan] = ""
+    return text
 
-# ===== 6.4. [이동] 히트맵 렌더링 (구 Region 9에서 이동) =====
 def render_heatmap(df_plot: pd.DataFrame, title: str):
     """
     데이터프레임을 받아 Plotly 히트맵을 렌더링합니다.
@@ -966,12 +2211,8 @@ def render_heatmap(df_plot: pd.DataFrame, title: str):
         color_continuous_midpoint=0
     )
 
-    text_template_df = df_heatmap.applymap(
-        lambda x: "INF" if x == 999 else (f"{x:+.0f}%" if pd.notna(x) else "")
-    )
-
     fig.update_traces(
-        text=text_template_df.values,
+        text=_heatmap_text_matrix(df_heatmap.to_numpy(dtype=float)),
         texttemplate="%{text}",
         hovertemplate="회차: %{y}<br>데모: %{x}<br>증감: %{text}<extra></extra>",
         textfont=dict(size=10, color="black")
@@ -1095,15 +2336,18 @@ def render_overview():
         )
 
     # ===== 필터 적용 =====
-    f = df.copy()
-    if prog_sel:
-        f = f[f["편성"].isin(prog_sel)]
-    
-    if year_sel and "편성연도" in f.columns:
-        f = f[f["편성연도"].isin(year_sel)]
-        
-    if month_sel and date_col_for_month in f.columns:
-        f = f[f[date_col_for_month].dt.month.isin(month_sel)]
+    def _apply_filters(frame: pd.DataFrame) -> pd.DataFrame:
+        if prog_sel:
+            frame = frame[frame["편성"].isin(prog_sel)]
+
+        if year_sel and "편성연도" in frame.columns:
+            frame = frame[frame["편성연도"].isin(year_sel)]
+
+        if month_sel and date_col_for_month in frame.columns:
+            frame = frame[frame[date_col_for_month].dt.month.isin(month_sel)]
+        return frame
+
+    f = _apply_filters(df.copy())
 
 
     # ===== 내부 툴팁 전용 KPI 렌더링 함수 =====
@@ -1188,7 +2432,7 @@ def render_overview():
             return 0, "데이터 없음"
             
         # 3위 이내 데이터 추출
-        sub["value_num"] = pd.to_numeric(sub["value"], errors="coerce")
+        sub["value_num"] = sub["value"]
         top3_sub = sub[sub["value_num"] <= 3]
         
         # 전체 랭크인 횟수
@@ -1252,25 +2496,16 @@ def render_overview():
 
 
     # ===== 주차별 시청자수 트렌드 (Stacked Bar) =====
-    df_trend = f[f["metric"]=="시청인구"].copy()
+    # 주간 롤업에서 같은 필터를 적용한 뒤 (주차시작일 × 매체) 피벗 한 번으로 집계
+    trend_media = {"TV": "TV 본방", "TVING LIVE": "티빙 본방", "TVING QUICK": "티빙 당일", "TVING VOD": "티빙 주간"}
+    weekly_rollup = get_weekly_rollup(df)
+    df_trend = _apply_filters(weekly_rollup[weekly_rollup["metric"] == "시청인구"])
     if not df_trend.empty:
-        tv_weekly = df_trend[df_trend["매체"]=="TV"].groupby("주차시작일")["value"].sum()
-        
-        tving_live_weekly = df_trend[df_trend["매체"]=="TVING LIVE"].groupby("주차시작일")["value"].sum()
-        tving_quick_weekly = df_trend[df_trend["매체"]=="TVING QUICK"].groupby("주차시작일")["value"].sum() 
-        tving_vod_weekly = df_trend[df_trend["매체"]=="TVING VOD"].groupby("주차시작일")["value"].sum()     
+        pvt = weekly_media_pivot(df_trend[df_trend["매체"].isin(list(trend_media))], "주차시작일")
 
-        all_dates = sorted(list(
-            set(tv_weekly.index) | set(tving_live_weekly.index) | 
-            set(tving_quick_weekly.index) | set(tving_vod_weekly.index)
-        ))
-        
-        if all_dates:
-            df_bar = pd.DataFrame({"주차시작일": all_dates})
-            df_bar["TV 본방"] = df_bar["주차시작일"].map(tv_weekly).fillna(0)
-            df_bar["티빙 본방"] = df_bar["주차시작일"].map(tving_live_weekly).fillna(0)
-            df_bar["티빙 당일"] = df_bar["주차시작일"].map(tving_quick_weekly).fillna(0) 
-            df_bar["티빙 주간"] = df_bar["주차시작일"].map(tving_vod_weekly).fillna(0)   
+        if not pvt.empty:
+            df_bar = (pvt.reindex(columns=list(trend_media), fill_value=0).rename(columns=trend_media)
+                      .rename_axis(columns=None).reset_index())
 
             df_long = df_bar.melt(id_vars="주차시작일",
                                   value_vars=["TV 본방","티빙 본방","티빙 당일","티빙 주간"],
@@ -1326,7 +2561,10 @@ def render_overview():
     # ===== 주요작품 테이블 (AgGrid) =====
     st.markdown("#### 🎬 전체 작품 RAW")
 
-    def calculate_overview_performance(df):
+    @st.cache_data(ttl=600, show_spinner=False)
+    def calculate_overview_performance(data_version, filter_key, _df):
+        # (데이터 버전, 필터) 단위로 캐시 → 정렬/검색/페이지 이동은 캐시된 표만 슬라이스
+        df = _df
         all_ips = df["IP"].unique()
         if len(all_ips) == 0: return pd.DataFrame()
 
@@ -1338,7 +2576,7 @@ def render_overview():
             if sub.empty or ep_col not in sub.columns: 
                 return pd.Series(dtype=float).reindex(all_ips).fillna(0)
             sub = sub.dropna(subset=[ep_col]).copy()
-            sub["value"] = pd.to_numeric(sub["value"], errors="coerce").replace(0, np.nan)
+            sub["value"] = sub["value"].replace(0, np.nan)
             sub = sub.dropna(subset=["value"])
             if sub.empty: return pd.Series(dtype=float).reindex(all_ips).fillna(0)
             ep_sum = sub.groupby(["IP", ep_col], as_index=False)["value"].sum()
@@ -1350,7 +2588,7 @@ def render_overview():
             if sub.empty or ep_col not in sub.columns:
                 return pd.Series(dtype=float).reindex(all_ips).fillna(0)
             sub = sub.dropna(subset=[ep_col]).copy()
-            sub["value"] = pd.to_numeric(sub["value"], errors="coerce").replace(0, np.nan)
+            sub["value"] = sub["value"].replace(0, np.nan)
             sub = sub.dropna(subset=["value"])
             if sub.empty: return pd.Series(dtype=float).reindex(all_ips).fillna(0)
             ep_mean = sub.groupby(["IP", ep_col], as_index=False)["value"].mean()
@@ -1371,7 +2609,8 @@ def render_overview():
         df_perf = pd.DataFrame(aggs).fillna(0).reset_index().rename(columns={"index": "IP"})
         return df_perf.sort_values("타깃시청률", ascending=False)
 
-    df_perf = calculate_overview_performance(f)
+    filter_key = (tuple(prog_sel), tuple(map(str, year_sel)), tuple(month_sel))
+    df_perf = calculate_overview_performance(get_data_version(f), filter_key, f)
 
     # 포맷터 정의
     fmt_fixed3 = JsCode("""function(params){ if(params.value==null||isNaN(params.value))return ''; return Number(params.value).toFixed(3); }""")
@@ -1394,62 +2633,119 @@ def render_overview():
     }}
     """)
 
-    gb = GridOptionsBuilder.from_dataframe(df_perf)
-    gb.configure_default_column(
-        sortable=True, resizable=True, filter=False,
-        cellStyle={'textAlign': 'center'},
-        headerClass='centered-header'
-    )
-    
-    # getRowStyle 적용
-    gb.configure_grid_options(
-        rowHeight=34, 
-        suppressMenuHide=True, 
-        domLayout='normal',
-        getRowStyle=highlight_jscode 
-    )
-    
-    gb.configure_column('IP', header_name='IP', cellStyle={'textAlign':'left'}) 
-    gb.configure_column('타깃시청률', valueFormatter=fmt_fixed3, sort='desc')
-    gb.configure_column('가구시청률', valueFormatter=fmt_fixed3)
-    gb.configure_column('티빙LIVE', valueFormatter=fmt_thousands)
-    gb.configure_column('티빙당일', header_name="티빙 당일 VOD", valueFormatter=fmt_thousands)
-    gb.configure_column('티빙주간', header_name="티빙 주간 VOD", valueFormatter=fmt_thousands)
-    gb.configure_column('디지털조회수', valueFormatter=fmt_thousands)
-    gb.configure_column('디지털언급량', valueFormatter=fmt_thousands)
-    gb.configure_column('화제성순위', valueFormatter=fmt_rank)
-    gb.configure_column('화제성점수', valueFormatter=fmt_thousands)
-
-    grid_options = gb.build()
-
-    AgGrid(
-        df_perf,
-        gridOptions=grid_options,
-        theme="streamlit",
-        height=300,
-        fit_columns_on_grid_load=True, 
-        update_mode=GridUpdateMode.NO_UPDATE,
-        allow_unsafe_jscode=True
+    def _overview_grid_options(page_df):
+        gb = GridOptionsBuilder.from_dataframe(page_df)
+        gb.configure_default_column(
+            sortable=False, resizable=True, filter=False,
+            cellStyle={'textAlign': 'center'},
+            headerClass='centered-header'
+        )
+        
+        # getRowStyle 적용
+        gb.configure_grid_options(
+            rowHeight=GRID_ROW_HEIGHT, 
+            suppressMenuHide=True, 
+            domLayout='normal',
+            getRowStyle=highlight_jscode 
+        )
+        
+        gb.configure_column('IP', header_name='IP', cellStyle={'textAlign':'left'}) 
+        gb.configure_column('타깃시청률', valueFormatter=fmt_fixed3)
+        gb.configure_column('가구시청률', valueFormatter=fmt_fixed3)
+        gb.configure_column('티빙LIVE', valueFormatter=fmt_thousands)
+        gb.configure_column('티빙당일', header_name="티빙 당일 VOD", valueFormatter=fmt_thousands)
+        gb.configure_column('티빙주간', header_name="티빙 주간 VOD", valueFormatter=fmt_thousands)
+        gb.configure_column('디지털조회수', valueFormatter=fmt_thousands)
+        gb.configure_column('디지털언급량', valueFormatter=fmt_thousands)
+        gb.configure_column('화제성순위', valueFormatter=fmt_rank)
+        gb.configure_column('화제성점수', valueFormatter=fmt_thousands)
+        return gb.build()
+
+    # 정렬/검색/페이지는 서버에서 처리하고 현재 페이지 행만 전송
+    render_paged_grid(
+        df_perf, "overview_raw", _overview_grid_options,
+        sort_labels={
+            "타깃시청률": "타깃시청률", "가구시청률": "가구시청률", "티빙 LIVE": "티빙LIVE",
+            "티빙 당일 VOD": "티빙당일", "티빙 주간 VOD": "티빙주간", "디지털조회수": "디지털조회수",
+            "디지털언급량": "디지털언급량", "화제성순위": "화제성순위", "화제성점수": "화제성점수", "IP": "IP",
+        },
+        default_sort="타깃시청률", ascending=False, page_size=10, focus_ip=target_ip,
     )
 #endregion
 #region [ 6-2. IP 성과 자세히보기 ]
 
 # [신규 추가] 본방 시작 여부 판단 헬퍼
 def get_aired_ips(df: pd.DataFrame) -> list:
-    """W1(1회차) 타깃시청률(T시청률) 데이터가 0 초과로 찍혀있는 IP 목록 반환"""
-    sub = df[df["metric"] == "T시청률"].copy()
-    sub["val"] = pd.to_numeric(sub["value"], errors="coerce").fillna(0)
-    
-    if "회차_numeric" not in sub.columns:
-        sub["회차_numeric"] = sub["회차"].astype(str).str.extract(r"(\d+)", expand=False).astype(float)
-    
-    # 1회차 T시청률이 0 초과인 경우 방영작으로 간주
-    aired_ips = sub[(sub["회차_numeric"] == 1) & (sub["val"] > 0)]["IP"].unique().tolist()
-    
-    # (안전장치) 1회차가 명시적으로 표기되지 않았더라도 T시청률이 0 초과로 존재하면 방영작으로 포함
-    fallback_ips = sub[sub["val"] > 0]["IP"].unique().tolist()
-    
-    return list(set(aired_ips) | set(fallback_ips))
+    """df에 있는 IP 중 타깃시청률(T시청률) 데이터가 0 초과로 찍혀있는 IP 목록 반환"""
+    # 1회차가 명시적으로 표기되지 않았더라도 T시청률이 0 초과로 존재하면 방영작으로 포함
+    # → 회차와 무관한 '0 초과 값 존재' 여부를 데이터 유무 비트맵에서 바로 조회
+    return ips_with_data(df, "T시청률")
+
+def _normalize_metric_name(s) -> str:
+    """지표명 비교용 정규화 (영문/숫자/한글만 남기고 소문자)"""
+    if s is None: return ""
+    return re.sub(r"[^A-Za-z0-9가-힣]+", "", str(s)).lower()
+
+
+# 그룹 평균(원 지표명) / 그룹 순위(정규화 지표명)용 IP별 값 정의: (지표, 매체, 집계)
+IP_DETAIL_GROUP_SPECS = {
+    "T": ("T시청률", None, "mean"),
+    "H": ("H시청률", None, "mean"),
+    "live": ("시청인구", ["TVING LIVE"], "ep_sum_mean"),
+    "quick": ("시청인구", ["TVING QUICK"], "ep_sum_mean"),
+    "vod": ("시청인구", ["TVING VOD"], "ep_sum_mean"),
+    "wavve": ("시청자수", ["웨이브"], "ep_sum_mean"),
+    "buzz": ("언급량", None, "sum"),
+    "view": ("조회수", None, "sum"),
+}
+IP_DETAIL_RANK_ONLY_SPECS = {
+    "netflix": ("N_W순위", None, "min"),
+    "fmin": ("F_Total", None, "min"),
+    "fscr": ("F_score", None, "mean"),
+}
+# 회차 구간 모드: KPI 카드 키 → 회차 구간 표(EPISODE_WINDOW_SPECS) 키
+IP_DETAIL_WINDOW_KEYS = {
+    "T": "T시청률", "H": "H시청률",
+    "live": "TVING LIVE", "quick": "TVING QUICK", "vod": "TVING 주간 VOD", "wavve": "웨이브",
+    "buzz": "디지털 언급량", "view": "디지털 조회수",
+    "fmin": "화제성 순위", "fscr": "화제성 점수",
+}
+
+
+def _ip_detail_group_table(df_full: pd.DataFrame, max_ep: float) -> pd.DataFrame:
+    """
+    IP 상세 KPI 카드의 그룹 평균/순위용 IP별 값 표 (max_ep 회차까지의 행 기준)
+    - 'mean:키' = mean_of_ip_* 정의, 'rank:키' = 정규화 지표명 기준 순위 시리즈
+    - 'fs_sum:회차' / 'fs_n:회차' = 화제성 점수 회차별 합계/행 수 (그룹 풀링 평균용)
+    """
+    df = df_full[df_full["회차_numeric"] <= max_ep]
+    norm_map = {m: _normalize_metric_name(m) for m in pd.unique(df["metric"])}
+    dn = df.assign(metric=df["metric"].map(norm_map))
+
+    cols = {}
+    for key, (metric, media, mode) in IP_DETAIL_GROUP_SPECS.items():
+        for prefix, frame, name in (("mean", df, metric), ("rank", dn, _normalize_metric_name(metric))):
+            if mode == "sum":
+                cols[f"{prefix}:{key}"] = ip_sums_series(frame, name, media=media)
+            else:
+                cols[f"{prefix}:{key}"] = _ip_episode_agg_series(
+                    frame, name, media=media, episode_agg="mean" if mode == "mean" else "sum")
+
+    for key, (metric, media, mode) in IP_DETAIL_RANK_ONLY_SPECS.items():
+        name = _normalize_metric_name(metric)
+        if mode == "mean":
+            cols[f"rank:{key}"] = _ip_episode_agg_series(dn, name, media=media, episode_agg="mean")
+        else:
+            sub = dn[(dn["metric"] == name) & (dn["value"] != 0)]
+            cols[f"rank:{key}"] = sub.groupby("IP")["value"].min()
+
+    fs = dn[dn["metric"] == _normalize_metric_name("F_score")]
+    for ep, g in fs.groupby("회차_numeric"):
+        grp = g.groupby("IP")["value"]
+        cols[f"fs_sum:{ep}"] = grp.sum()
+        cols[f"fs_n:{ep}"] = grp.size().astype(float)
+    return pd.DataFrame(cols).astype(float)
+
 
 def render_ip_detail():
     
@@ -1460,7 +2756,7 @@ def render_ip_detail():
         st.error("선택된 IP 정보가 없습니다.")
         return
 
-    filter_cols = st.columns([5, 2, 2])
+    filter_cols = st.columns([5, 2, 2, 1, 1])
 
     with filter_cols[0]:
         st.markdown(f"<div class='page-title'>📈 {ip_selected} 성과 상세</div>", unsafe_allow_html=True)
@@ -1538,32 +2834,38 @@ def render_ip_detail():
             comp_prog_filter = [comp_type]
         elif use_same_prog:
             comp_prog_filter = [sel_prog] if sel_prog else None
+
+    # [Col 3, 4] 회차 구간 (기본: 전체 회차 → 기존 누적 KPI)
+    ep_nums = sorted(int(e) for e in target_ip_rows["회차_numeric"].dropna().unique() if e > 0) if "회차_numeric" in target_ip_rows.columns else []
+    ep_window = None
+    if ep_nums:
+        with filter_cols[3]:
+            ep_from = st.selectbox("시작 회차", ep_nums, index=0, format_func=lambda e: f"{e}회~", label_visibility="collapsed")
+        with filter_cols[4]:
+            ep_to = st.selectbox("끝 회차", ep_nums, index=len(ep_nums) - 1, format_func=lambda e: f"~{e}회", label_visibility="collapsed")
+        if ep_from > ep_to:
+            st.warning("시작 회차가 끝 회차보다 뒤에 있어 두 값을 바꿔 적용합니다.", icon="⚠️")
+            ep_from, ep_to = ep_to, ep_from
+        if (ep_from, ep_to) != (ep_nums[0], ep_nums[-1]):
+            ep_window = (float(ep_from), float(ep_to))
 # --- 선택 IP 데이터 필터링 ---
     f = target_ip_rows.copy()
 
     if "회차_numeric" in f.columns:
-        f["회차_num"] = pd.to_numeric(f["회차_numeric"], errors="coerce")
+        f["회차_num"] = f["회차_numeric"]
     else:
         f["회차_num"] = pd.to_numeric(f["회차"].str.extract(r"(\d+)", expand=False), errors="coerce")
     
     my_max_ep = f["회차_num"].max()
 
-    def _week_to_num(x: str):
-        m = re.search(r"-?\d+", str(x))
-        return int(m.group(0)) if m else None
-
     has_week_col = "주차" in f.columns
-    if has_week_col:
-        f["주차_num"] = f["주차"].apply(_week_to_num)
+    if has_week_col and WEEK_NUM_COL not in f.columns:
+        f[WEEK_NUM_COL], f[WEEK_NORM_COL] = _decode_week_labels(f["주차"])
 
-    # --- 베이스(비교 그룹) 데이터 필터링 ---
-    base_raw = df_full.copy()
-    
-    # [추가] 비교 대상은 본방이 시작된(T시청률 0초과) 작품만 남기기
-    # (단, 현재 선택된 타깃 IP는 방영 전이더라도 기준점이 되므로 예외적으로 포함시킵니다)
-    aired_ips = get_aired_ips(base_raw)
-    base_raw = base_raw[base_raw["IP"].isin(aired_ips) | (base_raw["IP"] == ip_selected)]
-    
+    # --- 베이스(비교 그룹) 조건 ---
+    # 비교 대상은 본방이 시작된(T시청률 0초과) 작품만 (단, 현재 선택된 타깃 IP는 방영 전이더라도 포함)
+    # 그룹 KPI는 (편성, 편성연도) 셀 통계를 합쳐 계산하고, 셀 합산이 불가한 경우에만 원본 행을 필터링합니다.
+    group_progs = None
     group_name_parts = []
 
     # 1. 편성 기준 필터
@@ -1572,7 +2874,7 @@ def render_ip_detail():
         if use_same_prog and not sel_prog:
             st.warning(f"'{ip_selected}'의 편성 정보가 없어 '동일 편성' 기준은 제외됩니다.", icon="⚠️")
         else:
-            base_raw = base_raw[base_raw["편성"].isin(comp_prog_filter)]
+            group_progs = comp_prog_filter
 
             if comp_type == "평일":
                 group_name_parts.append("'평일(월화+수목)'")
@@ -1583,8 +2885,6 @@ def render_ip_detail():
 
     # 2. 방영 연도 필터
     if selected_years:
-        base_raw = base_raw[base_raw[date_col_for_filter].isin(selected_years)]
-        
         if len(selected_years) <= 3:
             years_str = ",".join(map(str, sorted(selected_years)))
             group_name_parts.append(f"{years_str}")
@@ -1598,19 +2898,31 @@ def render_ip_detail():
 
     if not group_name_parts:
         group_name_parts.append("전체")
+    if ep_window is not None:
+        group_name_parts.append(episode_window_label(*ep_window))
     
     prog_label = " & ".join(group_name_parts) + " 평균"
 
-    # --- (이하 로직 동일) ---
-    if "회차_numeric" in base_raw.columns:
-        base_raw["회차_num"] = pd.to_numeric(base_raw["회차_numeric"], errors="coerce")
-    else:
-        base_raw["회차_num"] = pd.to_numeric(base_raw["회차"].str.extract(r"(\d+)", expand=False), errors="coerce")
-    
+    group_cells = group_merged = None
     if pd.notna(my_max_ep):
-        base = base_raw[base_raw["회차_num"] <= my_max_ep].copy()
-    else:
-        base = base_raw.copy()
+        group_cells = get_group_cells("ip_detail", df_full, _ip_detail_group_table, float(my_max_ep))
+        group_merged = merge_group_cells(group_cells, group_progs, selected_years, include_ip=ip_selected)
+
+    def _base_rows() -> pd.DataFrame:
+        """셀 합산이 불가할 때만 쓰는 원본 행 기반 비교 그룹"""
+        base_raw = df_full[df_full["IP"].isin(get_aired_ips(df_full)) | (df_full["IP"] == ip_selected)]
+        if group_progs is not None:
+            base_raw = base_raw[base_raw["편성"].isin(group_progs)]
+        if selected_years:
+            base_raw = base_raw[base_raw[date_col_for_filter].isin(selected_years)]
+        base_raw = base_raw.copy()
+        if "회차_numeric" in base_raw.columns:
+            base_raw["회차_num"] = base_raw["회차_numeric"]
+        else:
+            base_raw["회차_num"] = pd.to_numeric(base_raw["회차"].str.extract(r"(\d+)", expand=False), errors="coerce")
+        if pd.notna(my_max_ep):
+            return base_raw[base_raw["회차_num"] <= my_max_ep].copy()
+        return base_raw
 
     st.markdown(
         f"<div class='sub-title'>📺 {ip_selected} 성과 상세 리포트</div>",
@@ -1619,10 +2931,7 @@ def render_ip_detail():
     st.markdown("---")
 
     # --- Metric Normalizer & Formatters ---
-    def _normalize_metric(s: str) -> str:
-        if s is None: return ""
-        s2 = re.sub(r"[^A-Za-z0-9가-힣]+", "", str(s)).lower()
-        return s2
+    _normalize_metric = _normalize_metric_name
 
     def _metric_filter(df: pd.DataFrame, name: str) -> pd.DataFrame:
         target = _normalize_metric(name)
@@ -1671,7 +2980,7 @@ def render_ip_detail():
 
         # [신규] 넷플릭스 순위 등 '회차' 정보가 없을 수 있는 지표 예외 처리
         if metric_name == "N_W순위":
-            sub["value"] = pd.to_numeric(sub["value"], errors="coerce").replace(0, np.nan)
+            sub["value"] = sub["value"].replace(0, np.nan)
             sub = sub.dropna(subset=["value"])
             if sub.empty: return pd.Series(dtype=float)
             if mode == "min": s = sub.groupby("IP")["value"].min()
@@ -1681,7 +2990,7 @@ def render_ip_detail():
 
         ep_col = _episode_col(sub)
         sub = sub.dropna(subset=[ep_col])
-        sub["value"] = pd.to_numeric(sub["value"], errors="coerce").replace(0, np.nan)
+        sub["value"] = sub["value"].replace(0, np.nan)
         sub = sub.dropna(subset=["value"])
         if sub.empty: return pd.Series(dtype=float)
 
@@ -1699,13 +3008,13 @@ def render_ip_detail():
     def _min_of_ip_metric(df_src: pd.DataFrame, metric_name: str) -> float | None:
         sub = _metric_filter(df_src, metric_name).copy()
         if sub.empty: return None
-        s = pd.to_numeric(sub["value"], errors="coerce").dropna()
+        s = sub["value"].dropna()
         return float(s.min()) if not s.empty else None
 
     def _mean_like_rating(df_src: pd.DataFrame, metric_name: str) -> float | None:
         sub = _metric_filter(df_src, metric_name).copy()
         if sub.empty: return None
-        sub["val"] = pd.to_numeric(sub["value"], errors="coerce")
+        sub["val"] = sub["value"]
         sub = sub.dropna(subset=["val"])
         if sub.empty: return None
         if "회차_num" in sub.columns and sub["회차_num"].notna().any():
@@ -1717,65 +3026,175 @@ def render_ip_detail():
         return float(sub["val"].mean())
 
     # --- KPI Calculation ---
-    val_T = mean_of_ip_episode_mean(f, "T시청률")
-    val_H = mean_of_ip_episode_mean(f, "H시청률")
-    val_live = mean_of_ip_episode_sum(f, "시청인구", ["TVING LIVE"])
-    val_quick = mean_of_ip_episode_sum(f, "시청인구", ["TVING QUICK"]) 
-    val_vod = mean_of_ip_episode_sum(f, "시청인구", ["TVING VOD"])
-
-    # [신규] Wavve VOD (metric="시청자수", media="웨이브")
-    val_wavve = mean_of_ip_episode_sum(f, "시청자수", ["웨이브"])
-
-    # [신규] Netflix Best Rank
-    val_netflix_best = _min_of_ip_metric(f, "N_W순위")
-
-    val_buzz = mean_of_ip_sums(f, "언급량")
-    val_view = mean_of_ip_sums(f, "조회수")
-    val_topic_min = _min_of_ip_metric(f, "F_Total")
-    val_topic_avg = _mean_like_rating(f, "F_score")
-
-    base_T = mean_of_ip_episode_mean(base, "T시청률")
-    base_H = mean_of_ip_episode_mean(base, "H시청률")
-    base_live = mean_of_ip_episode_sum(base, "시청인구", ["TVING LIVE"])
-    base_quick = mean_of_ip_episode_sum(base, "시청인구", ["TVING QUICK"])
-    base_vod = mean_of_ip_episode_sum(base, "시청인구", ["TVING VOD"])
-
-    # [신규] Wavve VOD Base
-    base_wavve = mean_of_ip_episode_sum(base, "시청자수", ["웨이브"])
-
-    # [신규] Netflix Base
-    base_netflix_series = _series_ip_metric(base, "N_W순위", mode="min")
-    base_netflix_best = float(base_netflix_series.mean()) if not base_netflix_series.empty else None
-    base_buzz = mean_of_ip_sums(base, "언급량")
-    base_view = mean_of_ip_sums(base, "조회수")
-    base_topic_min_series = _series_ip_metric(base, "F_Total", mode="min")
-    base_topic_min = float(base_topic_min_series.mean()) if not base_topic_min_series.empty else None
-    base_topic_avg = _mean_like_rating(base, "F_score")
-
-    # --- Ranking ---
-    def _rank_within_program(base_df, metric_name, ip_name, value, mode="mean", media=None, low_is_good=False):
-        s = _series_ip_metric(base_df, metric_name, mode=mode, media=media)
-        if s.empty or value is None or pd.isna(value): return (None, 0)
-        s = s.dropna()
-        if ip_name not in s.index: return (None, int(s.shape[0]))
-        ranks = s.rank(method="min", ascending=low_is_good)
-        return (int(ranks.loc[ip_name]), int(s.shape[0]))
-
-    rk_T     = _rank_within_program(base, "T시청률", ip_selected, val_T,   mode="mean",        media=None)
-    rk_H     = _rank_within_program(base, "H시청률", ip_selected, val_H,   mode="mean",        media=None)
-    rk_live  = _rank_within_program(base, "시청인구", ip_selected, val_live,  mode="ep_sum_mean", media=["TVING LIVE"])
-    rk_quick = _rank_within_program(base, "시청인구", ip_selected, val_quick, mode="ep_sum_mean", media=["TVING QUICK"])
-    rk_vod   = _rank_within_program(base, "시청인구", ip_selected, val_vod,   mode="ep_sum_mean", media=["TVING VOD"])
-
-    # [신규] Wavve Rank
-    rk_wavve = _rank_within_program(base, "시청자수", ip_selected, val_wavve, mode="ep_sum_mean", media=["웨이브"])
-
-    # [신규] Netflix Rank
-    rk_netflix = _rank_within_program(base, "N_W순위", ip_selected, val_netflix_best, mode="min", media=None, low_is_good=True)
-    rk_buzz  = _rank_within_program(base, "언급량",   ip_selected, val_buzz,  mode="sum",        media=None)
-    rk_view  = _rank_within_program(base, "조회수",   ip_selected, val_view,  mode="sum",        media=None)
-    rk_fmin  = _rank_within_program(base, "F_Total",  ip_selected, val_topic_min, mode="min",   media=None, low_is_good=True)
-    rk_fscr  = _rank_within_program(base, "F_score",  ip_selected, val_topic_avg, mode="mean",  media=None, low_is_good=False)
+    if ep_window is not None:
+        # --- 회차 구간 경로: IP × 회차 누적합 배열의 차로 IP 값, 셀 합산으로 그룹 평균/순위 ---
+        win_table = episode_window_table(df_full, *ep_window, keys=list(IP_DETAIL_WINDOW_KEYS.values()))
+        win_rows = df_full if pd.isna(my_max_ep) else df_full[df_full["회차_numeric"] <= my_max_ep]
+        win_cells = _build_group_cells(win_table, get_group_tags(df_full), None, win_rows)
+        win_merged = merge_group_cells(win_cells, group_progs, selected_years, include_ip=ip_selected)
+        if win_merged is not None:
+            win_ips = win_merged["ips"]
+            w_mean = dict(zip(win_cells["columns"], win_merged["mean"]))
+            w_sorted = dict(zip(win_cells["columns"], win_merged["sorted"]))
+        else:
+            win_ips = _base_rows()["IP"].unique()
+            w_mean = win_table.reindex(win_ips).mean().to_dict()
+            w_sorted = build_group_rank_index(win_table, win_table.index.isin(win_ips))
+        w_ip = win_table.reindex([ip_selected]).iloc[0]
+
+        def _wval(key):
+            v = w_ip[IP_DETAIL_WINDOW_KEYS[key]]
+            return float(v) if pd.notna(v) else None
+
+        def _wmean(key):
+            v = w_mean.get(IP_DETAIL_WINDOW_KEYS[key], np.nan)
+            return float(v) if pd.notna(v) else None
+
+        def _wrank(key, low_is_good=False):
+            arr = w_sorted.get(IP_DETAIL_WINDOW_KEYS[key], np.zeros(0))
+            v = _wval(key)
+            if arr.size == 0 or v is None: return (None, int(arr.size))
+            if low_is_good:
+                return (int(np.searchsorted(arr, v, side="left")) + 1, int(arr.size))
+            return (int(arr.size - np.searchsorted(arr, v, side="right")) + 1, int(arr.size))
+
+        val_T, val_H = _wval("T"), _wval("H")
+        val_live, val_quick, val_vod, val_wavve = _wval("live"), _wval("quick"), _wval("vod"), _wval("wavve")
+        # 넷플릭스 순위는 회차 없이 주차로만 쌓이므로 구간과 무관하게 누적 값 사용
+        val_netflix_best = _min_of_ip_metric(f, "N_W순위")
+        val_buzz, val_view = _wval("buzz"), _wval("view")
+        val_topic_min = _wval("fmin")
+        val_topic_avg = episode_window_pooled_mean(df_full, [ip_selected], *ep_window)
+
+        base_T, base_H = _wmean("T"), _wmean("H")
+        base_live, base_quick, base_vod, base_wavve = _wmean("live"), _wmean("quick"), _wmean("vod"), _wmean("wavve")
+        base_netflix_best, rk_netflix = None, (None, 0)
+        if group_merged is not None:
+            nf_col = group_cells["columns"].index("rank:netflix")
+            nf_mean, nf_arr = group_merged["mean"][nf_col], group_merged["sorted"][nf_col]
+            base_netflix_best = float(nf_mean) if not np.isnan(nf_mean) else None
+            nf_val = group_cells["table"].reindex([ip_selected]).iloc[0]["rank:netflix"]
+            if nf_arr.size and pd.notna(nf_val) and val_netflix_best is not None:
+                rk_netflix = (int(np.searchsorted(nf_arr, nf_val, side="left")) + 1, int(nf_arr.size))
+        base_buzz, base_view = _wmean("buzz"), _wmean("view")
+        base_topic_min = _wmean("fmin")
+        base_topic_avg = episode_window_pooled_mean(df_full, win_ips, *ep_window)
+
+        rk_T, rk_H = _wrank("T"), _wrank("H")
+        rk_live, rk_quick, rk_vod, rk_wavve = _wrank("live"), _wrank("quick"), _wrank("vod"), _wrank("wavve")
+        rk_buzz, rk_view = _wrank("buzz"), _wrank("view")
+        rk_fmin = _wrank("fmin", low_is_good=True)
+        rk_fscr = _wrank("fscr")
+    else:
+        val_T = mean_of_ip_episode_mean(f, "T시청률")
+        val_H = mean_of_ip_episode_mean(f, "H시청률")
+        val_live = mean_of_ip_episode_sum(f, "시청인구", ["TVING LIVE"])
+        val_quick = mean_of_ip_episode_sum(f, "시청인구", ["TVING QUICK"]) 
+        val_vod = mean_of_ip_episode_sum(f, "시청인구", ["TVING VOD"])
+
+        # [신규] Wavve VOD (metric="시청자수", media="웨이브")
+        val_wavve = mean_of_ip_episode_sum(f, "시청자수", ["웨이브"])
+
+        # [신규] Netflix Best Rank
+        val_netflix_best = _min_of_ip_metric(f, "N_W순위")
+
+        val_buzz = mean_of_ip_sums(f, "언급량")
+        val_view = mean_of_ip_sums(f, "조회수")
+        val_topic_min = _min_of_ip_metric(f, "F_Total")
+        val_topic_avg = _mean_like_rating(f, "F_score")
+
+        if group_merged is not None:
+            # --- 셀 통계 합산 경로 ---
+            g_cols = group_cells["columns"]
+            g_mean = dict(zip(g_cols, group_merged["mean"]))
+            g_sorted = dict(zip(g_cols, group_merged["sorted"]))
+            g_ip_vals = group_cells["table"].reindex([ip_selected]).iloc[0] if ip_selected in set(group_merged["ips"]) else None
+
+            def _gmean(col):
+                v = g_mean.get(col, np.nan)
+                return float(v) if not np.isnan(v) else None
+
+            base_T = _gmean("mean:T")
+            base_H = _gmean("mean:H")
+            base_live = _gmean("mean:live")
+            base_quick = _gmean("mean:quick")
+            base_vod = _gmean("mean:vod")
+            base_wavve = _gmean("mean:wavve")
+            base_netflix_best = _gmean("rank:netflix")
+            base_buzz = _gmean("mean:buzz")
+            base_view = _gmean("mean:view")
+            base_topic_min = _gmean("rank:fmin")
+
+            # 화제성 점수 평균: 그룹 전체 행을 회차별로 풀링한 평균의 평균
+            g_sum = dict(zip(g_cols, group_merged["sum"]))
+            fs_means = [g_sum["fs_sum:" + c.split(":", 1)[1]] / g_sum[c] for c in g_cols if c.startswith("fs_n:") and g_sum[c] > 0]
+            base_topic_avg = float(np.mean(fs_means)) if fs_means else None
+
+            def _rank_within_program(key, value, low_is_good=False):
+                arr = g_sorted.get(f"rank:{key}", np.zeros(0))
+                if arr.size == 0 or value is None or pd.isna(value): return (None, 0)
+                v = g_ip_vals.get(f"rank:{key}") if g_ip_vals is not None else np.nan
+                if pd.isna(v): return (None, int(arr.size))
+                if low_is_good:
+                    return (int(np.searchsorted(arr, v, side="left")) + 1, int(arr.size))
+                return (int(arr.size - np.searchsorted(arr, v, side="right")) + 1, int(arr.size))
+
+            rk_T     = _rank_within_program("T", val_T)
+            rk_H     = _rank_within_program("H", val_H)
+            rk_live  = _rank_within_program("live", val_live)
+            rk_quick = _rank_within_program("quick", val_quick)
+            rk_vod   = _rank_within_program("vod", val_vod)
+            rk_wavve = _rank_within_program("wavve", val_wavve)
+            rk_netflix = _rank_within_program("netflix", val_netflix_best, low_is_good=True)
+            rk_buzz  = _rank_within_program("buzz", val_buzz)
+            rk_view  = _rank_within_program("view", val_view)
+            rk_fmin  = _rank_within_program("fmin", val_topic_min, low_is_good=True)
+            rk_fscr  = _rank_within_program("fscr", val_topic_avg)
+        else:
+            base = _base_rows()
+
+            base_T = mean_of_ip_episode_mean(base, "T시청률")
+            base_H = mean_of_ip_episode_mean(base, "H시청률")
+            base_live = mean_of_ip_episode_sum(base, "시청인구", ["TVING LIVE"])
+            base_quick = mean_of_ip_episode_sum(base, "시청인구", ["TVING QUICK"])
+            base_vod = mean_of_ip_episode_sum(base, "시청인구", ["TVING VOD"])
+
+            # [신규] Wavve VOD Base
+            base_wavve = mean_of_ip_episode_sum(base, "시청자수", ["웨이브"])
+
+            # [신규] Netflix Base
+            base_netflix_series = _series_ip_metric(base, "N_W순위", mode="min")
+            base_netflix_best = float(base_netflix_series.mean()) if not base_netflix_series.empty else None
+            base_buzz = mean_of_ip_sums(base, "언급량")
+            base_view = mean_of_ip_sums(base, "조회수")
+            base_topic_min_series = _series_ip_metric(base, "F_Total", mode="min")
+            base_topic_min = float(base_topic_min_series.mean()) if not base_topic_min_series.empty else None
+            base_topic_avg = _mean_like_rating(base, "F_score")
+
+            # --- Ranking ---
+            def _rank_within_program(base_df, metric_name, ip_name, value, mode="mean", media=None, low_is_good=False):
+                s = _series_ip_metric(base_df, metric_name, mode=mode, media=media)
+                if s.empty or value is None or pd.isna(value): return (None, 0)
+                s = s.dropna()
+                if ip_name not in s.index: return (None, int(s.shape[0]))
+                ranks = s.rank(method="min", ascending=low_is_good)
+                return (int(ranks.loc[ip_name]), int(s.shape[0]))
+
+            rk_T     = _rank_within_program(base, "T시청률", ip_selected, val_T,   mode="mean",        media=None)
+            rk_H     = _rank_within_program(base, "H시청률", ip_selected, val_H,   mode="mean",        media=None)
+            rk_live  = _rank_within_program(base, "시청인구", ip_selected, val_live,  mode="ep_sum_mean", media=["TVING LIVE"])
+            rk_quick = _rank_within_program(base, "시청인구", ip_selected, val_quick, mode="ep_sum_mean", media=["TVING QUICK"])
+            rk_vod   = _rank_within_program(base, "시청인구", ip_selected, val_vod,   mode="ep_sum_mean", media=["TVING VOD"])
+
+            # [신규] Wavve Rank
+            rk_wavve = _rank_within_program(base, "시청자수", ip_selected, val_wavve, mode="ep_sum_mean", media=["웨이브"])
+
+            # [신규] Netflix Rank
+            rk_netflix = _rank_within_program(base, "N_W순위", ip_selected, val_netflix_best, mode="min", media=None, low_is_good=True)
+            rk_buzz  = _rank_within_program(base, "언급량",   ip_selected, val_buzz,  mode="sum",        media=None)
+            rk_view  = _rank_within_program(base, "조회수",   ip_selected, val_view,  mode="sum",        media=None)
+            rk_fmin  = _rank_within_program(base, "F_Total",  ip_selected, val_topic_min, mode="min",   media=None, low_is_good=True)
+            rk_fscr  = _rank_within_program(base, "F_score",  ip_selected, val_topic_avg, mode="mean",  media=None, low_is_good=False)
 
     # --- KPI Render Helpers ---
     def _pct_color(val, base_val):
@@ -1876,9 +3295,11 @@ def render_ip_detail():
     cA, cB = st.columns(2)
     with cA:
         st.markdown("<div class='sec-title'>📈 시청률</div>", unsafe_allow_html=True)
-        rsub = f[f["metric"].isin(["T시청률", "H시청률"])].dropna(subset=["회차", "회차_num"]).copy()
-        rsub = rsub.sort_values("회차_num")
-        if not rsub.empty:
+        def _build_rate_fig():
+            rsub = f[f["metric"].isin(["T시청률", "H시청률"])].dropna(subset=["회차", "회차_num"]).copy()
+            rsub = rsub.sort_values("회차_num")
+            if rsub.empty:
+                return None
             ep_order = rsub[["회차", "회차_num"]].drop_duplicates().sort_values("회차_num")["회차"].tolist()
             t_series = rsub[rsub["metric"] == "T시청률"].groupby("회차", as_index=False)["value"].mean()
             h_series = rsub[rsub["metric"] == "H시청률"].groupby("회차", as_index=False)["value"].mean()
@@ -1897,6 +3318,10 @@ def render_ip_detail():
             fig_rate.update_xaxes(categoryorder="array", categoryarray=ep_order, title=None, fixedrange=True)
             fig_rate.update_yaxes(title=None, fixedrange=True, range=[0, y_upper] if (y_upper and y_upper > 0) else None)
             fig_rate.update_layout(legend_title=None, height=chart_h, margin=dict(l=8, r=8, t=10, b=8), legend=dict(orientation='h', yanchor='bottom', y=1.02))
+            return fig_rate
+
+        fig_rate = cached_figure("ip_detail.rating", ip_selected, f, _build_rate_fig)
+        if fig_rate is not None:
             st.plotly_chart(fig_rate, use_container_width=True, config=common_cfg)
         else:
             st.info("표시할 시청률 데이터가 없습니다.")
@@ -1915,7 +3340,7 @@ def render_ip_detail():
         chart_title = "📱 TVING & Wavve 시청자수" if has_wavve else "📱 TVING 시청자수"
         st.markdown(f"<div class='sec-title'>{chart_title}</div>", unsafe_allow_html=True)
 
-        if not tsub.empty or has_wavve:
+        def _build_ott_fig():
             combined = pd.DataFrame()
 
             if not tsub.empty:
@@ -1983,6 +3408,10 @@ def render_ip_detail():
                 yaxis=dict(title=None, range=[0, max_val * 1.25] if pd.notna(max_val) else None),
                 xaxis=dict(title=None, fixedrange=True),
             )
+            return fig_ott
+
+        fig_ott = cached_figure("ip_detail.tving", ip_selected, f, _build_ott_fig) if (not tsub.empty or has_wavve) else None
+        if fig_ott is not None:
             st.plotly_chart(fig_ott, use_container_width=True, config=common_cfg)
         else:
             st.info("표시할 TVING 시청자 데이터가 없습니다.")
@@ -1990,22 +3419,16 @@ def render_ip_detail():
     # === [Row2] 데모 분포 ===
     cG, cH, cI = st.columns(3)
 
-    def _render_pyramid_local(container, title, df_src, height=260):
-        if df_src.empty:
-            container.info("표시할 데이터가 없습니다."); return
-
+    def _build_pyramid_fig(title, df_src, medias, height):
         COLOR_MALE_NEW = "#5B85D9"; COLOR_FEMALE_NEW = "#E66C6C"
 
-        df_demo = df_src.copy()
-        df_demo["성별"] = df_demo["데모"].apply(_gender_from_demo)
-        df_demo["연령대_대"] = df_demo["데모"].apply(_to_decade_label)
-        df_demo = df_demo[df_demo["성별"].isin(["남","여"]) & df_demo["연령대_대"].notna()]
-
-        if df_demo.empty: container.info("데이터 없음"); return
+        pvt = demo_pyramid_counts(df_src, medias)
+        if pvt.empty:
+            return None
 
         order = ["60대", "50대", "40대", "30대", "20대", "10대"]
 
-        pvt = df_demo.groupby(["연령대_대","성별"])["value"].sum().unstack("성별").reindex(order).fillna(0)
+        pvt = pvt.reindex(order).fillna(0)
         male = -pvt.get("남", pd.Series(0, index=pvt.index))
         female = pvt.get("여", pd.Series(0, index=pvt.index))
 
@@ -2042,42 +3465,48 @@ def render_ip_detail():
         )
         fig.update_yaxes(categoryorder="array", categoryarray=order, fixedrange=True)
         fig.update_xaxes(range=[-max_abs*1.1, max_abs*1.1], showticklabels=False, showgrid=False, zeroline=True, fixedrange=True)
+        return fig
+
+    def _render_pyramid_local(container, title, df_src, medias, height=260):
+        fig = cached_figure(
+            "ip_detail.pyramid", (ip_selected, tuple(medias), title, height), df_src,
+            lambda: _build_pyramid_fig(title, df_src, medias, height),
+        )
+        if fig is None:
+            container.info("표시할 데이터가 없습니다."); return
         container.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
     with cG:
         st.markdown("<div class='sec-title' style='font-size:18px;'>👥누적 시청자 분포 - TV</div>", unsafe_allow_html=True)
-        tv_demo = f[(f["매체"] == "TV") & (f["metric"] == "시청인구") & f["데모"].notna()].copy()
-        _render_pyramid_local(cG, "", tv_demo, height=260)
+        _render_pyramid_local(cG, "", f, ["TV"], height=260)
 
     with cH:
         st.markdown("<div class='sec-title' style='font-size:18px;'>👥누적 시청자 분포 - TVING LIVE</div>", unsafe_allow_html=True)
-        live_demo = f[(f["매체"] == "TVING LIVE") & (f["metric"] == "시청인구") & f["데모"].notna()].copy()
-        _render_pyramid_local(cH, "", live_demo, height=260)
+        _render_pyramid_local(cH, "", f, ["TVING LIVE"], height=260)
 
     with cI:
         st.markdown("<div class='sec-title' style='font-size:18px;'>👥누적 시청자 분포 - TVING VOD</div>", unsafe_allow_html=True)
-        vod_demo = f[(f["매체"].isin(["TVING VOD", "TVING QUICK"])) & (f["metric"] == "시청인구") & f["데모"].notna()].copy()
-        _render_pyramid_local(cI, "", vod_demo, height=260)
+        _render_pyramid_local(cI, "", f, ["TVING VOD", "TVING QUICK"], height=260)
 
     # === [Row3] 디지털&화제성 ===
     digital_colors = ['#5c6bc0', '#7e57c2', '#26a69a', '#66bb6a', '#ffa726', '#ef5350']
 
     # ----------------------------
-    # Row3-1: 디지털 (2열)
+    # Row3-1: 디지털 (2열) — 주간 롤업에서 선택 IP 행만 사용
     # ----------------------------
+    weekly_rollup = get_weekly_rollup(f)
+    ip_rollup = weekly_rollup[weekly_rollup["IP"] == ip_selected]
     cC, cD = st.columns(2)
 
     with cC:
         st.markdown("<div class='sec-title'>💻 디지털 조회수</div>", unsafe_allow_html=True)
-        dview = _get_view_data(f) 
-        if not dview.empty:
+        dview = ip_rollup[ip_rollup["metric"] == "조회수"]
+        def _build_view_fig():
             if has_week_col and dview["주차"].notna().any():
-                order = (dview[["주차", "주차_num"]].dropna().drop_duplicates().sort_values("주차_num")["주차"].tolist())
-                pvt = dview.pivot_table(index="주차", columns="매체", values="value", aggfunc="sum").fillna(0)
-                pvt = pvt.reindex(order)
+                pvt = weekly_media_pivot(dview, "주차")
                 x_vals = pvt.index.tolist(); use_category = True
             else:
-                pvt = (dview.pivot_table(index="주차시작일", columns="매체", values="value", aggfunc="sum").sort_index().fillna(0))
+                pvt = weekly_media_pivot(dview, "주차시작일")
                 x_vals = pvt.index.tolist(); use_category = False
 
             total_view = pvt.sum(axis=1)
@@ -2103,21 +3532,23 @@ def render_ip_detail():
                 yaxis=dict(tickvals=view_ticks_val, ticktext=view_ticks_txt, fixedrange=True, range=[0, max_view * 1.15])
             )
             if use_category: fig_view.update_xaxes(categoryorder="array", categoryarray=x_vals, fixedrange=True)
+            return fig_view
+
+        fig_view = cached_figure("ip_detail.digital_view", ip_selected, f, _build_view_fig) if not dview.empty else None
+        if fig_view is not None:
             st.plotly_chart(fig_view, use_container_width=True, config=common_cfg)
         else:
             st.info("표시할 조회수 데이터가 없습니다.")
 
     with cD:
         st.markdown("<div class='sec-title'>💬 디지털 언급량</div>", unsafe_allow_html=True)
-        dbuzz = f[f["metric"] == "언급량"].copy()
-        if not dbuzz.empty:
+        dbuzz = ip_rollup[ip_rollup["metric"] == "언급량"]
+        def _build_buzz_fig():
             if has_week_col and dbuzz["주차"].notna().any():
-                order = (dbuzz[["주차", "주차_num"]].dropna().drop_duplicates().sort_values("주차_num")["주차"].tolist())
-                pvt = dbuzz.pivot_table(index="주차", columns="매체", values="value", aggfunc="sum").fillna(0)
-                pvt = pvt.reindex(order)
+                pvt = weekly_media_pivot(dbuzz, "주차")
                 x_vals = pvt.index.tolist(); use_category = True
             else:
-                pvt = (dbuzz.pivot_table(index="주차시작일", columns="매체", values="value", aggfunc="sum").sort_index().fillna(0))
+                pvt = weekly_media_pivot(dbuzz, "주차시작일")
                 x_vals = pvt.index.tolist(); use_category = False
 
             total_buzz = pvt.sum(axis=1)
@@ -2142,6 +3573,10 @@ def render_ip_detail():
                 yaxis=dict(fixedrange=True, range=[0, max_buzz * 1.15])
             )
             if use_category: fig_buzz.update_xaxes(categoryorder="array", categoryarray=x_vals, fixedrange=True)
+            return fig_buzz
+
+        fig_buzz = cached_figure("ip_detail.digital_buzz", ip_selected, f, _build_buzz_fig) if not dbuzz.empty else None
+        if fig_buzz is not None:
             st.plotly_chart(fig_buzz, use_container_width=True, config=common_cfg)
         else:
             st.info("표시할 언급량 데이터가 없습니다.")
@@ -2153,66 +3588,72 @@ def render_ip_detail():
 
     with cE:
         st.markdown("<div class='sec-title'>🔥 화제성 점수 & 순위</div>", unsafe_allow_html=True)
-        fdx = _metric_filter(f, "F_Total").copy(); fs = _metric_filter(f, "F_score").copy()
-        if has_week_col and f["주차"].notna().any():
-            order = (f[["주차", "주차_num"]].dropna().drop_duplicates().sort_values("주차_num")["주차"].tolist())
-            key_col = "주차"; use_category = True
-        else:
-            key_col = "주차시작일"; order = sorted(f[key_col].dropna().unique()); use_category = False
+
+        def _build_f_score_fig():
+            fdx = _metric_filter(f, "F_Total").copy(); fs = _metric_filter(f, "F_score").copy()
+            if has_week_col and f["주차"].notna().any():
+                order = week_order(f)
+                key_col = "주차"; use_category = True
+            else:
+                key_col = "주차시작일"; order = sorted(f[key_col].dropna().unique()); use_category = False
             
-        if not fs.empty:
-            fs["val"] = pd.to_numeric(fs["value"], errors="coerce")
-            fs_agg = fs.dropna(subset=[key_col]).groupby(key_col, as_index=False)["val"].mean()
-        else:
-            fs_agg = pd.DataFrame(columns=[key_col, "val"])
+            if not fs.empty:
+                fs["val"] = fs["value"]
+                fs_agg = fs.dropna(subset=[key_col]).groupby(key_col, as_index=False)["val"].mean()
+            else:
+                fs_agg = pd.DataFrame(columns=[key_col, "val"])
             
-        if not fdx.empty:
-            fdx["rank"] = pd.to_numeric(fdx["value"], errors="coerce")
-            fdx_agg = fdx.dropna(subset=[key_col]).groupby(key_col, as_index=False)["rank"].min()
-        else:
-            fdx_agg = pd.DataFrame(columns=[key_col, "rank"])
+            if not fdx.empty:
+                fdx["rank"] = fdx["value"]
+                fdx_agg = fdx.dropna(subset=[key_col]).groupby(key_col, as_index=False)["rank"].min()
+            else:
+                fdx_agg = pd.DataFrame(columns=[key_col, "rank"])
             
-        if not fs_agg.empty:
+            if fs_agg.empty:
+                return None
             merged = pd.merge(fs_agg, fdx_agg, on=key_col, how="left")
             if use_category:
                 merged = merged.set_index(key_col).reindex(order).dropna(subset=["val"]).reset_index()
             else:
                 merged = merged.sort_values(key_col)
             
-            if not merged.empty:
-                x_vals = merged[key_col].tolist(); y_vals = merged["val"].tolist()
-                labels = [
-                    f"{int(r['rank'])}위<br>/{int(r['val']):,}점" if pd.notna(r['rank']) else f"{int(r['val']):,}점"
-                    for _, r in merged.iterrows()
-                ]
-                
-                fig_comb = go.Figure()
-                fig_comb.add_trace(go.Scatter(
-                    x=x_vals, y=y_vals, mode="lines+markers+text", name="화제성 점수",
-                    text=labels, textposition="top center", textfont=dict(size=11, color="#333"),
-                    line=dict(color='#ec407a', width=3), marker=dict(size=7, color='#ec407a')
-                ))
-                if y_vals:
-                    fig_comb.update_yaxes(range=[0, max(y_vals) * 1.25], title=None, fixedrange=True)
-                if use_category:
-                    fig_comb.update_xaxes(categoryorder="array", categoryarray=x_vals, fixedrange=True)
-                fig_comb.update_layout(legend_title=None, height=chart_h, margin=dict(l=8, r=8, t=20, b=8))
-                st.plotly_chart(fig_comb, use_container_width=True, config=common_cfg)
-            else:
-                st.info("데이터 없음")
+            if merged.empty:
+                return None
+            x_vals = merged[key_col].tolist(); y_vals = merged["val"].tolist()
+            labels = [
+                f"{int(r['rank'])}위<br>/{int(r['val']):,}점" if pd.notna(r['rank']) else f"{int(r['val']):,}점"
+                for _, r in merged.iterrows()
+            ]
+            
+            fig_comb = go.Figure()
+            fig_comb.add_trace(go.Scatter(
+                x=x_vals, y=y_vals, mode="lines+markers+text", name="화제성 점수",
+                text=labels, textposition="top center", textfont=dict(size=11, color="#333"),
+                line=dict(color='#ec407a', width=3), marker=dict(size=7, color='#ec407a')
+            ))
+            if y_vals:
+                fig_comb.update_yaxes(range=[0, max(y_vals) * 1.25], title=None, fixedrange=True)
+            if use_category:
+                fig_comb.update_xaxes(categoryorder="array", categoryarray=x_vals, fixedrange=True)
+            fig_comb.update_layout(legend_title=None, height=chart_h, margin=dict(l=8, r=8, t=20, b=8))
+            return fig_comb
+
+        fig_comb = cached_figure("ip_detail.f_score", ip_selected, f, _build_f_score_fig)
+        if fig_comb is not None:
+            st.plotly_chart(fig_comb, use_container_width=True, config=common_cfg)
         else:
             st.info("데이터 없음")
 
     with cF:
         st.markdown("<div class='sec-title'>🍿 넷플릭스 주간 순위 추이</div>", unsafe_allow_html=True)
         n_df = _metric_filter(f, "N_W순위").copy()
-        n_df["val"] = pd.to_numeric(n_df["value"], errors="coerce").replace(0, np.nan)
+        n_df["val"] = n_df["value"].replace(0, np.nan)
         n_df = n_df.dropna(subset=["val"])
 
-        if not n_df.empty:
+        def _build_netflix_fig():
             if has_week_col and f["주차"].notna().any():
                 n_agg = n_df.groupby("주차", as_index=False)["val"].min()
-                all_weeks = (f[["주차", "주차_num"]].dropna().drop_duplicates().sort_values("주차_num")["주차"].tolist())
+                all_weeks = week_order(f)
                 n_agg = n_agg.set_index("주차").reindex(all_weeks).dropna().reset_index()
                 x_vals = n_agg["주차"]; use_cat = True
             else:
@@ -2237,110 +3678,67 @@ def render_ip_detail():
             if use_cat:
                 fig_nf.update_xaxes(categoryorder="array", categoryarray=list(x_vals), fixedrange=True)
             fig_nf.update_layout(legend_title=None, height=chart_h, margin=dict(l=8, r=8, t=20, b=8))
+            return fig_nf
+
+        fig_nf = cached_figure("ip_detail.netflix", ip_selected, f, _build_netflix_fig) if not n_df.empty else None
+        if fig_nf is not None:
             st.plotly_chart(fig_nf, use_container_width=True, config=common_cfg)
         else:
-            st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
-
-    st.divider()
-
-    # === [Row5] 데모분석 상세 표 (AgGrid) ===
-    st.markdown("#### 👥 회차별 시청자수 분포")
-
-    def _build_demo_table_numeric(df_src, medias):
-        sub = df_src[
-            (df_src["metric"] == "시청인구")
-            & (df_src["데모"].notna())
-            & (df_src["매체"].isin(medias))
-        ].copy()
-
-        if sub.empty:
-            return pd.DataFrame(columns=["회차"] + DEMO_COLS_ORDER)
-
-        # 데모 → 성별 / 연령대
-        sub["성별"] = sub["데모"].apply(_gender_from_demo)
-        sub["연령대_대"] = sub["데모"].apply(_decade_label_clamped)
-        sub = sub[sub["성별"].isin(["남", "여"]) & sub["연령대_대"].notna()].copy()
-        if sub.empty:
-            return pd.DataFrame(columns=["회차"] + DEMO_COLS_ORDER)
-
-        # 회차 숫자화
-        if "회차_num" not in sub.columns:
-            sub["회차_num"] = sub["회차"].str.extract(r"(\d+)", expand=False).astype(float)
-        sub = sub.dropna(subset=["회차_num"])
-        if sub.empty:
-            return pd.DataFrame(columns=["회차"] + DEMO_COLS_ORDER)
-
-        sub["회차_num"] = sub["회차_num"].astype(int)
-
-        # 라벨: "20대남성", "30대여성"
-        sub["라벨"] = sub.apply(
-            lambda r: f"{r['연령대_대']}{'남성' if r['성별']=='남' else '여성'}",
-            axis=1,
-        )
-
-        # 피벗: 회차 × 데모 매트릭스
-        pvt = (
-            sub.pivot_table(
-                index="회차_num",
-                columns="라벨",
-                values="value",
-                aggfunc="sum",
-            )
-            .fillna(0)
-        )
-
-        # 없는 데모 컬럼 0으로 채워서 순서 통일
-        for c in DEMO_COLS_ORDER:
-            if c not in pvt.columns:
-                pvt[c] = 0
+            st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
 
-        pvt = pvt[DEMO_COLS_ORDER].sort_index()
-        pvt.insert(0, "회차", pvt.index.map(_fmt_ep))
+    st.divider()
 
-        return pvt.reset_index(drop=True)
+    # === [Row5] 데모분석 상세 표 (AgGrid) ===
+    st.markdown("#### 👥 회차별 시청자수 분포")
 
-    # === JS 렌더러 (▲/▾ + 행별 그라디언트) ===
+    def _build_demo_table_numeric(df_src, medias):
+        # 회차 × 데모 합계 매트릭스 (데모 텐서 엔진에서 슬라이스)
+        return demo_sum_by_episode(df_src, medias)
 
+    # === 서버 계산: 전 회차 대비 방향 + 행별 그라디언트 (숨김 컬럼으로 전송) ===
+    def _with_demo_diff_columns(df_numeric):
+        """
+        데모 컬럼마다 '<컬럼>__dir'(전 회차 대비 1/-1/0)과 '<컬럼>__bg'(행 내 min~max 기준 배경색)를 추가합니다.
+        """
+        cols = [c for c in DEMO_COLS_ORDER if c in df_numeric.columns]
+        vals = df_numeric[cols].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=float)
+        if vals.size == 0:
+            return df_numeric
+
+        direction = np.zeros_like(vals, dtype=np.int8)
+        direction[1:] = np.sign(vals[1:] - vals[:-1]).astype(np.int8)
+
+        mn = vals.min(axis=1, keepdims=True)
+        mx = vals.max(axis=1, keepdims=True)
+        span = mx - mn
+        norm = np.divide(vals - mn, span, out=np.full_like(vals, 0.5), where=span > 0)
+        alpha = 0.12 + 0.45 * np.clip(norm, 0, 1)
+        bg = np.char.mod("rgba(30,90,255,%.3f)", alpha)
+
+        out = df_numeric.copy()
+        extra = {}
+        for j, c in enumerate(cols):
+            extra[f"{c}__dir"] = direction[:, j]
+            extra[f"{c}__bg"] = bg[:, j]
+        return pd.concat([out, pd.DataFrame(extra, index=out.index)], axis=1)
+
+    # === JS 렌더러: 미리 계산된 값만 읽음 ===
     # DiffRenderer: 전 회차 대비 ▲/▾ 표시
     diff_renderer = JsCode("""
     class DiffRenderer {
       init(params) {
         this.eGui = document.createElement('span');
+        if (!params) { this.eGui.innerText = ''; return; }
 
-        if (!params) {
-          this.eGui.innerText = '';
-          return;
-        }
-
-        const api = params.api;
-        const colId = params.column ? params.column.getColId() : null;
-        const rowIndex = params.node ? params.node.rowIndex : 0;
-        const rawVal = (params.value === null || params.value === undefined) ? 0 : params.value;
-        const val = Number(rawVal) || 0;
-
-        // 1. 숫자 포맷팅
-        let displayVal = (colId === "회차")
-          ? (params.value || "")
-          : Math.round(val).toLocaleString();
+        const val = Number(params.value) || 0;
+        const dir = params.data ? params.data[params.colDef.field + '__dir'] : 0;
 
-        // 2. 화살표 로직
+        // 상승: 작은 삼각형(Red) / 하락: 작은 역삼각형(Blue) -> HTML Entity 사용
         let arrow = "";
-        if (colId !== "회차" && api && typeof api.getDisplayedRowAtIndex === "function" && rowIndex > 0) {
-          const prev = api.getDisplayedRowAtIndex(rowIndex - 1);
-          if (prev && prev.data && prev.data[colId] != null) {
-            const pv = Number(prev.data[colId] || 0);
-
-            if (val > pv) {
-              // 상승: 작은 삼각형(Red) -> HTML Entity 사용
-              arrow = '<span style="margin-left:4px;">(<span style="color:#d93636;">&#9652;</span>)</span>';
-            } else if (val < pv) {
-              // 하락: 작은 역삼각형(Blue) -> HTML Entity 사용
-              arrow = '<span style="margin-left:4px;">(<span style="color:#2a61cc;">&#9662;</span>)</span>';
-            }
-          }
-        }
+        if (dir > 0) arrow = '<span style="margin-left:4px;">(<span style="color:#d93636;">&#9652;</span>)</span>';
+        else if (dir < 0) arrow = '<span style="margin-left:4px;">(<span style="color:#2a61cc;">&#9662;</span>)</span>';
 
-        this.eGui.innerHTML = displayVal + arrow;
+        this.eGui.innerHTML = Math.round(val).toLocaleString() + arrow;
       }
 
       getGui() {
@@ -2349,59 +3747,17 @@ def render_ip_detail():
     }
     """)
 
-    # 행 내에서 min~max 기준으로 블루 그라디언트
-    _js_demo_cols = "[" + ",".join([f'"{c}"' for c in DEMO_COLS_ORDER]) + "]"
-    cell_style_renderer = JsCode(f"""
-    function(params){{
-      const field = params.colDef.field;
-      // 회차 열: 좌측 정렬, 흰 배경 고정
-      if (field === "회차") {{
-        return {{
-          'text-align': 'left',
-          'font-weight': '600',
-          'background-color': '#ffffff'
-        }};
-      }}
-
-      if (!params || !params.data) {{
-        return {{
-          'background-color': '#ffffff',
-          'text-align': 'right',
-          'padding': '2px 4px',
-          'font-weight': '500'
-        }};
-      }}
-
-      const COLS = {_js_demo_cols};
-      let rowVals = [];
-      for (let k of COLS) {{
-        if (params.data.hasOwnProperty(k)) {{
-          const v = Number(params.data[k]);
-          if (!isNaN(v)) rowVals.push(v);
-        }}
-      }}
-
-      let bg = '#ffffff';
-      if (rowVals.length > 0) {{
-        const v = Number(params.value || 0);
-        const mn = Math.min.apply(null, rowVals);
-        const mx = Math.max.apply(null, rowVals);
-        let norm = 0.5;
-        if (mx > mn) {{
-          norm = (v - mn) / (mx - mn);
-        }}
-        norm = Math.max(0, Math.min(1, norm));
-        const alpha = 0.12 + 0.45 * norm;
-        bg = 'rgba(30,90,255,' + alpha.toFixed(3) + ')';
-      }}
-
-      return {{
-        'background-color': bg,
+    # 행 내에서 min~max 기준 블루 그라디언트 (배경색은 서버에서 계산)
+    cell_style_renderer = JsCode("""
+    function(params){
+      const bg = (params && params.data) ? params.data[params.colDef.field + '__bg'] : null;
+      return {
+        'background-color': bg || '#ffffff',
         'text-align': 'right',
         'padding': '2px 4px',
         'font-weight': '500'
-      }};
-    }}
+      };
+    }
     """)
 
     def _render_aggrid_table(df_numeric, title):
@@ -2410,7 +3766,8 @@ def render_ip_detail():
             st.info("데이터 없음")
             return
 
-        gb = GridOptionsBuilder.from_dataframe(df_numeric)
+        df_grid = _with_demo_diff_columns(df_numeric)
+        gb = GridOptionsBuilder.from_dataframe(df_grid)
 
         gb.configure_grid_options(
             rowHeight=34,
@@ -2431,7 +3788,7 @@ def render_ip_detail():
             cellStyle={"textAlign": "left"},
         )
 
-        # 나머지 컬럼: JS 렌더러 적용
+        # 나머지 컬럼: JS 렌더러 적용 / 계산용 컬럼은 숨김
         for c in [col for col in df_numeric.columns if col != "회차"]:
             gb.configure_column(
                 c,
@@ -2439,6 +3796,8 @@ def render_ip_detail():
                 cellRenderer=diff_renderer,
                 cellStyle=cell_style_renderer,
             )
+        for c in [col for col in df_grid.columns if col not in df_numeric.columns]:
+            gb.configure_column(c, hide=True)
 
         rows = len(df_numeric)
         base_row_height = 34
@@ -2451,7 +3810,7 @@ def render_ip_detail():
             height = base_row_height * max_visible_rows + header_height + 24
 
         AgGrid(
-            df_numeric,
+            df_grid,
             gridOptions=gb.build(),
             theme="streamlit",
             height=height,
@@ -2489,10 +3848,12 @@ def _fmt_kor_large(v):
         return f"{int(val)}"
 
 # ===== 10.1. [페이지 4] KPI 백분위 계산 (캐싱) =====
+PAGE4_KPI_KEYS = ["T시청률", "H시청률", "TVING VOD", "TVING LIVE", "디지털 조회수", "디지털 언급량", "화제성 점수"]
+
 @st.cache_data(ttl=600)
-def get_kpi_data_for_all_ips(df_all: pd.DataFrame, max_ep: float = None) -> pd.DataFrame:
+def get_kpi_table_for_all_ips(df_all: pd.DataFrame, max_ep: float = None) -> pd.DataFrame:
     """
-    모든 IP에 대해 KPI 집계 후 백분위(0~100) 변환
+    모든 IP에 대해 KPI 원값(백분위 변환 전)을 집계합니다. (index=IP, columns=PAGE4_KPI_KEYS)
     max_ep가 있으면 해당 회차까지만 잘라서 집계
     """
     df = df_all.copy()
@@ -2507,7 +3868,6 @@ def get_kpi_data_for_all_ips(df_all: pd.DataFrame, max_ep: float = None) -> pd.D
         df = df[df["회차_numeric"] <= max_ep]
 
     # 2. 값 전처리
-    df["value"] = pd.to_numeric(df["value"], errors="coerce")
     df.loc[df["value"] == 0, "value"] = np.nan
     df = df.dropna(subset=["value"])
 
@@ -2552,23 +3912,101 @@ def get_kpi_data_for_all_ips(df_all: pd.DataFrame, max_ep: float = None) -> pd.D
 
     kpi_f_score = _ip_mean_of_ep_mean("F_Score").rename("화제성 점수")
 
-    # 4. 통합 및 백분위 산출
+    # 4. 통합
     kpi_df = pd.concat([kpi_t_rating, kpi_h_rating, kpi_vod, kpi_live, kpi_view, kpi_buzz, kpi_f_score], axis=1)
+    return kpi_df.reindex(columns=PAGE4_KPI_KEYS).astype(float)
+
+
+@st.cache_data(ttl=600)
+def get_kpi_data_for_all_ips(df_all: pd.DataFrame, max_ep: float = None) -> pd.DataFrame:
+    """
+    모든 IP에 대해 KPI 집계 후 백분위(0~100) 변환
+    max_ep가 있으면 해당 회차까지만 잘라서 집계
+    """
+    kpi_df = get_kpi_table_for_all_ips(df_all, max_ep=max_ep)
     kpi_percentiles = kpi_df.rank(pct=True) * 100
     return kpi_percentiles.fillna(0)
 
 
+# ===== 10.1-2. [페이지 4] 그룹 내 순위 엔진 =====
+def build_group_rank_index(kpi_table: pd.DataFrame, group_mask, exclude_ip: str | None = None) -> Dict[str, np.ndarray]:
+    """
+    IP별 KPI 테이블과 그룹 소속 마스크로 KPI별 '정렬된 그룹 값 배열'을 만듭니다.
+    exclude_ip(기준 IP)는 그룹에서 빼 두고, 순위 계산 시 기준값으로 끼워 넣습니다.
+    """
+    mask = np.asarray(group_mask, dtype=bool)
+    if exclude_ip is not None:
+        mask = mask & (kpi_table.index != exclude_ip)
+    vals = kpi_table.to_numpy(dtype=float)[mask]
+    index = {}
+    for j, key in enumerate(kpi_table.columns):
+        col = vals[:, j]
+        index[key] = np.sort(col[~np.isnan(col)])
+    return index
+
+
+def rank_in_group(rank_index: Dict[str, np.ndarray], target_vals: Dict[str, float | None],
+                  higher_good: Dict[str, bool] | None = None) -> Dict[str, tuple]:
+    """
+    정렬된 그룹 배열에 기준값을 searchsorted로 끼워 넣어 (순위, 모수)를 반환합니다.
+    순위는 rank(method='min')와 동일하며, 모수에는 기준 IP가 포함됩니다.
+    """
+    higher_good = higher_good or {}
+    ranks = {}
+    for key, arr in rank_index.items():
+        val = target_vals.get(key)
+        n = int(arr.size)
+        if val is None or pd.isna(val):
+            ranks[key] = (None, n) if n > 0 else (None, 0)
+            continue
+        if higher_good.get(key, True):
+            rnk = n - int(np.searchsorted(arr, val, side="right")) + 1
+        else:
+            rnk = int(np.searchsorted(arr, val, side="left")) + 1
+        ranks[key] = (rnk, n + 1)
+    return ranks
+
+
 # ===== 10.2. [페이지 4] 단일 IP/그룹 KPI 계산 =====
+def _ip_kpi_series_page4(df_ip: pd.DataFrame) -> Dict[str, pd.Series]:
+    """페이지 4 KPI의 IP별 값 (그룹 KPI = IP별 값의 평균)"""
+    return {
+        "T시청률": _ip_episode_agg_series(df_ip, "T시청률", episode_agg="mean"),
+        "H시청률": _ip_episode_agg_series(df_ip, "H시청률", episode_agg="mean"),
+        "TVING VOD": _ip_episode_agg_series(df_ip, "시청인구", ["TVING VOD", "TVING QUICK"], episode_agg="sum"),
+        "TVING LIVE": _ip_episode_agg_series(df_ip, "시청인구", ["TVING LIVE"], episode_agg="sum"),
+        "디지털 조회수": ip_sums_series(df_ip, "조회수"),
+        "디지털 언급량": ip_sums_series(df_ip, "언급량"),
+        "화제성 점수": _ip_episode_agg_series(df_ip, "F_Score", episode_agg="mean"),
+    }
+
+
 def get_agg_kpis_for_ip_page4(df_ip: pd.DataFrame) -> Dict[str, float | None]:
-    kpis = {}
-    kpis["T시청률"] = mean_of_ip_episode_mean(df_ip, "T시청률")
-    kpis["H시청률"] = mean_of_ip_episode_mean(df_ip, "H시청률")
-    kpis["TVING VOD"] = mean_of_ip_episode_sum(df_ip, "시청인구", ["TVING VOD", "TVING QUICK"])
-    kpis["TVING LIVE"] = mean_of_ip_episode_sum(df_ip, "시청인구", ["TVING LIVE"])
-    kpis["디지털 조회수"] = mean_of_ip_sums(df_ip, "조회수")
-    kpis["디지털 언급량"] = mean_of_ip_sums(df_ip, "언급량")
-    kpis["화제성 점수"] = mean_of_ip_episode_mean(df_ip, "F_Score")
-    return kpis
+    return {k: (float(s.mean()) if not s.empty else None) for k, s in _ip_kpi_series_page4(df_ip).items()}
+
+
+def _page4_group_mean_table(df_full: pd.DataFrame, max_ep: float = None) -> pd.DataFrame:
+    """그룹 평균용 IP별 KPI 표 (회차 범위 적용 후, 컬럼=PAGE4_KPI_KEYS)"""
+    df = df_full if max_ep is None else df_full[df_full["회차_numeric"] <= max_ep]
+    return pd.DataFrame(_ip_kpi_series_page4(df)).reindex(columns=PAGE4_KPI_KEYS).astype(float)
+
+
+def _page4_group_rank_table(df_full: pd.DataFrame, max_ep: float = None) -> pd.DataFrame:
+    """그룹 순위용 IP별 KPI 원값 표 (get_kpi_table_for_all_ips와 동일)"""
+    return get_kpi_table_for_all_ips(df_full, max_ep=max_ep)
+
+
+def page4_kpi_pool(df_all: pd.DataFrame, ip: str) -> pd.DataFrame:
+    """백분위(레이더 차트)/폴백 순위 모수: 방영작 + 기준 IP 행 (비교분석 페이지와 워밍업 공용)"""
+    aired_ips = get_aired_ips(df_all)
+    return df_all[df_all["IP"].isin(aired_ips) | (df_all["IP"] == ip)].copy()
+
+
+def page4_group_cells(df_all: pd.DataFrame, max_ep: float = None) -> tuple:
+    """그룹 평균/순위용 (편성, 편성연도) 셀 통계 → (mean_cells, rank_cells)"""
+    mean_cells = get_group_cells("page4_mean", df_all, _page4_group_mean_table, max_ep)
+    rank_cells = get_group_cells("page4_rank", df_all, _page4_group_rank_table, max_ep, ip_mode=True)
+    return mean_cells, rank_cells
 
 
 # ===== 10.3. [페이지 4] KPI 카드 렌더링 (상단) =====
@@ -2659,7 +4097,9 @@ def _render_kpi_row_ip_vs_ip(kpis1, kpis2, ip1, ip2):
 
 
 # ===== 10.4. [페이지 4] 통합 그래프 섹션 =====
-def _render_unified_charts(df_target, df_comp, target_name, comp_name, kpi_percentiles, comp_color="#aaaaaa"):
+def _render_unified_charts(df_target, df_comp, target_name, comp_name, kpi_percentiles, comp_color="#aaaaaa",
+                           input_key=None):
+    """input_key: df_target/df_comp를 만든 필터 상태 (차트 캐시 키, None이면 캐시 안 함)"""
     st.divider()
 
     # --- 2. 성과 포지셔닝 (Radar) & 시청률 비교 (Line) ---
@@ -2720,8 +4160,6 @@ def _render_unified_charts(df_target, df_comp, target_name, comp_name, kpi_perce
         if pd.isna(max_ep): max_ep = 999
         
         def _get_trend(df, metric):
-            if "회차_numeric" not in df.columns:
-                df["회차_numeric"] = df["회차"].str.extract(r"(\d+)", expand=False).astype(float)
             mask = (df["metric"] == metric)
             if pd.notna(max_ep):
                 mask = mask & (df["회차_numeric"] <= max_ep)
@@ -2756,15 +4194,7 @@ def _render_unified_charts(df_target, df_comp, target_name, comp_name, kpi_perce
     col_pop_tv, col_pop_tving = st.columns(2)
 
     def _get_demo_pop(df_src, medias):
-        sub = df_src[(df_src["metric"]=="시청인구") & (df_src["매체"].isin(medias)) & df_src["데모"].notna()].copy()
-        sub["성별"] = sub["데모"].apply(_gender_from_demo)
-        sub["연령"] = sub["데모"].apply(_to_decade_label)
-        sub = sub[sub["성별"].isin(["남","여"]) & (sub["연령"]!="기타")]
-        sub["label"] = sub.apply(lambda r: f"{r['연령']}{'남성' if r['성별']=='남' else '여성'}", axis=1)
-        if "회차_numeric" not in sub.columns:
-             sub["회차_numeric"] = sub["회차"].str.extract(r"(\d+)", expand=False).astype(float)
-        agg = sub.groupby(["IP","회차_numeric","label"])["value"].sum().reset_index()
-        return agg.groupby("label")["value"].mean()
+        return demo_mean_by_label(df_src, medias)
 
     with col_pop_tv:
         st.markdown("###### 📺 TV (평균 시청인구)")
@@ -2864,27 +4294,43 @@ def _render_unified_charts(df_target, df_comp, target_name, comp_name, kpi_perce
                           legend=dict(orientation="h", y=-0.15, x=0.5, xanchor="center"))
         return fig
 
+    def _build_donut_fig(df_t_src, df_c_src, metric, t_name, c_name):
+        pie_t = _get_pie_data(df_t_src, metric)
+        pie_c = _get_pie_data(df_c_src, metric)
+        if pie_t.empty and pie_c.empty:
+            return None
+        return _draw_scaled_donuts_fixed_color(pie_t, pie_c, metric, t_name, c_name)
+
     with col_dig_view:
         st.markdown("###### 👀 디지털 조회수 비교")
-        pie_t = _get_pie_data(df_target, "조회수")
-        pie_c = _get_pie_data(df_comp,   "조회수")
-        if pie_t.empty and pie_c.empty: st.info("데이터 없음")
+        build = lambda: _build_donut_fig(df_target, df_comp, "조회수", target_name, comp_name)
+        fig_pie = build() if input_key is None else cached_figure(
+            "comparison.donut", ("조회수", target_name, comp_name, input_key), df_target, build,
+        )
+        if fig_pie is None: st.info("데이터 없음")
         else:
-            fig_pie = _draw_scaled_donuts_fixed_color(pie_t, pie_c, "조회수", target_name, comp_name)
             st.plotly_chart(fig_pie, use_container_width=True)
 
     with col_dig_buzz:
         st.markdown("###### 💬 디지털 언급량 비교")
-        pie_t = _get_pie_data(df_target, "언급량")
-        pie_c = _get_pie_data(df_comp,   "언급량")
-        if pie_t.empty and pie_c.empty: st.info("데이터 없음")
+        build = lambda: _build_donut_fig(df_target, df_comp, "언급량", target_name, comp_name)
+        fig_pie = build() if input_key is None else cached_figure(
+            "comparison.donut", ("언급량", target_name, comp_name, input_key), df_target, build,
+        )
+        if fig_pie is None: st.info("데이터 없음")
         else:
-            fig_pie = _draw_scaled_donuts_fixed_color(pie_t, pie_c, "언급량", target_name, comp_name)
             st.plotly_chart(fig_pie, use_container_width=True)
 
     st.divider()
 
     # --- 5. [통합] 오디언스 히트맵 ---
+    _render_audience_heatmap(df_target, df_comp, target_name, comp_name)
+
+
+# ===== 10.4-1. [페이지 4] 오디언스 히트맵 (프래그먼트) =====
+@_fragment
+def _render_audience_heatmap(df_target, df_comp, target_name, comp_name):
+    """TV/TVING 토글 시 히트맵 영역만 다시 실행"""
     st.markdown("#### 5. 👥 IP 오디언스 히트맵")
     st.caption(f"선택하신 **'{target_name}'**과 **'{comp_name}'**의 회차별/데모별 시청자수 격차를 보여줍니다.")
     
@@ -2892,11 +4338,6 @@ def _render_unified_charts(df_target, df_comp, target_name, comp_name, kpi_perce
     media_list = ["TV"] if heatmap_media == "TV" else ["TVING LIVE", "TVING QUICK", "TVING VOD"]
     media_label = "TV" if heatmap_media == "TV" else "TVING"
 
-    if "회차_numeric" not in df_target.columns: 
-         df_target["회차_numeric"] = df_target["회차"].str.extract(r"(\d+)", expand=False).astype(float)
-    if "회차_numeric" not in df_comp.columns:
-         df_comp["회차_numeric"] = df_comp["회차"].str.extract(r"(\d+)", expand=False).astype(float)
-
     df_base_heat = get_avg_demo_pop_by_episode(df_target, media_list, max_ep=None) 
     df_comp_heat = get_avg_demo_pop_by_episode(df_comp, media_list, max_ep=None)
 
@@ -2908,22 +4349,17 @@ def _render_unified_charts(df_target, df_comp, target_name, comp_name, kpi_perce
              df_comp_heat = pd.DataFrame({'회차': df_base_heat['회차']})
              for col in DEMO_COLS_ORDER: df_comp_heat[col] = 0.0
 
-        df_merged = pd.merge(df_base_heat, df_comp_heat, on="회차", suffixes=('_base', '_comp'), how='left')
-        df_index = df_merged[["회차"]].copy()
-
-        for col in DEMO_COLS_ORDER: 
-            base_col = col + '_base'
-            comp_col = col + '_comp'
-            df_merged[base_col] = pd.to_numeric(df_merged.get(base_col), errors='coerce').fillna(0.0)
-            df_merged[comp_col] = pd.to_numeric(df_merged.get(comp_col), errors='coerce').fillna(0.0)
-            base_values = df_merged[base_col].values
-            comp_values = df_merged[comp_col].values
-            index_values = np.where(
-                comp_values != 0,
-                ((base_values - comp_values) / comp_values) * 100,
-                np.where(base_values == 0, 0.0, 999)
-            )
-            df_index[col] = index_values
+        # 기준 회차 순서에 비교 행렬을 맞춘 뒤 한 번에 증감률 계산
+        comp_aligned = (
+            df_comp_heat.drop_duplicates("회차").set_index("회차")
+            .reindex(df_base_heat["회차"])
+            .reindex(columns=DEMO_COLS_ORDER)
+        )
+        base_mat = df_base_heat.reindex(columns=DEMO_COLS_ORDER).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        comp_mat = comp_aligned.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+        df_index = pd.DataFrame(demo_index_matrix(base_mat, comp_mat), columns=DEMO_COLS_ORDER)
+        df_index.insert(0, "회차", df_base_heat["회차"].to_numpy())
 
         table_title = f"{media_label} 연령대별 시청자수 차이 ({target_name} vs {comp_name})"
         render_heatmap(df_index, table_title)
@@ -2934,27 +4370,30 @@ def _render_unified_charts(df_target, df_comp, target_name, comp_name, kpi_perce
 #region [ 6-3. 성과 비교분석 ]
 def render_comparison():
     df_all = load_data() 
-    if "회차_numeric" not in df_all.columns:
-        df_all["회차_numeric"] = df_all["회차"].str.extract(r"(\d+)", expand=False).astype(float)
 
-    kpi_percentiles = get_kpi_data_for_all_ips(df_all, max_ep=None)
-    ip_options = sorted(df_all["IP"].dropna().unique().tolist())
-    
     # 전역 IP 가져오기 (기준 IP)
     global_ip = st.session_state.get("global_ip")
     if not global_ip: st.error("IP 선택 필요"); return
-    
-    selected_ip1 = global_ip
+
+    _render_comparison_body(df_all, global_ip)
+
+
+@_fragment
+def _render_comparison_body(df_all, selected_ip1):
+    """비교 모드/회차 범위/그룹 필터 조작 시 비교 영역만 다시 실행 (사이드바·데이터 로드 생략)"""
+    kpi_percentiles = get_kpi_data_for_all_ips(df_all, max_ep=None)
+    ip_options = sorted(df_all["IP"].dropna().unique().tolist())
+
     selected_ip2 = None
 
     current_mode = st.session_state.get("comp_mode_page4", "IP vs 그룹 평균")
     
     if current_mode == "IP vs IP":
-        # 타이틀(4) | 모드선택(3) | 비교IP(3) | 회차(2)
-        filter_cols = st.columns([4, 3, 3, 2])
+        # 타이틀(4) | 모드선택(3) | 비교IP(3) | 시작 회차(1) | 회차(1)
+        filter_cols = st.columns([4, 3, 3, 1, 1])
     else:
-        # 타이틀(4) | 모드선택(3) | 편성(2) | 연도(2) | 회차(1)
-        filter_cols = st.columns([4, 3, 2, 2, 1])
+        # 타이틀(4) | 모드선택(3) | 편성(2) | 연도(2) | 시작 회차(1) | 회차(1)
+        filter_cols = st.columns([4, 3, 2, 2, 1, 1])
     
     with filter_cols[0]:
         st.markdown(f"<div class='page-title'>⚖️ {selected_ip1} <span style='font-size:18px;color:#666'>vs ...</span></div>", unsafe_allow_html=True)
@@ -2982,6 +4421,7 @@ def render_comparison():
         ) 
     
     selected_max_ep = "전체"
+    selected_min_ep = None
 
     # --- IP vs IP 모드 ---
     if comparison_mode == "IP vs IP":
@@ -2997,6 +4437,8 @@ def render_comparison():
         ep_opts = ["전체"] + get_episode_options(target_rows)
         
         with filter_cols[3]:
+            selected_min_ep = st.selectbox("시작 회차", ep_opts[1:] or ["1"], index=0, label_visibility="collapsed")
+        with filter_cols[4]:
             selected_max_ep = st.selectbox("회차 범위", ep_opts, index=0, label_visibility="collapsed")
         
         use_same_prog = False; selected_years = []
@@ -3039,6 +4481,8 @@ def render_comparison():
         ep_opts = ["전체"] + get_episode_options(target_rows)
 
         with filter_cols[4]:
+            selected_min_ep = st.selectbox("시작 회차", ep_opts[1:] or ["1"], index=0, label_visibility="collapsed")
+        with filter_cols[5]:
             selected_max_ep = st.selectbox("회차 범위", ep_opts, index=0, label_visibility="collapsed")
 
     st.divider()
@@ -3051,20 +4495,45 @@ def render_comparison():
     # [추가] 전체 데이터 풀에서 본방이 시작된(T시청률 0초과) IP 목록 추출
     aired_ips = get_aired_ips(df_all)
 
-    ep_limit = None
-    if selected_max_ep != "전체":
-        try: ep_limit = float(re.findall(r'\d+', str(selected_max_ep))[0])
-        except: ep_limit = None
-            
-    # [수정] 백분위(레이더 차트) 산출 시에도 방영작들만 모수로 사용
-    df_for_kpi = df_all[df_all["IP"].isin(aired_ips) | (df_all["IP"] == selected_ip1)].copy()
-    kpi_percentiles = get_kpi_data_for_all_ips(df_for_kpi, max_ep=ep_limit)
+    def _ep_num(opt):
+        try: return float(re.findall(r'\d+', str(opt))[0])
+        except: return None
+
+    ep_limit = _ep_num(selected_max_ep) if selected_max_ep != "전체" else None
+
+    # [회차 구간] 시작 회차가 첫 회차가 아니면 [시작, 끝] 구간 분석 (IP별 회차 누적합 배열 사용)
+    ep_window = None
+    ep_first = _ep_num(ep_opts[1]) if len(ep_opts) > 1 else None
+    ep_start = _ep_num(selected_min_ep)
+    if ep_start is not None and ep_first is not None and ep_start > ep_first:
+        ep_end = ep_limit if ep_limit is not None else _ep_num(ep_opts[-1])
+        if ep_end < ep_start:
+            st.warning("시작 회차가 끝 회차보다 뒤에 있어 두 값을 바꿔 적용합니다.", icon="⚠️")
+            ep_start, ep_end = ep_end, ep_start
+        ep_window = (ep_start, ep_end)
+
+    def _in_episode_range(frame: pd.DataFrame) -> pd.DataFrame:
+        if ep_window is not None:
+            return frame[frame["회차_numeric"].between(*ep_window)]
+        if ep_limit is not None:
+            return frame[frame["회차_numeric"] <= ep_limit]
+        return frame
 
-    df_target = df_all[df_all["IP"] == selected_ip1].copy()
-    if ep_limit is not None:
-        df_target = df_target[df_target["회차_numeric"] <= ep_limit]
-    
-    kpis_target = get_agg_kpis_for_ip_page4(df_target)
+    if ep_window is not None:
+        window_table = episode_window_table(df_all, *ep_window, keys=PAGE4_KPI_KEYS)
+        pool = window_table[window_table.index.isin(aired_ips) | (window_table.index == selected_ip1)].dropna(how="all")
+        kpi_percentiles = (pool.rank(pct=True) * 100).fillna(0)
+    else:
+        # [수정] 백분위(레이더 차트) 산출 시에도 방영작들만 모수로 사용
+        df_for_kpi = page4_kpi_pool(df_all, selected_ip1)
+        kpi_percentiles = get_kpi_data_for_all_ips(df_for_kpi, max_ep=ep_limit)
+
+    df_target = _in_episode_range(df_all[df_all["IP"] == selected_ip1].copy())
+
+    if ep_window is not None:
+        kpis_target = {k: (float(v) if pd.notna(v) else None) for k, v in window_table.reindex([selected_ip1]).iloc[0].items()}
+    else:
+        kpis_target = get_agg_kpis_for_ip_page4(df_target)
 
     if comparison_mode == "IP vs 그룹 평균":
         group_name_parts = []
@@ -3083,11 +4552,13 @@ def render_comparison():
         elif comp_type == "동일 편성":
             comp_prog_filter = [ip_prog] if ip_prog else None
 
+        group_progs = None
         if comp_prog_filter is not None:
             if (comp_type == "동일 편성") and (not ip_prog):
                 st.warning("편성 정보 없음 (제외)")
             else:
                 df_comp = df_comp[df_comp["편성"].isin(comp_prog_filter)]
+                group_progs = comp_prog_filter
 
                 if comp_type == "평일":
                     group_name_parts.append("'평일(월화+수목)'")
@@ -3106,74 +4577,73 @@ def render_comparison():
                 except: group_name_parts.append("선택연도")
         
         if not group_name_parts: group_name_parts.append("전체")
+        if ep_window is not None: group_name_parts.append(episode_window_label(*ep_window))
         comp_name = " & ".join(group_name_parts) + " 평균"
 
-        if ep_limit is not None:
-             df_comp = df_comp[df_comp["회차_numeric"] <= ep_limit]
+        df_comp = _in_episode_range(df_comp)
 
-        kpis_comp = get_agg_kpis_for_ip_page4(df_comp)
-        
-        ranks = {}
-        def _calc_rank_in_group(df_g, target_val, metric_key, higher_good=True):
-            if df_g.empty: return (None, 0)
-            if metric_key in ["T시청률", "H시청률", "화제성 점수"]:
-                agg = df_g[df_g["metric"] == (metric_key if metric_key != "화제성 점수" else "F_Score")]
-                if agg.empty: return (None, 0)
-                ep_agg = agg.groupby(["IP", "회차_numeric"])["value"].mean().reset_index()
-                ip_series = ep_agg.groupby("IP")["value"].mean()
-            elif metric_key in ["TVING VOD", "TVING LIVE"]:
-                media_target = ["TVING LIVE"] if metric_key == "TVING LIVE" else ["TVING VOD", "TVING QUICK"]
-                agg = df_g[(df_g["metric"] == "시청인구") & (df_g["매체"].isin(media_target))]
-                if agg.empty: return (None, 0)
-                ep_agg = agg.groupby(["IP", "회차_numeric"])["value"].sum().reset_index()
-                ip_series = ep_agg.groupby("IP")["value"].mean()
-            elif metric_key in ["디지털 조회수", "디지털 언급량"]:
-                if metric_key == "디지털 조회수": agg = _get_view_data(df_g)
-                else: agg = df_g[df_g["metric"] == "언급량"]
-                if agg.empty: return (None, 0)
-                ip_series = agg.groupby("IP")["value"].sum()
-            else: return (None, 0)
-
-            if target_val is not None: ip_series[selected_ip1] = target_val
-            if ip_series.empty: return (None, 0)
-            ranked = ip_series.rank(method='min', ascending=not higher_good)
-            try: return (int(ranked[selected_ip1]), len(ip_series))
-            except: return (None, len(ip_series))
-
-        keys_map = {
-            "T시청률": "T시청률", "H시청률": "H시청률", 
-            "TVING LIVE": "TVING LIVE", "TVING VOD": "TVING VOD",
-            "디지털 조회수": "디지털 조회수", "디지털 언급량": "디지털 언급량",
-            "화제성 점수": "화제성 점수"
-        }
-        for k in keys_map:
-            val = kpis_target.get(k)
-            ranks[k] = _calc_rank_in_group(df_comp, val, k)
+        # [그룹 평균/순위] (편성, 편성연도) 셀 통계를 합쳐서 계산 → 셀 합산이 불가하면 원본 행으로 계산
+        if ep_window is not None:
+            # 구간 모드: 평균/순위 모두 구간 표(회차 없는 행 제외라 두 정의가 같음)를 셀로 묶어 사용
+            # (평균만 split IP를 편성/연도 행 기준으로 보정, 순위는 IP 전체 값)
+            group_tags = get_group_tags(df_all)
+            window_rows = df_all[df_all["회차_numeric"].between(*ep_window)]
+            mean_cells = _build_group_cells(window_table, group_tags, _page4_group_mean_table, window_rows)
+            rank_cells = _build_group_cells(window_table, group_tags, None, window_rows)
+        else:
+            mean_cells, rank_cells = page4_group_cells(df_all, ep_limit)
+        merged = merge_group_cells(mean_cells, group_progs, selected_years)
+        merged_rank = merge_group_cells(rank_cells, group_progs, selected_years, exclude_ip=selected_ip1)
+
+        if merged is not None and merged_rank is not None:
+            kpis_comp = {k: (float(v) if not np.isnan(v) else None) for k, v in zip(mean_cells["columns"], merged["mean"])}
+            rank_index = dict(zip(rank_cells["columns"], merged_rank["sorted"]))
+        else:
+            kpis_comp = get_agg_kpis_for_ip_page4(df_comp)
+            kpi_table = window_table if ep_window is not None else get_kpi_table_for_all_ips(df_for_kpi, max_ep=ep_limit)
+            group_mask = kpi_table.index.isin(df_comp["IP"].unique())
+            rank_index = build_group_rank_index(kpi_table, group_mask, exclude_ip=selected_ip1)
+        ranks = rank_in_group(rank_index, kpis_target)
 
         _render_kpi_row_ip_vs_group(kpis_target, kpis_comp, ranks, comp_name)
-        _render_unified_charts(df_target, df_comp, selected_ip1, comp_name, kpi_percentiles, comp_color="#aaaaaa")
+        input_key = (comparison_mode, selected_ip1, tuple(group_progs or ()),
+                     tuple(sorted(map(str, selected_years or ()))), ep_limit, ep_window)
+        _render_unified_charts(df_target, df_comp, selected_ip1, comp_name, kpi_percentiles, comp_color="#aaaaaa",
+                               input_key=input_key)
 
     else: # IP vs IP
         if not selected_ip2: st.warning("비교할 IP를 선택해주세요."); return
-        df_comp = df_all[df_all["IP"] == selected_ip2].copy()
-        if ep_limit is not None: df_comp = df_comp[df_comp["회차_numeric"] <= ep_limit]
-        kpis_comp = get_agg_kpis_for_ip_page4(df_comp)
+        df_comp = _in_episode_range(df_all[df_all["IP"] == selected_ip2].copy())
+        if ep_window is not None:
+            kpis_comp = {k: (float(v) if pd.notna(v) else None) for k, v in window_table.reindex([selected_ip2]).iloc[0].items()}
+        else:
+            kpis_comp = get_agg_kpis_for_ip_page4(df_comp)
         comp_name = selected_ip2
         _render_kpi_row_ip_vs_ip(kpis_target, kpis_comp, selected_ip1, selected_ip2)
-        _render_unified_charts(df_target, df_comp, selected_ip1, comp_name, kpi_percentiles, comp_color="#aaaaaa")
+        input_key = (comparison_mode, selected_ip1, selected_ip2, ep_limit, ep_window)
+        _render_unified_charts(df_target, df_comp, selected_ip1, comp_name, kpi_percentiles, comp_color="#aaaaaa",
+                               input_key=input_key)
 
 
 # =====================================================
 
 # ---------- [공통] 설정 상수 ----------
 EP_CHOICES = [2, 4, 6, 8, 10, 12, 14, 16]
+GROWTH_DEFAULT_EP_CUTOFF = EP_CHOICES[1]   # 성장스코어 '회차 기준' 기본값
 ROW_LABELS = ["S","A","B","C","D"]
 COL_LABELS = ["+2","+1","0","-1","-2"]
 ABS_SCORE  = {"S":5,"A":4,"B":3,"C":2,"D":1}
 SLO_SCORE  = {"+2":5,"+1":4,"0":3,"-1":2,"-2":1}
 SLOPE_LABELS = ["+2", "+1", "0", "-1", "-2"]
 ABS_NUM = {"S":5, "A":4, "B":3, "C":2, "D":1}
-NETFLIX_VOD_FACTOR = 1.4
+
+
+def growth_episode_cutoffs(df_all: pd.DataFrame, ip: str) -> List[int]:
+    """선택 IP가 방영한 회차까지의 EP_CHOICES (등급 추이 표시용, 회차 없으면 최소 회차)"""
+    max_ep = df_all.loc[df_all["IP"] == ip, "회차_numeric"].max()
+    if pd.isna(max_ep) or max_ep == 0:
+        return [min(EP_CHOICES)]
+    return [n for n in EP_CHOICES if n <= max_ep]
 
 # 방영지표용 정의
 METRICS_DEF_BROADCAST = [
@@ -3189,6 +4659,37 @@ METRICS_DEF_DIGITAL = [
     ("화제성", "F_Score", "mean", True),
 ]
 
+# ---------- [공통] 포지셔닝 맵 ----------
+def _build_positioning_map_fig(base: pd.DataFrame):
+    """종합 절대/상승 등급 5x5 포지셔닝 맵 (셀마다 해당 IP 목록 주석)"""
+    pos_map = {(r, c): [] for r in ROW_LABELS for c in COL_LABELS}
+    for _, r in base.iterrows():
+        ra = str(r["종합_절대등급"]) if pd.notna(r["종합_절대등급"]) else None
+        rs = str(r["종합_상승등급"]) if pd.notna(r["종합_상승등급"]) else None
+        if ra in ROW_LABELS and rs in COL_LABELS: pos_map[(ra, rs)].append(r["IP"])
+
+    z = [[(ABS_SCORE[rr] + SLO_SCORE[cc]) / 2.0 for cc in COL_LABELS] for rr in ROW_LABELS]
+    fig = px.imshow(z, x=COL_LABELS, y=ROW_LABELS, origin="upper", color_continuous_scale="Blues", range_color=[1, 5], text_auto=False, aspect="auto").update_traces(xgap=0.0, ygap=0.0)
+    fig.update_xaxes(showticklabels=False, title=None, ticks="")
+    fig.update_yaxes(showticklabels=False, title=None, ticks="")
+    fig.update_layout(height=760, margin=dict(l=2, r=2, t=2, b=2), coloraxis_showscale=False)
+    fig.update_traces(hovertemplate="<extra></extra>")
+
+    for r_idx, rr in enumerate(ROW_LABELS):
+        for c_idx, cc in enumerate(COL_LABELS):
+            cell_val = z[r_idx][c_idx]
+            names = pos_map[(rr, cc)]
+            color = "#FFFFFF" if cell_val >= 3.3 else "#111111"
+            fig.add_annotation(x=cc, y=rr, xref="x", yref="y", text=f"<b style='letter-spacing:0.5px'>{rr}{cc}</b>", showarrow=False, font=dict(size=22, color=color, family="sans-serif"), xanchor="center", yanchor="top", yshift=80)
+            if names: fig.add_annotation(x=cc, y=rr, xref="x", yref="y", text=f"<span style='line-height:1.04'>{'<br>'.join(names)}</span>", showarrow=False, font=dict(size=12, color=color, family="sans-serif"), xanchor="center", yanchor="middle", yshift=6)
+    return fig
+
+
+def _positioning_map_key(base: pd.DataFrame) -> tuple:
+    """포지셔닝 맵을 결정하는 (IP, 절대등급, 상승등급) 배치 자체를 캐시 키로 사용"""
+    return tuple(map(tuple, base[["IP", "종합_절대등급", "종합_상승등급"]].astype(str).to_numpy()))
+
+
 # ---------- [방영지표] 캐싱된 계산 함수 ----------
 @st.cache_data(show_spinner=False)
 def _calc_growth_grades_cached(df_filtered: pd.DataFrame, target_ips: List[str], cutoffs: List[int], ep_cutoff_target: int):
@@ -3196,23 +4697,21 @@ def _calc_growth_grades_cached(df_filtered: pd.DataFrame, target_ips: List[str],
     ip_metric_cache = {}
     
     def _get_full_series(sub_df, metric, media):
-        sub = sub_df[sub_df["metric"] == metric].copy()
+        sub = sub_df[sub_df["metric"] == metric]
+        val_col = "value"
         if media == "LIVE":
             sub = sub[sub["매체"] == "TVING LIVE"]
         elif media == "VOD":
+            # 넷플릭스 편성작 보정값은 로드 시 계산된 컬럼 사용
             sub = sub[sub["매체"] == "TVING VOD"]
-            if "넷플릭스편성작" in sub.columns:
-                is_netflix = (sub["넷플릭스편성작"] == 1)
-                if is_netflix.any():
-                    sub.loc[is_netflix, "value"] *= NETFLIX_VOD_FACTOR
-        sub = sub.dropna(subset=["value", "회차_numeric"])
+            val_col = vod_value_col(adjusted=VOD_ADJ_COL in sub.columns)
+        sub = sub.dropna(subset=[val_col, "회차_numeric"])
         if sub.empty: return None
         if metric in ["H시청률", "T시청률"]:
-            s = sub.groupby("회차_numeric")["value"].mean().reset_index()
+            s = sub.groupby("회차_numeric")[val_col].mean()
         else:
-            s = sub.groupby("회차_numeric")["value"].sum().reset_index()
-        s = s.sort_values("회차_numeric")
-        return s["회차_numeric"].values.astype(float), s["value"].values.astype(float)
+            s = sub.groupby("회차_numeric")[val_col].sum()
+        return s.index.to_numpy(dtype=float), s.to_numpy(dtype=float)
 
     for ip in target_ips:
         ip_metric_cache[ip] = {}
@@ -3314,10 +4813,12 @@ def render_growth_score():
     if not selected_ip or selected_ip not in all_ip_list:
         st.error("IP 선택 필요"); return
 
-    # 데이터 전처리 (회차 숫자형)
-    if "회차_numeric" not in df_all.columns:
-        df_all["회차_numeric"] = df_all["회차"].astype(str).str.extract(r"(\d+)", expand=False).astype(float)
+    _render_growth_body(df_all, all_ip_list, selected_ip)
 
+
+@_fragment
+def _render_growth_body(df_all, all_ip_list, selected_ip):
+    """뷰 토글/비교 그룹/회차 기준 조작 시 성장스코어 영역만 다시 실행"""
     # --- 헤더 & 토글 레이아웃 ---
     # 현재 뷰 모드 가져오기 (Radio가 렌더링되기 전에 기본값 설정 필요시 사용, 여기선 Radio가 State를 제어)
     current_view = st.session_state.get("growth_view_mode", "방영지표")
@@ -3329,7 +4830,7 @@ def render_growth_score():
         head = st.columns([5, 3, 3])    # Title, Toggle, EpCutoff
 
     # [Col 1] 타이틀
-    _ep_display = st.session_state.get("growth_ep_cutoff", 4)
+    _ep_display = st.session_state.get("growth_ep_cutoff", GROWTH_DEFAULT_EP_CUTOFF)
     with head[0]:
         st.markdown(
             f"<div class='page-title'>🚀 {selected_ip} 성장스코어 <span style='font-size:20px;color:#6b7b93'>(~{_ep_display}회)</span></div>",
@@ -3353,8 +4854,8 @@ def render_growth_score():
             - **상승률 등급**: 항목별 회차별 증감정도 순위 → `+2 / +1 / 0 / -1 / -2`
             - **종합등급**: 절대값 + 상승률 (예: `A+2`).
             **보정기준**
-            - 넷플릭스 편성작품은 TVING VOD 수치를 약 40% 보정
-            """)
+            - 넷플릭스 편성작품은 TVING VOD 수치를 약 {:.0f}% 보정
+            """.format((NETFLIX_VOD_FACTOR - 1) * 100))
         else:
             st.markdown("""
             **등급 체계**
@@ -3371,7 +4872,7 @@ def render_growth_score():
         with head[2]:
             comp_group_mode = st.selectbox("비교 그룹", ["전체 비교", "동일 편성만"], index=0, key="growth_comp_mode", label_visibility="collapsed")
         with head[3]:
-            ep_cutoff = st.selectbox("회차 기준", EP_CHOICES, index=1, key="growth_ep_cutoff", label_visibility="collapsed")
+            ep_cutoff = st.selectbox("회차 기준", EP_CHOICES, index=EP_CHOICES.index(GROWTH_DEFAULT_EP_CUTOFF), key="growth_ep_cutoff", label_visibility="collapsed")
 
         # IP 필터링
         ips = all_ip_list[:]
@@ -3392,12 +4893,7 @@ def render_growth_score():
             st.markdown(f"#### {selected_ip} <span style='font-size:16px;color:#6b7b93'>자세히보기 (전체 비교 / 총 {len(ips)}작품)</span>", unsafe_allow_html=True)
 
         # 데이터 준비 및 계산 (Loop 최적화)
-        sel_ip_row = df_all[df_all["IP"] == selected_ip]
-        _max_ep_val = pd.to_numeric(sel_ip_row["회차_numeric"], errors="coerce").max() if not sel_ip_row.empty else 0
-        
-        if pd.isna(_max_ep_val) or _max_ep_val == 0: _Ns = [min(EP_CHOICES)]
-        else: _Ns = [n for n in EP_CHOICES if n <= _max_ep_val]
-        
+        _Ns = growth_episode_cutoffs(df_all, selected_ip)
         needed_cutoffs = sorted(list(set(_Ns) | {ep_cutoff}))
         df_filtered = df_all[df_all["IP"].isin(ips)].copy()
 
@@ -3448,26 +4944,8 @@ def render_growth_score():
 
         # [UI] 포지셔닝 맵 & 전체 표
         # (기존 로직 동일 - 간략화 위해 일부 공통 함수 사용 가능하나 원본 유지)
-        pos_map = {(r, c): [] for r in ROW_LABELS for c in COL_LABELS}
-        for _, r in base.iterrows():
-            ra = str(r["종합_절대등급"]) if pd.notna(r["종합_절대등급"]) else None
-            rs = str(r["종합_상승등급"]) if pd.notna(r["종합_상승등급"]) else None
-            if ra in ROW_LABELS and rs in COL_LABELS: pos_map[(ra, rs)].append(r["IP"])
-
-        z = [[(ABS_SCORE[rr] + SLO_SCORE[cc]) / 2.0 for cc in COL_LABELS] for rr in ROW_LABELS]
-        fig = px.imshow(z, x=COL_LABELS, y=ROW_LABELS, origin="upper", color_continuous_scale="Blues", range_color=[1, 5], text_auto=False, aspect="auto").update_traces(xgap=0.0, ygap=0.0)
-        fig.update_xaxes(showticklabels=False, title=None, ticks="")
-        fig.update_yaxes(showticklabels=False, title=None, ticks="")
-        fig.update_layout(height=760, margin=dict(l=2, r=2, t=2, b=2), coloraxis_showscale=False)
-        fig.update_traces(hovertemplate="<extra></extra>")
-
-        for r_idx, rr in enumerate(ROW_LABELS):
-            for c_idx, cc in enumerate(COL_LABELS):
-                cell_val = z[r_idx][c_idx]
-                names = pos_map[(rr, cc)]
-                color = "#FFFFFF" if cell_val >= 3.3 else "#111111"
-                fig.add_annotation(x=cc, y=rr, xref="x", yref="y", text=f"<b style='letter-spacing:0.5px'>{rr}{cc}</b>", showarrow=False, font=dict(size=22, color=color, family="sans-serif"), xanchor="center", yanchor="top", yshift=80)
-                if names: fig.add_annotation(x=cc, y=rr, xref="x", yref="y", text=f"<span style='line-height:1.04'>{'<br>'.join(names)}</span>", showarrow=False, font=dict(size=12, color=color, family="sans-serif"), xanchor="center", yanchor="middle", yshift=6)
+        fig = cached_figure("growth.positioning_map", _positioning_map_key(base), df_all,
+                            lambda: _build_positioning_map_fig(base))
         
         st.markdown("#### 🗺️ 포지셔닝맵")
         st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
@@ -3491,7 +4969,7 @@ def render_growth_score():
     else:
         # [Col 3] 필터
         with head[2]:
-            ep_cutoff = st.selectbox("회차 기준", EP_CHOICES, index=1, key="growth_d_ep_cutoff", label_visibility="collapsed")
+            ep_cutoff = st.selectbox("회차 기준", EP_CHOICES, index=EP_CHOICES.index(GROWTH_DEFAULT_EP_CUTOFF), key="growth_d_ep_cutoff", label_visibility="collapsed")
             
         st.markdown(f"#### {selected_ip} <span style='font-size:16px;color:#6b7b93'>자세히보기</span>", unsafe_allow_html=True)
         
@@ -3501,7 +4979,7 @@ def render_growth_score():
         def _get_full_series_digital(ip_df, metric_name, mtype):
             if metric_name == "조회수": sub = _get_view_data(ip_df)
             else: sub = ip_df[ip_df["metric"] == metric_name].copy()
-            sub["value"] = pd.to_numeric(sub["value"], errors="coerce").replace(0, np.nan)
+            sub["value"] = sub["value"].replace(0, np.nan)
             sub = sub.dropna(subset=["value", "회차_numeric"])
             if sub.empty: return None
             if mtype == "sum": s = sub.groupby("회차_numeric", as_index=False)["value"].sum()
@@ -3542,11 +5020,7 @@ def render_growth_score():
                 ip_metric_cache[ip][disp] = _get_full_series_digital(curr_df, metric_name, mtype)
 
         # 2. 루프 계산
-        sel_ip_df = df_all[df_all["IP"] == selected_ip]
-        _max_ep_val = pd.to_numeric(sel_ip_df["회차_numeric"], errors="coerce").max() if not sel_ip_df.empty else 0
-        if pd.isna(_max_ep_val) or _max_ep_val == 0: _Ns = [min(EP_CHOICES)]
-        else: _Ns = [n for n in EP_CHOICES if n <= _max_ep_val]
-        
+        _Ns = growth_episode_cutoffs(df_all, selected_ip)
         sorted_cutoffs = sorted(list(set(_Ns) | {ep_cutoff}))
         evo_rows = []
         base = pd.DataFrame() # 초기화
@@ -3607,12 +5081,9 @@ def render_growth_score():
         st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
 
         # [UI] 등급 추이 그래프
-        # 유효 회차 확인
-        _v_view = _get_view_data(df_all[df_all["IP"] == selected_ip])
-        _v_view["ep"] = pd.to_numeric(_v_view["회차_numeric"] if "회차_numeric" in _v_view.columns else _v_view["회차"].astype(str).str.extract(r"(\d+)", expand=False), errors="coerce")
-        _v_view["val"] = pd.to_numeric(_v_view["value"], errors="coerce").replace(0, np.nan)
-        has_ep1 = bool(_v_view.loc[_v_view["ep"] == 1, "val"].notna().any())
-        has_ep2 = bool(_v_view.loc[_v_view["ep"] == 2, "val"].notna().any())
+        # 유효 회차 확인 (조회수 1·2회차 값 유무 → 데이터 유무 비트맵)
+        has_ep1 = has_data(df_all, selected_ip, "조회수", episodes=[1])
+        has_ep2 = has_data(df_all, selected_ip, "조회수", episodes=[2])
 
         evo = pd.DataFrame(evo_rows)
         if not evo.empty:
@@ -3631,26 +5102,8 @@ def render_growth_score():
         st.divider()
 
         # [UI] 포지셔닝 맵 (디지털)
-        pos_map = {(r, c): [] for r in ROW_LABELS for c in COL_LABELS}
-        for _, r in base.iterrows():
-            ra = str(r["종합_절대등급"]) if pd.notna(r["종합_절대등급"]) else None
-            rs = str(r["종합_상승등급"]) if pd.notna(r["종합_상승등급"]) else None
-            if ra in ROW_LABELS and rs in COL_LABELS: pos_map[(ra, rs)].append(r["IP"])
-
-        z = [[(ABS_SCORE[rr] + SLO_SCORE[cc]) / 2.0 for cc in COL_LABELS] for rr in ROW_LABELS]
-        fig = px.imshow(z, x=COL_LABELS, y=ROW_LABELS, origin="upper", color_continuous_scale="Blues", range_color=[1, 5], text_auto=False, aspect="auto").update_traces(xgap=0.0, ygap=0.0)
-        fig.update_xaxes(showticklabels=False, title=None, ticks="")
-        fig.update_yaxes(showticklabels=False, title=None, ticks="")
-        fig.update_layout(height=760, margin=dict(l=2, r=2, t=2, b=2), coloraxis_showscale=False)
-        fig.update_traces(hovertemplate="<extra></extra>")
-
-        for r_idx, rr in enumerate(ROW_LABELS):
-            for c_idx, cc in enumerate(COL_LABELS):
-                cell_val = z[r_idx][c_idx]
-                names = pos_map[(rr, cc)]
-                color = "#FFFFFF" if cell_val >= 3.3 else "#111111"
-                fig.add_annotation(x=cc, y=rr, xref="x", yref="y", text=f"<b style='letter-spacing:0.5px'>{rr}{cc}</b>", showarrow=False, font=dict(size=22, color=color, family="sans-serif"), xanchor="center", yanchor="top", yshift=80)
-                if names: fig.add_annotation(x=cc, y=rr, xref="x", yref="y", text=f"<span style='line-height:1.04'>{'<br>'.join(names)}</span>", showarrow=False, font=dict(size=12, color=color, family="sans-serif"), xanchor="center", yanchor="middle", yshift=6)
+        fig = cached_figure("growth.positioning_map", _positioning_map_key(base), df_all,
+                            lambda: _build_positioning_map_fig(base))
 
         st.markdown("#### 🗺️ 포지셔닝맵")
         st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
@@ -3670,6 +5123,333 @@ def render_growth_score():
 # [수정] 7. 사전지표 분석 페이지 렌더러 (v2.3 - 시사지표 박스 제거)
 #endregion
 #region [ 6-5. 사전지표 분석 ]
+
+# ===== 6-5-0. W+1 화제성 예측 — 컷오프 모델 레지스트리 (데이터 버전별 1회 학습) =====
+PRELAUNCH_WEEK_ORDER = ["W-6", "W-5", "W-4", "W-3", "W-2", "W-1"]
+PRELAUNCH_CUTOFFS = ["W-3", "W-2", "W-1"]
+PRELAUNCH_MIN_LABELS = 12
+
+
+def _prelaunch_target_week(_df: pd.DataFrame) -> str:
+    cand = ["W+1", "W1", "W 1", "W+01"]
+    w = set(_df.loc[_df.get("metric") == "F_Score", "주차"].dropna().astype(str))
+    for c in cand:
+        if c in w:
+            return c
+    if len(w) == 0:
+        return "W+1"
+    return sorted(list(w))[-1]
+
+
+def _prelaunch_safe_num(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s, errors="coerce").fillna(0)
+
+
+def _prelaunch_week_cube(_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    사전 시계열(조회수/언급량/MPI 3종)을 IP × 지표 × 주차(W-6~W-1) 배열로 한 번에 만듭니다.
+    - 주차는 서수(0~5)로 한 번만 매핑, 같은 칸에 여러 행이 있으면 마지막 행 값 사용(기존 빌더와 동일)
+    - 반환: ips / metrics / vals(값, 누락=0) / present(행 존재 여부)
+    """
+    ts_metrics = ["언급량", "MPI_인지", "MPI_선호", "MPI_시청의향"]
+    if WEEK_NUM_COL not in _df.columns:
+        _df = _df.copy()
+        _df[WEEK_NUM_COL], _df[WEEK_NORM_COL] = _decode_week_labels(_df["주차"])
+    week_nums = [int(w[1:]) for w in PRELAUNCH_WEEK_ORDER]
+
+    frames = []
+    try:
+        v = _get_view_data(_df)
+        frames.append(pd.DataFrame({"IP": v["IP"], "w": v[WEEK_NUM_COL], "metric": "조회수", "val": v["value"]}))
+    except Exception:
+        pass
+    tmp = _df[_df.get("metric").isin(ts_metrics)]
+    frames.append(tmp[["IP", WEEK_NUM_COL, "metric", "value"]].rename(columns={WEEK_NUM_COL: "w", "value": "val"}))
+
+    # 주차 필터는 서수 정수 비교 (W-6 → 0 … W-1 → 5)
+    ts = pd.concat(frames, ignore_index=True)
+    ts = ts[ts["w"].isin(week_nums).fillna(False).astype(bool)]
+    ts["w"] = ts["w"].astype(int) - week_nums[0]
+    ts["val"] = _prelaunch_safe_num(ts["val"])
+
+    ip_codes, ips = pd.factorize(ts["IP"], sort=True)
+    m_codes, metrics = pd.factorize(ts["metric"], sort=True)
+    w_codes = ts["w"].to_numpy(dtype=int)
+
+    shape = (len(ips), len(metrics), len(PRELAUNCH_WEEK_ORDER))
+    vals = np.zeros(shape)
+    present = np.zeros(shape, dtype=bool)
+    last = ts["val"].groupby([ip_codes, m_codes, w_codes]).last()
+    if len(last):
+        i, m, w = (last.index.get_level_values(k).to_numpy() for k in range(3))
+        vals[i, m, w] = last.to_numpy(dtype=float)
+        present[i, m, w] = True
+    return {"ips": pd.Index(ips), "metrics": list(metrics), "vals": vals, "present": present}
+
+
+def _build_prelaunch_features(_df: pd.DataFrame, cutoff: str, target_week: str,
+                              cube: Dict[str, Any] = None) -> tuple[pd.DataFrame, list[str], str]:
+    """
+    컷오프 주차까지의 사전 데이터로 IP 단위 학습 프레임을 만듭니다. (타깃: W+1 화제성)
+    cube를 넘기면 주차 배열을 재사용해 컷오프별로 슬라이스만 합니다.
+    """
+    if cube is None:
+        cube = _prelaunch_week_cube(_df)
+
+    # 타깃(y): 항상 W+1(=1주차) 화제성(F_Score)
+    y_sub = _df[(_df.get("metric") == "F_Score") & (_df.get("주차").astype(str) == str(target_week))]
+    y_ip = pd.to_numeric(y_sub["value"], errors="coerce").groupby(y_sub["IP"]).mean()
+
+    # 기준 프레임: IP 목록 (기존 페이지 동작과 동일하게 시사지표는 컷오프 모델 피처에 포함하지 않음)
+    sisa_wide = pd.DataFrame({"IP": _df["IP"].dropna().unique()})
+
+    # 컷오프까지의 주차 슬라이스 → 총량/수준/최근변화/추세
+    n = PRELAUNCH_WEEK_ORDER.index(cutoff) + 1
+    V = cube["vals"][:, :, :n]
+    has = cube["present"][:, :, :n].any(axis=2)
+
+    sm = V.sum(axis=2)
+    last = V[:, :, -1]
+    first = V[:, :, 0]
+    ref = V[:, :, -3] if n >= 3 else first
+    mom = last - ref
+    slope = (last - first) / float(n - 1) if n >= 2 else np.zeros_like(last)
+
+    # 컬럼 순서: IP(가나다) 순으로 처음 등장한 지표부터 (기존 행 단위 빌더와 동일)
+    row_has = has.any(axis=1)
+    first_ip = np.where(has.any(axis=0), has.argmax(axis=0), len(has))
+    metric_order = sorted(
+        [j for j in range(len(cube["metrics"])) if has[:, j].any()],
+        key=lambda j: (first_ip[j], cube["metrics"][j]),
+    )
+
+    feats = {}
+    for j in metric_order:
+        m = cube["metrics"][j]
+        mask = has[:, j]
+        if m in ["조회수", "언급량"]:
+            cols = {
+                f"사전:{m}_총량(log)": np.log1p(sm[:, j]),
+                f"사전:{m}_수준({cutoff},log)": np.log1p(last[:, j]),
+                f"사전:{m}_최근변화({cutoff},log)": np.sign(mom[:, j]) * np.log1p(np.abs(mom[:, j])),
+                f"사전:{m}_추세({cutoff})": slope[:, j],
+            }
+        else:
+            cols = {
+                f"{m}_총량": sm[:, j],
+                f"{m}_수준({cutoff})": last[:, j],
+                f"{m}_최근변화({cutoff})": mom[:, j],
+                f"{m}_추세({cutoff})": slope[:, j],
+            }
+        for name, arr in cols.items():
+            feats[name] = np.where(mask, arr, np.nan)[row_has]
+
+    feat_df = pd.DataFrame(feats)
+    feat_df.insert(0, "IP", cube["ips"][row_has])
+
+    merged = sisa_wide.merge(feat_df, on="IP", how="left").fillna(0)
+    merged["__y"] = merged["IP"].map(y_ip)
+    target_col = "__y"
+    feature_cols = [c for c in merged.columns if c not in ["IP", target_col]]
+    return merged, feature_cols, target_col
+
+
+PRELAUNCH_ALPHAS = np.logspace(-2, 3, 11)   # Ridge alpha 탐색 그리드 (LOO 오차 최소값 선택)
+PRELAUNCH_BOOTSTRAP_N = 400                 # 예측구간용 부트스트랩 반복 수
+PRELAUNCH_PI_LEVEL = 0.8                    # 예측구간 신뢰수준 (10~90 분위)
+
+
+def _ridge_loo_path(Z: np.ndarray, y: np.ndarray, alphas: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    표준화된 Z(n×p)와 y(n)에 대해 alpha 그리드 전체의 정확한 leave-one-out 예측을 한 번에 계산합니다.
+    - 절편은 벌점 없이 중심화로 처리: H = 11ᵀ/n + U·diag(s²/(s²+α))·Uᵀ
+    - LOO 예측 = y - (y - ŷ) / (1 - h_ii)  → 재학습 N번 대신 SVD 1회
+    반환: loo(n×A), s, U, Vt, Uty
+    """
+    n = len(y)
+    y_mean = y.mean()
+    U, s, Vt = np.linalg.svd(Z, full_matrices=False)
+    Uty = U.T @ (y - y_mean)
+    shrink = s[None, :] ** 2 / (s[None, :] ** 2 + alphas[:, None])      # (A, r)
+    fitted = y_mean + U @ (shrink * Uty[None, :]).T                      # (n, A)
+    hat = 1.0 / n + (U ** 2) @ shrink.T                                  # (n, A)
+    loo = y[:, None] - (y[:, None] - fitted) / (1.0 - hat)
+    return {"loo": loo, "s": s, "Vt": Vt, "Uty": Uty, "y_mean": y_mean}
+
+
+def _ridge_bootstrap_intervals(Z: np.ndarray, y: np.ndarray, resid: np.ndarray, alpha: float,
+                               Z_query: np.ndarray, n_boot: int = PRELAUNCH_BOOTSTRAP_N,
+                               level: float = PRELAUNCH_PI_LEVEL, seed: int = 42) -> tuple[np.ndarray, np.ndarray]:
+    """
+    부트스트랩 예측구간(log 스케일)을 반복문 없이 계산합니다.
+    - 재표본 가중치(B×n)를 한 번에 뽑아 가중 Ridge 정규방정식 B개를 배치 solve
+    - 예측 분포 = 각 복제 모델의 예측 + LOO 잔차 재표본 → 분위수
+    반환: (하한, 상한) — Z_query 행 순서, log 스케일
+    """
+    rng = np.random.default_rng(seed)
+    n, p = Z.shape
+    W = rng.multinomial(n, np.full(n, 1.0 / n), size=n_boot).astype(float)   # (B, n), 행 합 = n
+
+    mz = W @ Z / n                                                          # (B, p) 가중 평균
+    my = W @ y / n                                                          # (B,)
+    gram = np.einsum("bi,ij,ik->bjk", W, Z, Z) - n * mz[:, :, None] * mz[:, None, :]
+    gram += alpha * np.eye(p)[None, :, :]
+    rhs = (W * y[None, :]) @ Z - n * mz * my[:, None]
+    beta = np.linalg.solve(gram, rhs[:, :, None])[:, :, 0]                   # (B, p)
+    intercept = my - np.einsum("bp,bp->b", mz, beta)
+
+    preds = Z_query @ beta.T + intercept[None, :]                            # (q, B)
+    preds = preds + rng.choice(resid, size=preds.shape, replace=True)
+    tail = (1.0 - level) / 2.0 * 100.0
+    lo, hi = np.percentile(preds, [tail, 100.0 - tail], axis=1)
+    return lo, hi
+
+
+def _fit_prelaunch_model(frame_df: pd.DataFrame, feature_cols: list[str], target_col: str) -> Dict[str, Any]:
+    """
+    Ridge(StandardScaler) 학습 후 예측에 필요한 값만 압축 보관합니다.
+    - alpha는 PRELAUNCH_ALPHAS 중 LOO 오차(log 스케일 MSE)가 가장 작은 값
+    - pred_df / mape는 각 IP를 빼고 학습했을 때의 예측(LOO) 기준 → 정직한 백테스트
+    반환: frame(IP별 피처 행렬) / mean·scale·coef·intercept / alpha / LOO 예측(pred_df) / mape
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    X_frame = frame_df[feature_cols].apply(_prelaunch_safe_num).to_numpy(dtype=float)
+    model = {
+        "ips": pd.Index(frame_df["IP"]),
+        "X": X_frame,
+        "feature_cols": list(feature_cols),
+        "pred_df": None,
+        "mape": float("nan"),
+        "fitted": False,
+    }
+
+    d = frame_df.copy()
+    y = pd.to_numeric(d[target_col], errors="coerce")
+    d = d[y.notna()].copy()
+    y = pd.to_numeric(d[target_col], errors="coerce")
+
+    if d.shape[0] < PRELAUNCH_MIN_LABELS:
+        return model
+
+    X = d[feature_cols].apply(_prelaunch_safe_num).to_numpy(dtype=float)
+    y_log = np.log1p(y.clip(lower=0)).to_numpy(dtype=float)
+
+    scaler = StandardScaler(with_mean=True, with_std=True).fit(X)
+    Z = scaler.transform(X)
+
+    path = _ridge_loo_path(Z, y_log, PRELAUNCH_ALPHAS)
+    loo_mse = ((path["loo"] - y_log[:, None]) ** 2).mean(axis=0)
+    best = int(np.argmin(loo_mse))
+    alpha = float(PRELAUNCH_ALPHAS[best])
+
+    # 선택된 alpha로 전체 학습 (같은 SVD 재사용)
+    s = path["s"]
+    coef = path["Vt"].T @ (s / (s ** 2 + alpha) * path["Uty"])
+
+    pred = np.maximum(np.expm1(path["loo"][:, best]), 0.0)
+
+    # 전체 IP의 예측구간을 한 번에 계산해 보관 (조회 시 계산 없음)
+    Z_all = (X_frame - scaler.mean_) / scaler.scale_
+    pi_lo, pi_hi = _ridge_bootstrap_intervals(Z, y_log, y_log - path["loo"][:, best], alpha, Z_all)
+
+    yv = y.to_numpy(dtype=float)
+    pe = np.where((yv != 0) & np.isfinite(yv), np.abs(pred - yv) / np.abs(yv) * 100.0, np.nan)
+    mape = float(np.nanmean(pe)) if np.isfinite(pe).any() else float("nan")
+
+    out = d[["IP", target_col]].copy()
+    out["_pred"] = pred
+
+    model.update({
+        "mean": scaler.mean_.copy(),
+        "scale": scaler.scale_.copy(),
+        "coef": coef,
+        "intercept": float(path["y_mean"]),
+        "alpha": alpha,
+        "loo_mse": dict(zip(PRELAUNCH_ALPHAS.tolist(), loo_mse.tolist())),
+        "pi_low": np.maximum(np.expm1(pi_lo), 0.0),
+        "pi_high": np.maximum(np.expm1(pi_hi), 0.0),
+        "pred_df": out,
+        "mape": mape,
+        "fitted": True,
+    })
+    return model
+
+
+def _build_prelaunch_registry(df_full: pd.DataFrame) -> Dict[str, Any]:
+    """컷오프(W-3/W-2/W-1)별 모델을 한 번에 학습합니다. (get_versioned_resource 빌더)"""
+    try:
+        import sklearn  # noqa: F401
+    except Exception as _e:
+        raise ModuleNotFoundError(
+            "scikit-learn is required for the multi-model predictor. "
+            "Add 'scikit-learn' to requirements.txt and redeploy."
+        ) from _e
+
+    target_week = _prelaunch_target_week(df_full)
+    cube = _prelaunch_week_cube(df_full)
+    models = {}
+    for cutoff in PRELAUNCH_CUTOFFS:
+        fr, feat_cols, tcol = _build_prelaunch_features(df_full, cutoff, target_week, cube=cube)
+        models[cutoff] = _fit_prelaunch_model(fr, feat_cols, tcol)
+    return {"target_week": target_week, "models": models}
+
+
+def get_prelaunch_registry(df_src: pd.DataFrame) -> Dict[str, Any]:
+    return get_versioned_resource("prelaunch_models", df_src, _build_prelaunch_registry)
+
+
+def prelaunch_predict(model: Dict[str, Any], ip: str):
+    """
+    레지스트리 모델로 한 IP의 W+1 화제성 예측값과 피처별 기여도(스케일 계수 × 표준화 값)를 반환합니다.
+    학습되지 않았거나 IP가 없으면 (None, None)
+    """
+    if not model.get("fitted"):
+        return None, None
+    pos = model["ips"].get_indexer([ip])[0]
+    if pos < 0:
+        return None, None
+    z = (model["X"][pos:pos + 1] - model["mean"]) / model["scale"]
+    pred_log = z @ model["coef"] + model["intercept"]
+    pred = float(np.maximum(np.expm1(pred_log[0]), 0.0))
+    contrib = pd.Series(model["coef"] * z[0], index=model["feature_cols"])
+    return pred, contrib
+
+
+def prelaunch_interval(model: Dict[str, Any], ip: str):
+    """레지스트리에 미리 계산된 IP의 부트스트랩 예측구간 (하한, 상한). 없으면 None"""
+    if not model.get("fitted"):
+        return None
+    pos = model["ips"].get_indexer([ip])[0]
+    if pos < 0:
+        return None
+    return float(model["pi_low"][pos]), float(model["pi_high"][pos])
+
+
+# ===== 6-5-1. 사전지표 비교군 셀 통계 =====
+PRELAUNCH_TREND_METRICS = ["MPI_인지", "MPI_선호", "MPI_시청의향", "조회수", "언급량"]
+
+
+def _prelaunch_group_table(df_full: pd.DataFrame, max_ep: float = None) -> pd.DataFrame:
+    """
+    비교군 평균용 IP별 합산 통계 (모두 더해서 합칠 수 있는 값만)
+    - 'row_sum:지표' / 'row_n:지표' = 지표별 행 값 합계 / 행 수 (시사지표 막대)
+    - 'wk_sum:지표:주차' / 'wk_n:지표:주차' = (IP, 주차) 합계 / IP-주차 수 (트렌드 라인)
+    """
+    grp = df_full.groupby(["IP", "metric"])["value"]
+    row_sum, row_n = grp.sum().unstack("metric"), grp.size().unstack("metric").astype(float)
+    parts = [row_sum.add_prefix("row_sum:"), row_n.add_prefix("row_n:")]
+
+    for m in PRELAUNCH_TREND_METRICS:
+        sub = _get_view_data(df_full) if m == "조회수" else df_full[df_full["metric"] == m]
+        if sub.empty:
+            continue
+        wk = sub.groupby(["IP", "주차"])["value"].sum().unstack("주차")
+        parts.append(wk.add_prefix(f"wk_sum:{m}:"))
+        parts.append(wk.notna().astype(float).add_prefix(f"wk_n:{m}:"))
+    return pd.concat(parts, axis=1).astype(float)
+
+
 def render_pre_launch_analysis():
     df_all = load_data()
     
@@ -3736,12 +5516,24 @@ def render_pre_launch_analysis():
     # --- 5. 데이터셋 준비 ---
     df_target = df_all[df_all["IP"] == global_ip].copy()
 
-    df_group = df_all.copy()
-    if sel_years:
-        df_group = df_group[df_group["편성연도"].isin(sel_years)]
-    if comp_prog_opt == "동일 편성" and default_prog:
-        df_group = df_group[df_group["편성"] == default_prog]
-    df_group = df_group[df_group["IP"] != global_ip]
+    # 비교군 평균은 (편성, 편성연도) 셀 통계를 합쳐 계산 (셀 합산이 불가하면 원본 행 필터)
+    group_progs = [default_prog] if (comp_prog_opt == "동일 편성" and default_prog) else None
+    group_cells = get_group_cells("prelaunch", df_all, _prelaunch_group_table)
+    group_merged = merge_group_cells(group_cells, group_progs, sel_years, aired_only=False, exclude_ip=global_ip)
+    group_sums = dict(zip(group_cells["columns"], group_merged["sum"])) if group_merged is not None else None
+
+    df_group = pd.DataFrame()
+    if group_sums is None:
+        df_group = df_all.copy()
+        if sel_years:
+            df_group = df_group[df_group["편성연도"].isin(sel_years)]
+        if group_progs:
+            df_group = df_group[df_group["편성"].isin(group_progs)]
+        df_group = df_group[df_group["IP"] != global_ip]
+
+    def _group_ratio(sum_key: str, n_key: str):
+        n = group_sums.get(n_key, 0.0)
+        return group_sums.get(sum_key, 0.0) / n if n > 0 else None
 
     prev_ip_name = get_previous_work_ip(df_all, global_ip)
     df_prev = pd.DataFrame()
@@ -3761,12 +5553,16 @@ def render_pre_launch_analysis():
         def _get_metric_mean(df, m_list):
             if df.empty: return {m: 0 for m in m_list}
             sub = df[df["metric"].isin(m_list)].copy()
-            sub["val"] = pd.to_numeric(sub["value"], errors="coerce")
+            sub["val"] = sub["value"]
             grp = sub.groupby("metric")["val"].mean()
             return grp.to_dict()
 
         val_target = _get_metric_mean(df_target, metric_list)
-        val_group  = _get_metric_mean(df_group,  metric_list)
+        if group_sums is not None:
+            val_group = {m: _group_ratio(f"row_sum:{m}", f"row_n:{m}") for m in metric_list}
+            val_group = {m: v for m, v in val_group.items() if v is not None}
+        else:
+            val_group = _get_metric_mean(df_group, metric_list)
         val_prev   = _get_metric_mean(df_prev,   metric_list)
 
         data = []
@@ -3833,7 +5629,7 @@ def render_pre_launch_analysis():
             if "주차" in sub.columns:
                 sub = sub[sub["주차"].isin(target_weeks)]
             
-            sub["val"] = pd.to_numeric(sub["value"], errors="coerce")
+            sub["val"] = sub["value"]
             ip_weekly_sum = sub.groupby(["IP", "주차"])["val"].sum().reset_index()
             grp = ip_weekly_sum.groupby("주차")["val"].mean()
             
@@ -3841,7 +5637,10 @@ def render_pre_launch_analysis():
             return grp.sort_index(key=lambda x: x.map(sorter))
 
         s_target = _fetch_trend_data(df_target, metric_name)
-        s_group  = _fetch_trend_data(df_group,  metric_name)
+        if group_sums is not None:
+            s_group = pd.Series({w: _group_ratio(f"wk_sum:{metric_name}:{w}", f"wk_n:{metric_name}:{w}") for w in target_weeks}, dtype=float).dropna()
+        else:
+            s_group = _fetch_trend_data(df_group, metric_name)
         s_prev   = _fetch_trend_data(df_prev,   metric_name)
 
         if s_target.empty and s_group.empty and s_prev.empty:
@@ -3977,7 +5776,7 @@ def render_pre_launch_analysis():
         mpi_wide_all = pd.DataFrame(index=meta.index)
 
         if not mpi_sub.empty:
-            mpi_sub["val"] = pd.to_numeric(mpi_sub["value"], errors="coerce")
+            mpi_sub["val"] = mpi_sub["value"]
             mpi_pv = mpi_sub.pivot_table(index="IP", columns=["metric", "주차"], values="val", aggfunc="mean")
 
             for m in mpi_metrics:
@@ -4050,8 +5849,9 @@ def render_pre_launch_analysis():
 
         # 데이터 커버리지(주차가 덜 쌓인 IP에 대한 과대추정 완화용)
         # 0이 '실제로 0'일 수도 있지만, 사전 구간에서 완전 0이 반복되면 정보가 부족한 케이스가 많아 보정에 도움이 됨.
-        dig_feats["조회수_week_coverage_W-6_W-1"] = (v_pv.fillna(0) > 0).mean(axis=1)
-        dig_feats["언급량_week_coverage_W-6_W-1"] = (b_pv.fillna(0) > 0).mean(axis=1)
+        # 분모는 W-6~W-1 중 데이터에 실제로 있는 주차 (주차 피벗 열 기준과 동일)
+        dig_feats["조회수_week_coverage_W-6_W-1"] = week_coverage(df, "조회수", dig_weeks, over="present").reindex(meta.index).fillna(0.0)
+        dig_feats["언급량_week_coverage_W-6_W-1"] = week_coverage(df, "언급량", dig_weeks, over="present").reindex(meta.index).fillna(0.0)
 
         # ---- (4) 타깃: 1주차 화제성 점수(F_Score) ----
         target_metric = "F_Score"
@@ -4062,7 +5862,7 @@ def render_pre_launch_analysis():
 
         y_sub = df[(df["metric"] == target_metric) & (df["주차"] == target_week)].copy()
         if not y_sub.empty:
-            y_sub["y"] = pd.to_numeric(y_sub["value"], errors="coerce")
+            y_sub["y"] = y_sub["value"]
             y = y_sub.groupby("IP")["y"].mean().reindex(meta.index)
         else:
             y = pd.Series(index=meta.index, dtype=float)
@@ -4282,198 +6082,34 @@ def render_pre_launch_analysis():
     #   - 신규 IP는 보유한 최신 주차에 맞는 모델을 자동 선택
     # =====================================================
 
-    # --- sklearn (runtime dependency) ---
-    try:
-        from sklearn.pipeline import Pipeline
-        from sklearn.preprocessing import StandardScaler
-        from sklearn.linear_model import Ridge
-    except Exception as _e:
-        raise ModuleNotFoundError(
-            "scikit-learn is required for the multi-model predictor. "
-            "Add 'scikit-learn' to requirements.txt and redeploy."
-        ) from _e
-
-    WEEK_ORDER = ["W-6", "W-5", "W-4", "W-3", "W-2", "W-1"]
-
-    def _week_leq(week: str, cutoff: str) -> bool:
-        if week not in WEEK_ORDER:
-            return False
-        return WEEK_ORDER.index(week) <= WEEK_ORDER.index(cutoff)
-
-    def _detect_target_week(_df: pd.DataFrame) -> str:
-        cand = ["W+1", "W1", "W 1", "W+01"]
-        w = set(_df.loc[_df.get("metric") == "F_Score", "주차"].dropna().astype(str))
-        for c in cand:
-            if c in w:
-                return c
-        if len(w) == 0:
-            return "W+1"
-        return sorted(list(w))[-1]
-
-    target_week = _detect_target_week(df_all)
-
-    def _safe_num(s: pd.Series) -> pd.Series:
-        return pd.to_numeric(s, errors="coerce").fillna(0)
-
-    def _calc_slope(vals: list[float]) -> float:
-        if vals is None or len(vals) < 2:
-            return 0.0
-        return (float(vals[-1]) - float(vals[0])) / float(len(vals) - 1)
-
-    def _build_features_for_cutoff(_df: pd.DataFrame, cutoff: str) -> tuple[pd.DataFrame, list[str], str]:
-        # 1) cutoff 주차까지만 사용
-        sub = _df[_df["주차"].astype(str).apply(lambda w: _week_leq(str(w), cutoff))].copy()
-
-        # 2) 타깃(y): 항상 W+1(=1주차) 화제성(F_Score)
-        y_sub = _df[(_df.get("metric") == "F_Score") & (_df.get("주차").astype(str) == str(target_week))].copy()
-        y_sub["y"] = pd.to_numeric(y_sub.get("value"), errors="coerce")
-        y_ip = y_sub.groupby("IP")["y"].mean()
-
-        # 3) 시사지표(항목별)
-        sisa_keys = list(SISA_MAP.keys()) if "SISA_MAP" in globals() else []
-        sisa = _df[_df.get("metric").isin(sisa_keys)].copy() if sisa_keys else pd.DataFrame(columns=["IP","metric","value"])
-        if not sisa.empty:
-            sisa["v"] = pd.to_numeric(sisa.get("value"), errors="coerce").fillna(0)
-            sisa_wide = sisa.pivot_table(index="IP", columns="metric", values="v", aggfunc="mean").reset_index()
-        else:
-            sisa_wide = pd.DataFrame({"IP": _df["IP"].dropna().unique()})
-
-        # 4) 시계열 지표: (조회수/언급량/MPI 3종) → level/sum/mean/mom/slope
-        ts_metrics = ["언급량", "MPI_인지", "MPI_선호", "MPI_시청의향"]
-
-        frames = []
-
-        # 조회수: 기존 대시보드 helper가 있으면 활용
-        if "_get_view_data" in globals():
-            try:
-                v = _get_view_data(_df).copy()
-                v = v[v["주차"].astype(str).apply(lambda w: _week_leq(str(w), cutoff))]
-                v["val"] = pd.to_numeric(v.get("value"), errors="coerce").fillna(0)
-                v["metric"] = "조회수"
-                frames.append(v[["IP","주차","metric","val"]])
-            except Exception:
-                pass
-
-        for m in ts_metrics:
-            tmp = sub[sub.get("metric") == m].copy()
-            if tmp.empty:
-                continue
-            tmp["val"] = pd.to_numeric(tmp.get("value"), errors="coerce").fillna(0)
-            frames.append(tmp[["IP","주차","metric","val"]])
-
-        ts = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["IP","주차","metric","val"])
-
-        feat_rows = []
-        for ip, g in ts.groupby("IP"):
-            row = {"IP": ip}
-            for m, gm in g.groupby("metric"):
-                wm = gm.set_index(gm["주차"].astype(str))["val"].to_dict()
-                vals = [float(wm.get(w, 0.0)) for w in WEEK_ORDER if _week_leq(w, cutoff)]
-                if len(vals) == 0:
-                    continue
-                last = vals[-1]
-                first = vals[0]
-                mean = float(sum(vals) / len(vals))
-                sm = float(sum(vals))
-                ref = vals[-3] if len(vals) >= 3 else first
-                mom = float(last - ref)
-                slope = _calc_slope(vals)
-
-                if m in ["조회수", "언급량"]:
-                    row[f"사전:{m}_총량(log)"] = float(np.log1p(sm))
-                    row[f"사전:{m}_수준({cutoff},log)"] = float(np.log1p(last))
-                    row[f"사전:{m}_최근변화({cutoff},log)"] = float(np.sign(mom) * np.log1p(abs(mom)))
-                    row[f"사전:{m}_추세({cutoff})"] = float(slope)
-                else:
-                    row[f"{m}_총량"] = float(sm)
-                    row[f"{m}_수준({cutoff})"] = float(last)
-                    row[f"{m}_최근변화({cutoff})"] = float(mom)
-                    row[f"{m}_추세({cutoff})"] = float(slope)
-            feat_rows.append(row)
-
-        feat_df = pd.DataFrame(feat_rows) if feat_rows else pd.DataFrame(columns=["IP"])
-
-        merged = sisa_wide.merge(feat_df, on="IP", how="left").fillna(0)
-        merged["__y"] = merged["IP"].map(y_ip)
-        target_col = "__y"
-        feature_cols = [c for c in merged.columns if c not in ["IP", target_col]]
-        return merged, feature_cols, target_col
-
-    def _fit_predict_one(frame_df: pd.DataFrame, feature_cols: list[str], target_col: str, ip_pick: str | None):
-        d = frame_df.copy()
-        y = pd.to_numeric(d[target_col], errors="coerce")
-        d = d[y.notna()].copy()
-        y = pd.to_numeric(d[target_col], errors="coerce")
-
-        if d.shape[0] < 12:
-            return None, None, float("nan"), None
-
-        X = d[feature_cols].apply(_safe_num)
-        y_log = np.log1p(y.clip(lower=0))
-
-        pipe = Pipeline([
-            ("scaler", StandardScaler(with_mean=True, with_std=True)),
-            ("ridge", Ridge(alpha=10.0, random_state=42)),
-        ])
-        pipe.fit(X, y_log)
-
-        pred = np.maximum(np.expm1(pipe.predict(X)), 0.0)
-
-        yv = y.to_numpy(dtype=float)
-        pe = np.where((yv != 0) & np.isfinite(yv), np.abs(pred - yv) / np.abs(yv) * 100.0, np.nan)
-        mape = float(np.nanmean(pe)) if np.isfinite(pe).any() else float("nan")
-
-        out = d[["IP", target_col]].copy()
-        out["_pred"] = pred
+    # --- 컷오프별 모델: 데이터 버전당 1회 학습된 레지스트리에서 조회 ---
+    registry = get_prelaunch_registry(df_all)
+    target_week = registry["target_week"]
 
-        pred_ip = None
-        if ip_pick is not None:
-            r = frame_df[frame_df["IP"] == ip_pick]
-            if not r.empty:
-                Xp = r[feature_cols].apply(_safe_num)
-                pred_ip = float(np.maximum(np.expm1(pipe.predict(Xp)[0]), 0.0))
-        return out, pred_ip, mape, pipe
-
-    # --- train 3 models ---
     preds = {}
     mapes = {}
-    for cutoff in ["W-3", "W-2", "W-1"]:
-        fr, feat_cols, tcol = _build_features_for_cutoff(df_all, cutoff=cutoff)
-        p_df, p_ip, mape, _model = _fit_predict_one(fr, feat_cols, tcol, ip_pick=global_ip)
-        preds[cutoff] = {"df": p_df, "ip": p_ip}
-        mapes[cutoff] = mape
+    for cutoff in PRELAUNCH_CUTOFFS:
+        model = registry["models"][cutoff]
+        p_ip, _contrib = prelaunch_predict(model, global_ip)
+        preds[cutoff] = {"df": model["pred_df"], "ip": p_ip, "pi": prelaunch_interval(model, global_ip)}
+        mapes[cutoff] = model["mape"]
+
+    # 정규화 주차 라벨 (로드 시 계산된 컬럼 재사용)
+    if WEEK_NORM_COL in df_all.columns:
+        week_norm_all = df_all[WEEK_NORM_COL]
+    elif "주차" in df_all.columns:
+        week_norm_all = df_all["주차"].map(_norm_week_label)
+    else:
+        week_norm_all = pd.Series("", index=df_all.index)
 
     def _has_week(ip: str, w: str) -> bool:
-        try:
-            if "주차" not in df_all.columns:
-                return False
-
-            def _norm_week_label(s):
-                s = str(s)
-                return s.replace("+", "").replace("주차", "").strip()
-
-            # 해당 IP의 해당 주차 레코드 필터링
-            week_norm = df_all["주차"].astype(str).map(_norm_week_label)
-            sub = df_all[(df_all["IP"] == ip) & (week_norm == _norm_week_label(w))].copy()
-
-            # 🔑 핵심 사전지표 3종: 조회수 / 언급량 / MPI(인지·선호·시청의향)
-            # 하나라도 없으면 해당 주차는 '충분한 데이터 없음'으로 간주
-            has_buzz = not sub[sub.get("metric") == "언급량"].empty
-
-            mpi_metrics = ["MPI_인지", "MPI_선호", "MPI_시청의향"]
-            has_mpi = not sub[sub.get("metric").isin(mpi_metrics)].empty
-
-            has_view = False
-            if "_get_view_data" in globals():
-                v = _get_view_data(df_all)
-                if "주차" in v.columns:
-                    v_week_norm = v["주차"].astype(str).map(_norm_week_label)
-                    v_sub = v[(v["IP"] == ip) & (v_week_norm == _norm_week_label(w))]
-                    has_view = not v_sub.empty
-
-            return has_view and has_buzz and has_mpi
-        except Exception:
-            return False
+        # 🔑 핵심 사전지표 3종: 조회수 / 언급량 / MPI(인지·선호·시청의향)
+        # 하나라도 없으면 해당 주차는 '충분한 데이터 없음'으로 간주 (행 존재 여부 → 데이터 유무 비트맵)
+        mpi_metrics = ["MPI_인지", "MPI_선호", "MPI_시청의향"]
+        return all(
+            has_data(df_all, ip, m, weeks=[w], kind="row")
+            for m in ("조회수", "언급량", mpi_metrics)
+        )
 
     chosen = None
     if _has_week(global_ip, "W-1"):
@@ -4486,13 +6122,8 @@ def render_pre_launch_analysis():
     # actual value
     actual_val = None
     try:
-        def _norm_week_label_for_actual(s):
-            s = str(s)
-            return s.replace("+", "").replace("주차", "").strip()
-
         if "주차" in df_all.columns:
-            week_norm_all = df_all["주차"].astype(str).map(_norm_week_label_for_actual)
-            target_week_norm = _norm_week_label_for_actual(target_week)
+            target_week_norm = _norm_week_label(target_week)
 
             _a = df_all[
                 (df_all.get("metric") == "F_Score") &
@@ -4519,16 +6150,23 @@ def render_pre_launch_analysis():
         pred_val = float(preds[chosen]["ip"])
         mape_val = mapes.get(chosen, float("nan"))
         mape_text = f"{mape_val:.1f}%" if np.isfinite(mape_val) else "-"
+        pi = preds[chosen].get("pi")
+        pi_html = (
+            f'<div style="color:#6b7280; font-size:13px; margin-top:4px;">'
+            f'{int(PRELAUNCH_PI_LEVEL * 100)}% 예측구간: {pi[0]:,.0f} ~ {pi[1]:,.0f}</div>'
+            if pi is not None else ""
+        )
 
         st.markdown(f"""
         <div class="kpi-card" style="padding:16px 14px;">
             <div class="kpi-title">시사지표/MPI 3종/디지털 2종 데이터의 절대값과 기울기를 바탕으로 추정됩니다</div>
             <div class="kpi-value" style="font-size:34px; margin-top:6px;">{pred_val:,.0f}</div>
+            {pi_html}
             <div style="color:#111827; font-size:13px; margin-top:8px;">
                 실제 화제성점수 ({target_week}): <b>{(f"{actual_val:,.0f}" if actual_val is not None else "방영전입니다")}</b>
             </div>
             <div style="color:#6b7280; font-size:12.5px; margin-top:6px; line-height:1.35;">
-                <b>적용 모델:</b> {chosen} 기반 · <b>평균오차율:</b> {mape_text}<br/>
+                <b>적용 모델:</b> {chosen} 기반 · <b>평균오차율(교차검증):</b> {mape_text}<br/>
                 (데이터가 누적되면(예: W-2 → W-1) 더 많은 정보를 반영한 모델로 자동 전환됩니다.)
             </div>
         </div>
@@ -4560,11 +6198,7 @@ def render_pre_launch_analysis():
         if "주차" not in df_all.columns:
             st.info("검증용 데이터에 '주차' 컬럼이 없어 예측 정확도를 계산할 수 없습니다.")
         else:
-            def _norm_week_label(s):
-                s = str(s)
-                return s.replace("+", "").replace("주차", "").strip()
-
-            week_norm = df_all["주차"].astype(str).map(_norm_week_label)
+            week_norm = week_norm_all
             target_week_norm = _norm_week_label(target_week)
 
             y_all = df_all[
@@ -4725,7 +6359,10 @@ def render_pre_launch_analysis():
     st.markdown("#### 📋 전체 IP 사전지표 종합 현황")
     
     # 1) 데이터 집계 함수
-    def calculate_pre_performance(df):
+    @st.cache_data(ttl=600, show_spinner=False)
+    def calculate_pre_performance(data_version, _df):
+        # 데이터 버전 단위로 캐시 → 정렬/검색/페이지 이동은 캐시된 표만 슬라이스
+        df = _df
         all_unique_ips = df["IP"].unique()
         if len(all_unique_ips) == 0: return pd.DataFrame(), []
 
@@ -4734,22 +6371,22 @@ def render_pre_launch_analysis():
         
         v_sub = _get_view_data(df)
         v_sub = v_sub[v_sub["주차"].isin(target_weeks_dig)]
-        v_sub["val"] = pd.to_numeric(v_sub["value"], errors="coerce").fillna(0)
+        v_sub["val"] = v_sub["value"].fillna(0)
         view_sum = v_sub.groupby("IP")["val"].sum()
 
         b_sub = df[(df["metric"] == "언급량") & (df["주차"].isin(target_weeks_dig))].copy()
-        b_sub["val"] = pd.to_numeric(b_sub["value"], errors="coerce").fillna(0)
+        b_sub["val"] = b_sub["value"].fillna(0)
         buzz_sum = b_sub.groupby("IP")["val"].sum()
 
         # (2) 시사지표 합산
         sisa_keys = list(SISA_MAP.keys())
         s_sub = df[df["metric"].isin(sisa_keys)].copy()
-        s_sub["val"] = pd.to_numeric(s_sub["value"], errors="coerce").fillna(0)
+        s_sub["val"] = s_sub["value"].fillna(0)
         sisa_total = s_sub.groupby("IP")["val"].sum()
 
         # (3) MPI 인지도 주차별 (Pivot)
         m_sub = df[df["metric"] == "MPI_인지"].copy()
-        m_sub["val"] = pd.to_numeric(m_sub["value"], errors="coerce")
+        m_sub["val"] = m_sub["value"]
         
         mpi_pivot = m_sub.pivot_table(index="IP", columns="주차", values="val", aggfunc="mean")
         
@@ -4773,7 +6410,7 @@ def render_pre_launch_analysis():
         return merged.reset_index().rename(columns={"index": "IP"}), mpi_cols
 
     # 2) 테이블 데이터 생성
-    df_pre_perf, mpi_columns = calculate_pre_performance(df_all)
+    df_pre_perf, mpi_columns = calculate_pre_performance(get_data_version(df_all), df_all)
 
     # 3) AgGrid 설정
     fmt_thousands = JsCode("""function(params){ if(params.value==null||isNaN(params.value))return '-'; return Math.round(params.value).toLocaleString(); }""")
@@ -4792,66 +6429,149 @@ def render_pre_launch_analysis():
     }}
     """)
 
-    gb = GridOptionsBuilder.from_dataframe(df_pre_perf)
-    gb.configure_default_column(
-        sortable=True, resizable=True, filter=False,
-        cellStyle={'textAlign': 'center'},
-        headerClass='centered-header'
-    )
-    gb.configure_grid_options(
-        rowHeight=34, 
-        suppressMenuHide=True, 
-        domLayout='normal',
-        getRowStyle=highlight_jscode 
-    )
+    def _pre_grid_options(page_df):
+        gb = GridOptionsBuilder.from_dataframe(page_df)
+        gb.configure_default_column(
+            sortable=False, resizable=True, filter=False,
+            cellStyle={'textAlign': 'center'},
+            headerClass='centered-header'
+        )
+        gb.configure_grid_options(
+            rowHeight=GRID_ROW_HEIGHT, 
+            suppressMenuHide=True, 
+            domLayout='normal',
+            getRowStyle=highlight_jscode 
+        )
     
-    # [그룹핑 컬럼 정의]
-    custom_defs = [
-        { "headerName": "IP", "field": "IP", "pinned": "left", "width": 140, "cellStyle": {'textAlign': 'left'} },
-        { "headerName": "시사지표(합)", "field": "시사합계", "valueFormatter": fmt_fixed1, "width": 90 },
-        { "headerName": "사전 조회수", "field": "사전조회수", "valueFormatter": fmt_thousands, "width": 100 },
-        { "headerName": "사전 언급량", "field": "사전언급량", "valueFormatter": fmt_thousands, "width": 100 }
-    ]
-
-    # MPI 그룹 생성 (children)
-    mpi_children = []
-    for col in mpi_columns:
-        # [핵심 수정] 데이터 컬럼명(MPI인지도_W-6)에서 접두사를 제거하여 헤더명(W-6) 생성
-        clean_header = col.replace("MPI인지도_", "")
+        # [그룹핑 컬럼 정의]
+        custom_defs = [
+            { "headerName": "IP", "field": "IP", "pinned": "left", "width": 140, "cellStyle": {'textAlign': 'left'} },
+            { "headerName": "시사지표(합)", "field": "시사합계", "valueFormatter": fmt_fixed1, "width": 90 },
+            { "headerName": "사전 조회수", "field": "사전조회수", "valueFormatter": fmt_thousands, "width": 100 },
+            { "headerName": "사전 언급량", "field": "사전언급량", "valueFormatter": fmt_thousands, "width": 100 }
+        ]
+
+        # MPI 그룹 생성 (children)
+        mpi_children = []
+        for col in mpi_columns:
+            # [핵심 수정] 데이터 컬럼명(MPI인지도_W-6)에서 접두사를 제거하여 헤더명(W-6) 생성
+            clean_header = col.replace("MPI인지도_", "")
         
-        mpi_children.append({
-            "headerName": clean_header, 
-            "field": col,
-            "valueFormatter": fmt_fixed1,
-            "width": 60, 
-            "cellStyle": {'textAlign': 'center'}
-        })
-
-    if mpi_children:
-        custom_defs.append({
-            "headerName": "MPI 인지도", # 상위 그룹 헤더
-            "children": mpi_children,   # 하위 컬럼들 (W-6, W-5...)
-            "headerClass": "centered-header"
-        })
-
-    grid_options = gb.build()
-    grid_options['columnDefs'] = custom_defs
-
-    AgGrid(
-        df_pre_perf,
-        gridOptions=grid_options,
-        theme="streamlit",
-        height=400,
-        fit_columns_on_grid_load=True, 
-        update_mode=GridUpdateMode.NO_UPDATE,
-        allow_unsafe_jscode=True
+            mpi_children.append({
+                "headerName": clean_header, 
+                "field": col,
+                "valueFormatter": fmt_fixed1,
+                "width": 60, 
+                "cellStyle": {'textAlign': 'center'}
+            })
+
+        if mpi_children:
+            custom_defs.append({
+                "headerName": "MPI 인지도", # 상위 그룹 헤더
+                "children": mpi_children,   # 하위 컬럼들 (W-6, W-5...)
+                "headerClass": "centered-header"
+            })
+
+        grid_options = gb.build()
+        grid_options['columnDefs'] = custom_defs
+        return grid_options
+
+    # 정렬/검색/페이지는 서버에서 처리하고 현재 페이지 행만 전송
+    pre_sort_labels = {"기본 순서": "", "시사지표(합)": "시사합계", "사전 조회수": "사전조회수", "사전 언급량": "사전언급량"}
+    pre_sort_labels.update({f"MPI 인지도 {c.replace('MPI인지도_', '')}": c for c in mpi_columns})
+    pre_sort_labels["IP"] = "IP"
+    render_paged_grid(
+        df_pre_perf, "pre_perf", _pre_grid_options, sort_labels=pre_sort_labels,
+        default_sort="", ascending=False, page_size=10, focus_ip=global_ip,
+        header_rows=2 if mpi_columns else 1,
     )
     
 # =====================================================
 #endregion
 #endregion
 
+#region [ 7-0. 캐시 워밍업 ]
+WARMUP_RECENT_IPS = 8   # IP별 캐시를 미리 채울 최근 방영(예정) 작품 수
+
+
+def _warmup_caches(df_all: pd.DataFrame) -> None:
+    """
+    새 스냅샷 기준으로 페이지 첫 진입 시 무거운 캐시를 미리 계산합니다.
+    - IP 무관: 전체 KPI 백분위, 비교분석 그룹 셀(평균/순위), 사전지표 컷오프 모델(W-3/W-2/W-1)
+    - IP별: 최근 방영(예정) 작품의 비교분석 백분위 모수 / 성장스코어 기본 회차 기준 등급
+    (페이지와 같은 헬퍼·기본값으로 호출해 같은 캐시 키를 채움)
+    """
+    if df_all.empty:
+        return
+
+    get_kpi_data_for_all_ips(df_all, max_ep=None)
+    page4_group_cells(df_all, None)
+    get_prelaunch_registry(df_all)
+
+    if "방영시작" in df_all.columns:
+        recent = (
+            df_all.groupby("IP")["방영시작"].max()
+            .sort_values(ascending=False, na_position="last")
+            .index[:WARMUP_RECENT_IPS].tolist()
+        )
+    else:
+        recent = sorted(df_all["IP"].dropna().unique().tolist())[:WARMUP_RECENT_IPS]
+
+    # [비교분석] 방영작 + 기준 IP 모수 (방영작끼리는 모수가 같으므로 한 번만)
+    aired_ips = set(get_aired_ips(df_all))
+    seen_pools = set()
+    for ip in recent:
+        pool = frozenset(aired_ips | {ip})
+        if pool in seen_pools:
+            continue
+        seen_pools.add(pool)
+        get_kpi_data_for_all_ips(page4_kpi_pool(df_all, ip), max_ep=None)
+
+    # [성장스코어] 전체 비교 / 기본 회차 기준
+    all_ip_list = sorted(df_all["IP"].dropna().unique().tolist())
+    ep_cutoff = GROWTH_DEFAULT_EP_CUTOFF
+    df_filtered = df_all[df_all["IP"].isin(all_ip_list)].copy()
+    seen_cutoffs = set()
+    for ip in recent:
+        needed_cutoffs = sorted(list(set(growth_episode_cutoffs(df_all, ip)) | {ep_cutoff}))
+        if tuple(needed_cutoffs) in seen_cutoffs:
+            continue
+        seen_cutoffs.add(tuple(needed_cutoffs))
+        _calc_growth_grades_cached(df_filtered, all_ip_list, needed_cutoffs, ep_cutoff)
+
+
+def _warmup_worker(df_all: pd.DataFrame) -> None:
+    # 워밍업은 best-effort: 실패해도 첫 방문 시 평소처럼 계산
+    # (원인은 로그와 store["warmup_error"]에 남김 - 갱신 실패 표시(store["error"])와는 별개)
+    store = _data_store()
+    try:
+        _warmup_caches(df_all)
+    except Exception as e:
+        logging.exception("cache warm-up failed")
+        with store["lock"]:
+            store["warmup_error"] = str(e)
+    else:
+        with store["lock"]:
+            store["warmup_error"] = None
+
+
+def start_cache_warmup(df_all: pd.DataFrame) -> None:
+    """데이터 버전마다 한 번, 백그라운드 스레드에서 캐시 워밍업을 시작합니다."""
+    if df_all is None or df_all.empty:
+        return
+    version = get_data_version(df_all)
+    store = _data_store()
+    with store["lock"]:
+        if store.get("warmed") == version:
+            return
+        store["warmed"] = version
+    threading.Thread(target=_warmup_worker, args=(df_all,), name="cache-warmup", daemon=True).start()
+
+#endregion
+
 #region [ 7. 라우터 / 엔트리 ]
+start_cache_warmup(df_nav)
+
 if st.session_state["page"] == "Overview":
     render_overview() # [ 7. 페이지 1 ]
 elif st.session_state["page"] == "IP 성과":